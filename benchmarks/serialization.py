@@ -0,0 +1,87 @@
+"""
+Serialization benchmark: validated Pydantic responses vs the encoding fast path.
+
+Seeds a 256-miner network, records a batch of challenges, then measures
+CPU time per response for /network/challenges, /network/leaderboard and
+/miners both ways. The validated path rebuilds the models the handlers
+used to build and runs them through the same TypeAdapter validate +
+dump_json that FastAPI applies for a response_model.
+
+    python benchmarks/serialization.py [--miners 256] [--iterations 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from supplychain import db, encoding  # noqa: E402
+from supplychain.models import ChallengeResult, LeaderboardEntry, MinerInfo, TaskType  # noqa: E402
+from supplychain.routes import _run_validator_challenge, leaderboard  # noqa: E402
+
+
+def seed_network(miners: int, challenges: int):
+    random.seed(0)
+    for i in range(len(db.get_miners()), miners):
+        db.add_miner({"hotkey": f"bench-hotkey-{i}", "coldkey": f"bench-coldkey-{i % 16}",
+                      "ip": "10.0.0.1", "tier": random.choice(["entry", "mid", "high"])})
+    for _ in range(challenges):
+        _run_validator_challenge(0, TaskType.eta_prediction)
+
+
+def cpu_us(fn, iterations: int) -> float:
+    fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--miners", type=int, default=256)
+    parser.add_argument("--challenges", type=int, default=10, help="challenges per /network/challenges page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    seed_network(args.miners, args.challenges)
+    challenges = db.get_challenges(args.challenges)
+    miners = list(db.get_miners().values())
+    leaderboard_rows = json.loads(leaderboard(None).body)
+
+    challenge_adapter = TypeAdapter(List[ChallengeResult])
+    miner_adapter = TypeAdapter(List[MinerInfo])
+    leaderboard_adapter = TypeAdapter(List[LeaderboardEntry])
+
+    cases = {
+        "/network/challenges": (
+            lambda: challenge_adapter.dump_json(challenge_adapter.validate_python([ChallengeResult(**c) for c in challenges])),
+            lambda: encoding.dumps(challenges),
+        ),
+        "/network/leaderboard": (
+            lambda: leaderboard_adapter.dump_json(leaderboard_adapter.validate_python([LeaderboardEntry(**e) for e in leaderboard_rows])),
+            lambda: encoding.dumps(leaderboard_rows),
+        ),
+        "/miners": (
+            lambda: miner_adapter.dump_json(miner_adapter.validate_python([MinerInfo(**m) for m in miners])),
+            lambda: encoding.dumps([dict(m) for m in miners]),
+        ),
+    }
+
+    encoder = "orjson" if encoding.orjson else "json"
+    print(f"{args.miners} miners, {args.challenges} challenges/page, encoder={encoder}, CPU us per response")
+    print(f"{'endpoint':<24}{'validated':>12}{'fast':>12}{'saved':>12}{'speedup':>10}")
+    for name, (validated, fast) in cases.items():
+        slow_us, fast_us = cpu_us(validated, args.iterations), cpu_us(fast, args.iterations)
+        print(f"{name:<24}{slow_us:>12.1f}{fast_us:>12.1f}{slow_us - fast_us:>12.1f}{slow_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cold-start benchmark with an enforceable budget.
+
+Starts fresh interpreters that import the app (seeding per SUPPLYCHAIN_SEED),
+then times the OpenAPI schema and a first request. Reports median and worst
+case over the runs, lists the slowest imports, and exits non-zero when the
+median time to a ready app exceeds --budget-ms. Run it from CI or an image
+build with the same SUPPLYCHAIN_* settings the service uses.
+
+    python benchmarks/startup.py [--runs 5] [--budget-ms 1000] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in each fresh interpreter; prints one JSON line
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+import main
+ready = time.time()
+t1 = time.perf_counter()
+main.app.openapi()
+t2 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+t3 = time.perf_counter()
+client.get("/network/status").raise_for_status()
+t4 = time.perf_counter()
+from supplychain import db
+print(json.dumps({
+    "ready_at": ready,
+    "import_ms": (t1 - t0) * 1000,
+    "openapi_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+    "miners": len(db.get_miners()),
+}))
+"""
+
+
+def run_once() -> dict:
+    spawned = time.time()
+    child = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, cwd=ROOT)
+    if child.returncode != 0:
+        sys.stderr.write(child.stderr)
+        raise SystemExit("startup run failed")
+    result = json.loads(child.stdout.strip().splitlines()[-1])
+    # Process spawn to app imported and seeded: what a scale-out replica waits before it can serve
+    result["ready_ms"] = (result.pop("ready_at") - spawned) * 1000
+    return result
+
+
+def slowest_imports(top: int) -> list:
+    """(module, self ms) of the modules that cost the most to import under `import main`."""
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                           capture_output=True, text=True, cwd=ROOT)
+    rows = []
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000))
+    return sorted(rows, key=lambda r: -r[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start and enforce a budget")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="limit on the median time to a ready app")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list (0 to skip)")
+    parser.add_argument("--out", default=None, help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    report = {"seed": os.environ.get("SUPPLYCHAIN_SEED", "default"),
+              "openapi_cache": os.environ.get("SUPPLYCHAIN_OPENAPI_CACHE", ""),
+              "miners": runs[0]["miners"], "budget_ms": args.budget_ms}
+    print(f"{args.runs} cold starts, seed={report['seed']} ({report['miners']} miners), "
+          f"openapi cache={'on' if report['openapi_cache'] else 'off'}")
+    print(f"{'':<18}{'median ms':>12}{'max ms':>12}")
+    for key in ("ready_ms", "import_ms", "openapi_ms", "first_request_ms"):
+        values = np.array([r[key] for r in runs])
+        report[key] = {"median": round(float(np.median(values)), 2), "max": round(float(values.max()), 2)}
+        print(f"{key:<18}{report[key]['median']:>12.1f}{report[key]['max']:>12.1f}")
+
+    if args.top:
+        report["slowest_imports"] = slowest_imports(args.top)
+        print("\nslowest imports (self ms)")
+        for name, ms in report["slowest_imports"]:
+            print(f"  {name:<40}{ms:>8.1f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    ready = report["ready_ms"]["median"]
+    if ready > args.budget_ms:
+        print(f"\nOVER BUDGET: median ready {ready:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\nwithin budget: median ready {ready:.0f} ms <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Hot-path benchmark suite.
+
+Seeds supplychain.db with N miners (and a proportional number of
+validators), then times each hot path both as a direct call and through
+the ASGI app in-process. Every network size runs in its own process so
+peak memory is per size. Results are printed as a table and written as
+JSON for comparing runs across commits.
+
+    python benchmarks/suite.py --sizes 8,256,4096,65536 --out bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SIZES = (8, 256, 4096, 65536)
+
+SYNAPSE = {
+    "task_type": "eta_prediction",
+    "origin": "Shanghai, China",
+    "destination": "Los Angeles, USA",
+    "product_type": "electronics",
+    "carrier": "COSCO",
+    "ship_date": "2026-02-15",
+    "conditions": {"weather": "typhoon_warning_western_pacific", "port_congestion": "shanghai_moderate", "geopolitical": "normal"},
+    "random_seed": 12345678,
+}
+
+
+# ── Single size (runs in a child process) ──
+
+def seed(miners: int, validators: int):
+    from supplychain import db
+
+    random.seed(0)
+    for i in range(len(db.get_miners()), miners):
+        db.add_miner({"hotkey": f"bench-miner-{i}", "coldkey": f"bench-owner-{i % 64}",
+                      "ip": "10.0.0.1", "tier": random.choice(["entry", "mid", "high"])})
+    for i in range(len(db.get_validators()), validators):
+        db.add_validator({"hotkey": f"bench-validator-{i}", "coldkey": f"bench-owner-{i % 64}",
+                          "ip": "10.0.1.1", "stake": round(random.uniform(1000, 20000), 2)})
+
+
+def targets():
+    """name -> (direct callable, (method, path, json body) for the ASGI run)."""
+    from supplychain import ai, challenges, routes
+    from supplychain.models import SupplyChainSynapse
+
+    synapse = SupplyChainSynapse(**SYNAPSE)
+    stream = challenges.stream(0)
+    prediction = ai.run_miner_prediction(SYNAPSE, "high")
+    ground_truth = {"actual_eta_days": 16.0, "had_disruption": True}
+    return {
+        "run_challenge": (lambda: routes.run_challenge(0, synapse=synapse), ("POST", "/validators/0/run-challenge", None)),
+        "full_tempo_cycle": (routes.full_tempo_cycle, ("POST", "/demo/full-tempo-cycle", None)),
+        "compare_miners": (lambda: routes.compare_miners(synapse), ("POST", "/demo/compare-miners", SYNAPSE)),
+        "leaderboard": (lambda: routes.leaderboard(None), ("GET", "/network/leaderboard", None)),
+        "network_status": (routes.network_status, ("GET", "/network/status", None)),
+        "score_prediction": (lambda: ai.score_prediction(prediction, ground_truth), None),
+        "run_miner_prediction": (lambda: ai.run_miner_prediction(SYNAPSE, "high"), None),
+        "challenge_generation": (lambda: next(stream), None),
+    }
+
+
+def measure(fn, budget_s: float, max_iterations: int) -> dict:
+    """Call `fn` until the time budget or iteration cap runs out (at least 3 calls)."""
+    import numpy as np
+
+    fn()  # warm-up
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < max_iterations and (len(samples) < 3 or time.perf_counter() - start < budget_s):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    ms = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99)).tolist()
+
+    # Peak allocation of one call, measured separately so tracing doesn't skew latency
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": len(samples),
+        "mean_ms": round(ms.mean().item(), 4),
+        "p50_ms": round(p50, 4),
+        "p95_ms": round(p95, 4),
+        "p99_ms": round(p99, 4),
+        "throughput_per_s": round(len(samples) / elapsed, 2),
+        "peak_alloc_mb": round(peak / 2**20, 3),
+    }
+
+
+def run_size(miners: int, validators: int, budget_s: float, max_iterations: int, only=None) -> dict:
+    from fastapi.testclient import TestClient
+    from main import app
+
+    start = time.perf_counter()
+    seed(miners, validators)
+    seed_s = time.perf_counter() - start
+
+    client = TestClient(app)
+    results = []
+    for name, (direct, request) in targets().items():
+        if only and name not in only:
+            continue
+        results.append({"target": name, "mode": "direct", **measure(direct, budget_s, max_iterations)})
+        if request:
+            method, path, body = request
+
+            def call():
+                response = client.request(method, path, json=body)
+                response.raise_for_status()
+
+            results.append({"target": name, "mode": "asgi", **measure(call, budget_s, max_iterations)})
+
+    return {
+        "miners": miners,
+        "validators": validators,
+        "seed_s": round(seed_s, 3),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "results": results,
+    }
+
+
+# ── Driver ──
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _print_table(run: dict):
+    print(f"\n{run['miners']} miners / {run['validators']} validators "
+          f"(seeded in {run['seed_s']} s, max RSS {run['max_rss_mb']} MB)")
+    print(f"{'target':<22}{'mode':<8}{'n':>6}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'ops/s':>11}{'peak MB':>10}")
+    for r in run["results"]:
+        print(f"{r['target']:<22}{r['mode']:<8}{r['iterations']:>6}{r['p50_ms']:>11.3f}{r['p95_ms']:>11.3f}"
+              f"{r['p99_ms']:>11.3f}{r['throughput_per_s']:>11.1f}{r['peak_alloc_mb']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the subnet's hot paths at several network sizes")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated miner counts")
+    parser.add_argument("--validators", type=int, default=None,
+                        help="validator count (default: one per 64 miners, between 3 and 64)")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per target and mode")
+    parser.add_argument("--max-iterations", type=int, default=1000)
+    parser.add_argument("--only", default="", help="comma-separated targets to run (default: all)")
+    parser.add_argument("--out", default=None, help="write results as JSON to this file")
+    parser.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    only = set(filter(None, args.only.split(",")))
+
+    if args.child is not None:
+        validators = args.validators or min(64, max(3, args.child // 64))
+        print(json.dumps(run_size(args.child, validators, args.budget, args.max_iterations, only)))
+        return
+
+    runs = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", str(size), "--budget", str(args.budget),
+               "--max-iterations", str(args.max_iterations), "--only", args.only]
+        if args.validators:
+            cmd += ["--validators", str(args.validators)]
+        # Each size in a fresh process: clean state and its own peak RSS
+        child = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        if child.returncode != 0:
+            sys.stderr.write(child.stderr)
+            raise SystemExit(f"benchmark failed at {size} miners")
+        run = json.loads(child.stdout.strip().splitlines()[-1])
+        _print_table(run)
+        runs.append(run)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "registry_backend": os.environ.get("SUPPLYCHAIN_REGISTRY", "dict"),
+            "budget_s": args.budget,
+        },
+        "runs": runs,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
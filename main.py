@@ -1,9 +1,30 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+import glob
+import hashlib
+import os
+import sys
+import threading
+from contextlib import asynccontextmanager
+
+import fastapi
+import pydantic
+from fastapi import FastAPI, Request
+from supplychain import assets, config
+from supplychain.encoding import dumps, loads
 from supplychain.routes import router as supplychain_router
 
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the OpenAPI schema off the request path unless the cache already supplied it
+    if app.openapi_schema is None:
+        threading.Thread(target=app.openapi, name="openapi-build", daemon=True).start()
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="AI Supply Chain Subnet",
     description="""
 ## Decentralized Supply Chain Intelligence — Powered by Bittensor & Yuma Consensus
@@ -63,16 +84,78 @@ final_score = (0.40 x ETA_accuracy + 0.25 x disruption_detection
             "name": "Demo Simulation",
             "description": "Full simulation endpoints — run complete tempo cycles and compare miners side-by-side.",
         },
+        {
+            "name": "Admin",
+            "description": "Operator tools — retrieve on-demand request profiles.",
+        },
     ],
 )
 
 # API routes
 app.include_router(supplychain_router)
 
-# Static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static files: content-hashed, precompressed build of static/ (see supplychain/assets.py)
+static_assets = assets.prepare(os.path.join(ROOT, "static"), config.ASSET_DIR)
+
+
+@app.api_route("/static/{name:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def static(name: str, request: Request):
+    return static_assets.response(name, request.headers)
+
+
+@app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+def root(request: Request):
+    return static_assets.response("index.html", request.headers)
+
+
+# ── OpenAPI schema cache ──
+# Generating the schema takes longer than importing the app's own code, so it is
+# built once: read from config.OPENAPI_CACHE when that file was written by this
+# exact code, otherwise built in the background by lifespan() above.
+
+def openapi_fingerprint() -> str:
+    """Hash of the code the schema is generated from, plus the FastAPI and Pydantic versions."""
+    digest = hashlib.sha256(f"{fastapi.__version__} {pydantic.VERSION}".encode())
+    for path in sorted(glob.glob(os.path.join(ROOT, "supplychain", "*.py"))) + [os.path.join(ROOT, "main.py")]:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def write_openapi_cache(path: str):
+    with open(path, "wb") as f:
+        f.write(dumps({"fingerprint": openapi_fingerprint(), "schema": app.openapi()}))
+
+
+def _load_openapi_cache(path: str):
+    try:
+        with open(path, "rb") as f:
+            cached = loads(f.read())
+    except (OSError, ValueError):
+        return None
+    return cached["schema"] if cached.get("fingerprint") == openapi_fingerprint() else None
+
+
+_generate_openapi = app.openapi
+
+
+def openapi() -> dict:
+    """The schema, generated at most once; routes are fixed after import."""
+    if app.openapi_schema is None:
+        app.openapi_schema = _generate_openapi()
+    return app.openapi_schema
+
+
+app.openapi = openapi
+if config.OPENAPI_CACHE:
+    app.openapi_schema = _load_openapi_cache(config.OPENAPI_CACHE)
 
 
-@app.get("/", include_in_schema=False)
-def root():
-    return FileResponse("static/index.html")
+if __name__ == "__main__":
+    # python main.py --write-openapi [path]: prebuild the schema cache (e.g. at image build)
+    if sys.argv[1:2] == ["--write-openapi"]:
+        target = sys.argv[2] if len(sys.argv) > 2 else config.OPENAPI_CACHE
+        if not target:
+            sys.exit("usage: python main.py --write-openapi PATH (or set SUPPLYCHAIN_OPENAPI_CACHE)")
+        write_openapi_cache(target)
+        print(f"wrote {target}")
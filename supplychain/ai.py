@@ -7,8 +7,12 @@ Each demo scenario has specialized miners and validators with unique analysis.
 import random
 import hashlib
 import time
+from collections import namedtuple
 from datetime import datetime
+from functools import lru_cache
 
+from . import metrics
+from .consistency import PRIOR as CONSISTENCY_PRIOR
 
 # ============================================================
 # SPECIALIZED MINERS & VALIDATORS PER SCENARIO
@@ -204,6 +208,98 @@ PRODUCT_RISK_MULTIPLIERS = {
     "electronics": 1.0, "perishable": 1.5, "bulk": 0.8, "hazmat": 1.3, "general": 0.9,
 }
 
+# Feeds a miner may cite, best first — entry miners use the first few, high-tier miners most of them
+DATA_SOURCES = [
+    "AIS_vessel_tracking", "carrier_tracking_API", "port_congestion_API", "NOAA_weather",
+    "historical_shipments", "customs_clearance_feed", "freight_rate_index", "port_authority_data",
+    "ECMWF_ensemble", "news_event_feed", "bunker_fuel_prices", "satellite_imagery",
+    "rail_intermodal_feed", "trucking_capacity_index", "geopolitical_risk_index",
+]
+
+
+# ── Compiled feature table ──
+# Every miner and validator sees the same challenge context, so the
+# deterministic part of a prediction is resolved once per
+# (route, weather, congestion, product) and cached. Each dimension is
+# interned to a small integer (0 = unknown, which takes the defaults) and
+# the four are packed into one int key.
+
+_DEFAULT_ROUTE = {"base_days": 15, "variance": 3, "base_cost": 3000, "risk_baseline": 0.20}
+_NO_IMPACT = {"delay_days": 0, "risk_increase": 0}
+
+_ROUTE_IDS = {key: i for i, key in enumerate(ROUTE_DATABASE, 1)}
+_WEATHER_IDS = {key: i for i, key in enumerate(WEATHER_IMPACTS, 1)}
+_CONGESTION_IDS = {key: i for i, key in enumerate(PORT_CONGESTION_IMPACTS, 1)}
+_PRODUCT_IDS = {key: i for i, key in enumerate(PRODUCT_RISK_MULTIPLIERS, 1)}
+
+_ROUTES = [None, *ROUTE_DATABASE]
+_WEATHERS = [None, *WEATHER_IMPACTS]
+_CONGESTIONS = [None, *PORT_CONGESTION_IMPACTS]
+_PRODUCTS = [None, *PRODUCT_RISK_MULTIPLIERS]
+
+FEATURE_CACHE_SIZE = 4096
+
+ChallengeFeatures = namedtuple("ChallengeFeatures", [
+    "route", "weather_delay", "congestion_delay", "base_eta",
+    "risk_sum", "product_risk", "risk_factors",
+])
+
+
+def feature_key(origin, destination, weather, congestion, product) -> int:
+    """Pack a challenge context into one integer key for the feature cache."""
+    r = _ROUTE_IDS.get((origin, destination), 0)
+    w = _WEATHER_IDS.get(weather, 0)
+    c = _CONGESTION_IDS.get(congestion, 0)
+    p = _PRODUCT_IDS.get(product, 0)
+    return ((r * len(_WEATHERS) + w) * len(_CONGESTIONS) + c) * len(_PRODUCTS) + p
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def compile_features(key: int) -> ChallengeFeatures:
+    """Deterministic base ETA / risk / cost components for a packed context key."""
+    key, p = divmod(key, len(_PRODUCTS))
+    key, c = divmod(key, len(_CONGESTIONS))
+    r, w = divmod(key, len(_WEATHERS))
+
+    route = ROUTE_DATABASE[_ROUTES[r]] if r else _DEFAULT_ROUTE
+    weather = _WEATHERS[w]
+    congestion = _CONGESTIONS[c]
+    product = _PRODUCTS[p]
+    weather_impact = WEATHER_IMPACTS[weather] if w else _NO_IMPACT
+    congestion_impact = PORT_CONGESTION_IMPACTS[congestion] if c else _NO_IMPACT
+    product_mult = PRODUCT_RISK_MULTIPLIERS[product] if p else 1.0
+
+    # Shapes below follow the MinerPrediction wire model (RiskFactor)
+    risk_factors = []
+    if weather_impact["delay_days"] > 0:
+        risk_factors.append({"factor": weather, "probability": round(min(1.0, weather_impact["risk_increase"] * 2), 2), "impact_days": float(weather_impact["delay_days"])})
+    if congestion_impact["delay_days"] > 0:
+        risk_factors.append({"factor": congestion, "probability": round(min(1.0, congestion_impact["risk_increase"] * 2), 2), "impact_days": float(congestion_impact["delay_days"])})
+    if product_mult > 1.1:
+        risk_factors.append({"factor": f"{product}_handling", "probability": round(min(1.0, product_mult - 1.0), 2), "impact_days": 0.5})
+
+    risk_sum = route["risk_baseline"] + weather_impact["risk_increase"] + congestion_impact["risk_increase"]
+    return ChallengeFeatures(
+        route=route,
+        weather_delay=weather_impact["delay_days"],
+        congestion_delay=congestion_impact["delay_days"],
+        base_eta=route["base_days"] + weather_impact["delay_days"] + congestion_impact["delay_days"],
+        risk_sum=risk_sum,
+        product_risk=risk_sum * product_mult,
+        risk_factors=tuple(risk_factors),
+    )
+
+
+def challenge_features(synapse_dict: dict) -> ChallengeFeatures:
+    conditions = synapse_dict.get("conditions") or {}
+    return compile_features(feature_key(
+        synapse_dict.get("origin", ""),
+        synapse_dict.get("destination", ""),
+        conditions.get("weather", "normal"),
+        conditions.get("port_congestion", "normal"),
+        synapse_dict.get("product_type", "general"),
+    ))
+
 
 # ============================================================
 # MAIN DEMO ENGINE
@@ -217,16 +313,8 @@ def _generate_miner_responses(task_type, synapse, ground_truth, num_miners=6):
     selected = pool[:num]  # Deterministic for demo consistency
     analyses = spec["analyses"]
 
-    route_key = (synapse["origin"], synapse["destination"])
-    route = ROUTE_DATABASE.get(route_key, {"base_days": 15, "base_cost": 3000, "risk_baseline": 0.20})
-
-    conditions = synapse.get("conditions") or {}
-    weather = conditions.get("weather", "normal")
-    congestion = conditions.get("port_congestion", "normal")
-    weather_delay = WEATHER_IMPACTS.get(weather, {}).get("delay_days", 0)
-    congestion_delay = PORT_CONGESTION_IMPACTS.get(congestion, {}).get("delay_days", 0)
-
-    actual_eta = ground_truth.get("actual_eta_days", route["base_days"] + weather_delay + congestion_delay)
+    features = challenge_features(synapse)
+    actual_eta = ground_truth.get("actual_eta_days", features.base_eta)
 
     miners = []
     for i, miner in enumerate(selected):
@@ -256,10 +344,7 @@ def _generate_miner_responses(task_type, synapse, ground_truth, num_miners=6):
         predicted_eta = round(actual_eta + eta_error, 1)
         predicted_eta = max(1.0, predicted_eta)
 
-        base_risk = route["risk_baseline"]
-        w_risk = WEATHER_IMPACTS.get(weather, {}).get("risk_increase", 0)
-        c_risk = PORT_CONGESTION_IMPACTS.get(congestion, {}).get("risk_increase", 0)
-        disruption_risk = round(min(1.0, base_risk + w_risk + c_risk + rng.gauss(0, 0.05)), 2)
+        disruption_risk = round(min(1.0, features.risk_sum + rng.gauss(0, 0.05)), 2)
         disruption_risk = max(0.0, disruption_risk)
 
         hk = miner["hotkey"]
@@ -325,11 +410,11 @@ def _generate_validator_results(task_type, num_validators=3):
     return validators
 
 
-def run_demo_scenario(scenario_key: str) -> dict:
-    """Run one of the 3 pre-built demo scenarios with full miner/validator output."""
+def demo_scenario_static(scenario_key: str):
+    """Deterministic part of a demo scenario (fixed seeds throughout), or None if unknown."""
     scenario = DEMO_SCENARIOS.get(scenario_key)
     if not scenario:
-        return {"error": f"Unknown scenario: {scenario_key}"}
+        return None
 
     task_type = scenario["task_type"]
     synapse = scenario["synapse"]
@@ -358,13 +443,28 @@ def run_demo_scenario(scenario_key: str) -> dict:
         "validator_nodes_consulted": len(validator_results),
         "tao_reward_pool": total_tao,
         "consensus_reached": all(v["consensus"] == "Approved" for v in validator_results),
+        "subnet_version": "1.0.0-beta",
+    }
+
+
+def demo_scenario_volatile() -> dict:
+    """The per-request fields of a demo scenario response."""
+    return {
         "block_number": random.randint(2_800_000, 3_200_000),
         "tempo": random.randint(7900, 8100),
         "timestamp": datetime.utcnow().isoformat(),
-        "subnet_version": "1.0.0-beta",
     }
 
 
+def run_demo_scenario(scenario_key: str) -> dict:
+    """Run one of the 3 pre-built demo scenarios with full miner/validator output."""
+    result = demo_scenario_static(scenario_key)
+    if result is None:
+        return {"error": f"Unknown scenario: {scenario_key}"}
+    result.update(demo_scenario_volatile())
+    return result
+
+
 def get_demo_scenarios_list():
     """Return metadata for all 3 demo scenarios."""
     return [
@@ -389,19 +489,11 @@ def get_demo_scenarios_list():
 
 def run_miner_prediction(synapse_dict: dict, tier: str) -> dict:
     """Simulate a miner processing a supply chain challenge (for Swagger endpoints)."""
+    start = time.perf_counter()
     rng = random.Random(synapse_dict.get("random_seed", int(time.time())))
 
-    route_key = (synapse_dict.get("origin", ""), synapse_dict.get("destination", ""))
-    route = ROUTE_DATABASE.get(route_key, {"base_days": 15, "variance": 3, "base_cost": 3000, "risk_baseline": 0.20})
-
-    conditions = synapse_dict.get("conditions") or {}
-    weather = conditions.get("weather", "normal")
-    congestion = conditions.get("port_congestion", "normal")
-    product = synapse_dict.get("product_type", "general")
-
-    weather_impact = WEATHER_IMPACTS.get(weather, {"delay_days": 0, "risk_increase": 0})
-    congestion_impact = PORT_CONGESTION_IMPACTS.get(congestion, {"delay_days": 0, "risk_increase": 0})
-    product_mult = PRODUCT_RISK_MULTIPLIERS.get(product, 1.0)
+    features = challenge_features(synapse_dict)
+    route = features.route
 
     # Tier-based quality
     if tier == "high":
@@ -420,37 +512,40 @@ def run_miner_prediction(synapse_dict: dict, tier: str) -> dict:
         latency = round(rng.uniform(1500, 4000), 0)
         data_sources = rng.randint(1, 5)
 
-    predicted_eta = round(route["base_days"] + weather_impact["delay_days"] + congestion_impact["delay_days"] + noise, 1)
+    predicted_eta = round(features.base_eta + noise, 1)
     predicted_eta = max(1.0, predicted_eta)
 
-    disruption_risk = round(min(1.0, (route["risk_baseline"] + weather_impact["risk_increase"] + congestion_impact["risk_increase"]) * product_mult + rng.gauss(0, 0.05)), 2)
+    disruption_risk = round(min(1.0, features.product_risk + rng.gauss(0, 0.05)), 2)
     disruption_risk = max(0.0, disruption_risk)
 
-    risk_factors = []
-    if weather_impact["delay_days"] > 0:
-        risk_factors.append({"factor": weather.replace("_", " ").title(), "severity": round(weather_impact["risk_increase"] * 5, 1), "description": f"Weather event may add {weather_impact['delay_days']} days"})
-    if congestion_impact["delay_days"] > 0:
-        risk_factors.append({"factor": congestion.replace("_", " ").title(), "severity": round(congestion_impact["risk_increase"] * 5, 1), "description": f"Port congestion may add {congestion_impact['delay_days']} days"})
-    if product_mult > 1.1:
-        risk_factors.append({"factor": f"{product.title()} cargo", "severity": round((product_mult - 1.0) * 3, 1), "description": "Product type adds handling risk"})
+    direct = disruption_risk < 0.3
+    route_recommendation = {
+        "route": f"{synapse_dict.get('origin', '')} → {synapse_dict.get('destination', '')}",
+        "estimated_days": predicted_eta,
+        "estimated_cost_usd": float(route["base_cost"]),
+        "rationale": "Direct route" if direct else "Consider alternative routing",
+    }
 
-    return {
+    result = {
         "miner_uid": 0,
         "miner_hotkey": "",
         "predicted_eta_days": predicted_eta,
         "disruption_risk": disruption_risk,
         "confidence": confidence,
-        "risk_factors": risk_factors,
-        "route_recommendation": f"{'Direct route' if disruption_risk < 0.3 else 'Consider alternative routing'} — {synapse_dict.get('origin', '')} to {synapse_dict.get('destination', '')}",
+        "risk_factors": [dict(f) for f in features.risk_factors],
+        "route_recommendation": route_recommendation,
         "response_time_ms": latency,
-        "data_sources": data_sources,
+        "data_sources": DATA_SOURCES[:data_sources],
     }
+    metrics.observe("prediction", time.perf_counter() - start)
+    return result
 
 
-def score_prediction(prediction: dict, ground_truth: dict) -> dict:
-    """Score a miner prediction against ground truth (for Swagger endpoints)."""
-    rng = random.Random(hash(str(prediction.get("miner_hotkey", ""))) % 2**31)
+def score_prediction(prediction: dict, ground_truth: dict, consistency: float = CONSISTENCY_PRIOR) -> dict:
+    """Score a miner prediction against ground truth (for Swagger endpoints).
 
+    `consistency` is the miner's consistency EMA (see consistency.py).
+    """
     actual_eta = ground_truth.get("actual_eta_days", 15.0)
     predicted_eta = prediction.get("predicted_eta_days", 15.0)
     eta_accuracy = round(max(0, 1.0 - abs(predicted_eta - actual_eta) / 7.0), 4)
@@ -468,7 +563,7 @@ def score_prediction(prediction: dict, ground_truth: dict) -> dict:
     latency_ms = prediction.get("response_time_ms", 1000)
     latency_score = round(max(0, 1.0 - latency_ms / 10000), 4)
 
-    consistency = round(rng.uniform(0.65, 0.95), 4)
+    consistency = round(consistency, 4)
 
     final = 0.40 * eta_accuracy + 0.25 * disruption_accuracy + 0.15 * risk_calibration + 0.10 * latency_score + 0.10 * consistency
     if disruption_bonus:
@@ -512,7 +607,7 @@ def get_supplychain_status(query) -> dict:
         "confidence": result["confidence"],
         "risk_factors": result.get("risk_factors", []),
         "route_recommendation": result.get("route_recommendation", ""),
-        "data_sources_used": result.get("data_sources", 0),
+        "data_sources_used": len(result.get("data_sources", [])),
         "miners_consulted": 6,
         "timestamp": datetime.utcnow().isoformat() + "Z",
     }
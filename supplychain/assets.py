@@ -0,0 +1,321 @@
+"""
+Static asset pipeline.
+Copies static/ into a build directory under content-hashed names with gzip
+(and brotli, when installed) variants and downscaled image widths (when
+Pillow is installed), and rewrites index.html to reference them. Hashed
+names are served as immutable; index.html and the original names revalidate
+by ETag. Build once at image build time, or let startup build on demand:
+
+    python -m supplychain.assets --out build/static
+    SUPPLYCHAIN_ASSET_DIR=build/static uvicorn main:app
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import mimetypes
+import os
+import re
+import tempfile
+from urllib.parse import quote, unquote
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, Response
+
+from .encoding import dumps, loads
+
+try:
+    import brotli
+except ImportError:  # optional: gzip variants only
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:  # optional: no responsive image widths
+    Image = None
+
+# Bump when the build output changes shape, so old build directories are rebuilt
+PIPELINE_VERSION = 1
+
+# Extensions worth compressing; images and fonts are already compressed
+COMPRESSIBLE = {".css", ".js", ".html", ".svg", ".json", ".txt", ".map"}
+
+# File suffix of each precompressed variant
+EXTENSIONS = {"gzip": "gz", "br": "br"}
+
+# Raster formats that get downscaled width variants for srcset
+RESIZABLE = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+WIDTHS = (48, 96, 192, 480, 960)
+
+# Entry points keep their names; everything else is fingerprinted
+UNHASHED = {".html"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# /static/<name> in HTML attributes and CSS url()
+_REFERENCE = re.compile(r"""(?<=["'(])/static/([^"'()\s?#]+)""")
+_IMG_TAG = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_IMG_SRC = re.compile(r"""\ssrc=(["'])/static/([^"']+)\1""", re.IGNORECASE)
+
+
+# ── Build ──
+
+def _sources(source: str) -> list:
+    """Relative paths of every non-hidden file under `source`, sorted."""
+    names = []
+    for dirpath, dirnames, filenames in os.walk(source):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in filenames:
+            if not filename.startswith("."):
+                names.append(os.path.relpath(os.path.join(dirpath, filename), source).replace(os.sep, "/"))
+    return sorted(names)
+
+
+def fingerprint(source: str) -> str:
+    """Hash of every source file and the pipeline settings; a build directory is valid while this matches."""
+    digest = hashlib.sha256(f"{PIPELINE_VERSION} {WIDTHS}".encode())
+    for name in _sources(source):
+        digest.update(name.encode() + b"\0")
+        with open(os.path.join(source, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _hashed_name(name: str, digest: str, suffix: str = "") -> str:
+    """`css/Site Theme.css` -> `css/site-theme.<digest[:10]>[suffix].css`."""
+    folder, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", stem).strip("-").lower() or "asset"
+    return "/".join(filter(None, (folder, f"{slug}.{digest[:10]}{suffix}{ext}")))
+
+
+def _write(out: str, name: str, data: bytes):
+    """Write atomically, so workers building the same directory never serve a partial file."""
+    path = os.path.join(out, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _widths(data: bytes, fmt: str) -> tuple:
+    """The image's width and {width: image bytes} for each of WIDTHS narrower than it."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        width, height = image.size
+        variants = {}
+        for w in WIDTHS:
+            if w >= width:
+                break
+            buf = io.BytesIO()
+            image.resize((w, max(1, round(height * w / width))), Image.LANCZOS).save(buf, fmt, optimize=True)
+            variants[w] = buf.getvalue()
+    return width, variants
+
+
+def _rewrite(text: str, files: dict) -> str:
+    """Point /static/<name> references at hashed names; give <img> tags a srcset of the width variants."""
+
+    def img(match):
+        tag = match.group(0)
+        src = _IMG_SRC.search(tag)
+        entry = files.get(unquote(src.group(2))) if src else None
+        if not entry or not entry["widths"] or re.search(r"\ssrcset=", tag, re.IGNORECASE):
+            return tag
+        candidates = [f"/static/{quote(path)} {w}w" for w, path in sorted(entry["widths"].items(), key=lambda kv: int(kv[0]))]
+        candidates.append(f"/static/{quote(entry['path'])} {entry['width']}w")
+        return tag[:src.end()] + f' srcset="{", ".join(candidates)}"' + tag[src.end():]
+
+    def reference(match):
+        entry = files.get(unquote(match.group(1)))
+        return f"/static/{quote(entry['path'])}" if entry else match.group(0)
+
+    return _REFERENCE.sub(reference, _IMG_TAG.sub(img, text))
+
+
+def build(source: str, out: str) -> dict:
+    """Build `source` into `out` and return the manifest (also written to out/manifest.json)."""
+    os.makedirs(out, exist_ok=True)
+    # Referenced files first, so stylesheets and pages can be rewritten to their hashed names
+    order = {".css": 1, ".html": 2}
+    names = sorted(_sources(source), key=lambda n: (order.get(os.path.splitext(n)[1].lower(), 0), n))
+
+    files = {}
+    for name in names:
+        ext = os.path.splitext(name)[1].lower()
+        with open(os.path.join(source, name), "rb") as f:
+            data = f.read()
+        if ext in (".css", ".html"):
+            data = _rewrite(data.decode("utf-8"), files).encode("utf-8")
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = name if ext in UNHASHED else _hashed_name(name, digest)
+        _write(out, path, data)
+        entry = {
+            "path": path,
+            "digest": digest[:16],
+            "type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "encodings": {},
+            "widths": {},
+            "width": None,
+        }
+
+        if ext in COMPRESSIBLE:
+            variants = {"gzip": gzip.compress(data, 9, mtime=0)}
+            if brotli is not None:
+                variants["br"] = brotli.compress(data, quality=11)
+            for coding, encoded in variants.items():
+                if len(encoded) < len(data):
+                    entry["encodings"][coding] = f"{path}.{EXTENSIONS[coding]}"
+                    _write(out, entry["encodings"][coding], encoded)
+
+        if ext in RESIZABLE and Image is not None:
+            entry["width"], variants = _widths(data, RESIZABLE[ext])
+            for w, variant in variants.items():
+                variant_path = _hashed_name(name, digest, f".w{w}")
+                _write(out, variant_path, variant)
+                entry["widths"][str(w)] = variant_path
+
+        files[name] = entry
+
+    manifest = {"fingerprint": fingerprint(source), "files": files}
+    _write(out, "manifest.json", dumps(manifest))
+    return manifest
+
+
+def _load_manifest(out: str):
+    try:
+        with open(os.path.join(out, "manifest.json"), "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+# ── Serving ──
+
+def _accepted(accept_encoding: str) -> set:
+    """Content codings the client accepts (q > 0)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = params.strip()
+        try:
+            if q.startswith("q=") and float(q[2:]) <= 0:
+                continue
+        except ValueError:
+            continue
+        if coding.strip():
+            accepted.add(coding.strip())
+    return accepted
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+class Assets:
+    """A built asset directory and the URL table served from it."""
+
+    def __init__(self, out: str, manifest: dict):
+        self.out = out
+        self.manifest = manifest
+        # URL name -> (file path, media type, etag base, {coding: (path, stat)}, stat, cache-control)
+        self.served = {}
+        for name, entry in manifest["files"].items():
+            encodings = {c: self._file(p) for c, p in entry["encodings"].items()}
+            hashed = (self._file(entry["path"]), entry["type"], entry["digest"], encodings)
+            self.served[entry["path"]] = hashed + (IMMUTABLE if entry["path"] != name else REVALIDATE,)
+            # The original name stays reachable for external links, but revalidates
+            self.served.setdefault(name, hashed + (REVALIDATE,))
+            for w, path in entry["widths"].items():
+                self.served[path] = (self._file(path), entry["type"], f"{entry['digest']}-w{w}", {}, IMMUTABLE)
+
+    def _file(self, path: str) -> tuple:
+        full = os.path.join(self.out, path)
+        return full, os.stat(full)
+
+    def url(self, name: str) -> str:
+        """Public URL of a source file's current build."""
+        return "/static/" + quote(self.manifest["files"][name]["path"])
+
+    def response(self, name: str, headers) -> Response:
+        """The best representation of `name` for these request headers, or 304 when the client's copy is current."""
+        served = self.served.get(name)
+        if served is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        (path, stat), media_type, etag, encodings, cache_control = served
+
+        coding = None
+        if encodings:
+            accepted = _accepted(headers.get("accept-encoding", ""))
+            coding = next((c for c in ("br", "gzip") if c in encodings and (c in accepted or "*" in accepted)), None)
+        if coding is not None:
+            path, stat = encodings[coding]
+            etag = f"{etag}-{coding}"
+        response_headers = {"ETag": f'"{etag}"', "Cache-Control": cache_control}
+        if encodings:
+            response_headers["Vary"] = "Accept-Encoding"
+        if coding is not None:
+            response_headers["Content-Encoding"] = coding
+
+        if _matches(headers.get("if-none-match", ""), response_headers["ETag"]):
+            return Response(status_code=304, headers=response_headers)
+        return FileResponse(path, media_type=media_type, headers=response_headers, stat_result=stat)
+
+
+def _private(path: str) -> bool:
+    """Whether `path` is a real directory owned by this user that nobody else can write to."""
+    if os.path.islink(path) or not os.path.isdir(path):
+        return False
+    if not hasattr(os, "geteuid"):  # no POSIX ownership to check
+        return True
+    st = os.stat(path)
+    return st.st_uid == os.geteuid() and not st.st_mode & 0o022
+
+
+def _default_out(source: str) -> str:
+    """Per-source build directory in this user's cache dir (kept across restarts).
+
+    Served files come from here, so it must be ours alone. If the cache dir
+    is missing, unwritable or shared, use a fresh private temp dir instead
+    (rebuilt every start).
+    """
+    key = hashlib.sha256(os.path.abspath(source).encode()).hexdigest()[:12]
+    base = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "supplychain")
+    out = os.path.join(base, f"assets-{key}")
+    try:
+        os.makedirs(out, mode=0o700, exist_ok=True)
+        if _private(base) and _private(out):
+            return out
+    except OSError:
+        pass
+    return tempfile.mkdtemp(prefix="supplychain-assets-")
+
+
+def prepare(source: str, out: str = "") -> Assets:
+    """Assets for `source`, reusing the build in `out` while it is current and rebuilding it otherwise.
+    Without `out`, builds into a private per-source directory under the user's cache dir."""
+    if not out:
+        out = _default_out(source)
+    manifest = _load_manifest(out)
+    if manifest is None or manifest.get("fingerprint") != fingerprint(source):
+        manifest = build(source, out)
+    return Assets(out, manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build static/ into hashed, precompressed assets for SUPPLYCHAIN_ASSET_DIR")
+    parser.add_argument("--source", default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static"))
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    manifest = build(args.source, args.out)
+    print(f"built {len(manifest['files'])} assets into {args.out} "
+          f"(brotli {'on' if brotli else 'off'}, image widths {'on' if Image else 'off'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Challenge generation.
+Every challenge is a pure function of (seed, position): its synapse, type and
+ground truth come from uniforms hashed from both, with an O(1) alias-table
+draw per weighted field, or an O(1) draw of a recorded shipment for historical
+challenges when a shipment dataset is loaded. Endpoints take positions from
+one shared stream and tempo cycles key on their tempo number, so a seed
+replays the same workload and any stretch of it can be generated lazily.
+"""
+
+import hashlib
+import itertools
+import random
+import struct
+import threading
+import time
+from datetime import date, timedelta
+
+from . import config, metrics
+from .models import TaskType, ProductType, ShipmentConditions, SupplyChainSynapse
+from .shipments import ShipmentDataset
+
+
+class Uniforms:
+    """Up to 16 uniforms in [0, 1) cut from one BLAKE2b digest of a key.
+
+    Far cheaper to set up than a random.Random (~2 µs vs ~10 µs) and each
+    draw is a tuple lookup; a challenge needs a dozen draws at most.
+    """
+
+    __slots__ = ("words", "i")
+
+    def __init__(self, key: bytes):
+        self.words = struct.unpack("<16I", hashlib.blake2b(key, digest_size=64).digest())
+        self.i = 0
+
+    def random(self) -> float:
+        word = self.words[self.i]
+        self.i += 1
+        return word * 2.3283064365386963e-10  # / 2**32
+
+
+class AliasTable:
+    """Weighted choice over fixed items in O(1) per draw (Vose's alias method)."""
+
+    __slots__ = ("items", "prob", "alias", "n")
+
+    def __init__(self, weighted):
+        items, weights = zip(*weighted)
+        n = len(items)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        prob, alias = [1.0] * n, list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left over is 1.0 up to rounding and keeps prob 1.0
+        self.items, self.prob, self.alias, self.n = items, prob, alias, n
+
+    def draw(self, rand) -> object:
+        # One uniform picks the column (integer part) and the coin (fraction)
+        u = rand.random() * self.n
+        i = int(u)
+        return self.items[i] if u - i < self.prob[i] else self.items[self.alias[i]]
+
+
+# ── Catalogue ──
+# Weights are relative shares of the challenge mix.
+
+ROUTES = AliasTable((
+    (("Shanghai, China", "Los Angeles, USA"), 25),
+    (("Shenzhen, China", "Hamburg, Germany"), 20),
+    (("Busan, South Korea", "Long Beach, USA"), 15),
+    (("Rotterdam, Netherlands", "New York, USA"), 15),
+    (("Tokyo, Japan", "Singapore"), 13),
+    (("Mumbai, India", "Dubai, UAE"), 12),
+))
+
+PRODUCTS = AliasTable((
+    (ProductType.electronics, 30),
+    (ProductType.general, 30),
+    (ProductType.bulk, 20),
+    (ProductType.perishable, 12),
+    (ProductType.hazmat, 8),
+))
+
+CARRIERS = AliasTable((
+    ("MSC", 20), ("Maersk", 17), ("CMA CGM", 15), ("COSCO", 13),
+    ("Hapag-Lloyd", 10), ("Evergreen", 9), ("ONE", 8), ("HMM", 8),
+))
+
+WEATHER = AliasTable((
+    ("clear", 40),
+    ("normal", 35),
+    ("typhoon_warning_western_pacific", 10),
+    ("north_atlantic_storm", 8),
+    ("monsoon_indian_ocean", 7),
+))
+
+CONGESTION = AliasTable((
+    ("normal", 35), ("low", 20), ("shanghai_moderate", 15),
+    ("la_moderate", 12), ("singapore_low", 10), ("shanghai_high", 8),
+))
+
+GEOPOLITICAL = AliasTable((("normal", 75), ("elevated", 25)))
+
+# Same split as the task weights in the subnet spec
+TASKS = AliasTable(((TaskType.eta_prediction, 50), (TaskType.disruption_risk, 30), (TaskType.route_optimization, 20)))
+
+# 70% past shipments with a known outcome, 30% near-term ones without
+CHALLENGE_TYPES = AliasTable((("historical", 70), ("near_term", 30)))
+
+SHIP_DATES = tuple((date(2026, 1, 1) + timedelta(days=d)).isoformat() for d in range(365))
+
+TEMPO_TASKS = (TaskType.eta_prediction, TaskType.disruption_risk, TaskType.route_optimization)
+
+_PRODUCT_TYPES = {p.value: p for p in ProductType}
+
+# Recorded shipments that historical challenges and their outcomes are drawn
+# from (SUPPLYCHAIN_SHIPMENTS); without them outcomes are synthetic
+_shipments = ShipmentDataset(config.SHIPMENTS_PATH) if config.SHIPMENTS_PATH else None
+
+# Position spaces, so stream and tempo challenges never share a key
+_STREAM, _TEMPO = 0, 1
+
+
+# ── Generation ──
+
+def _rand(seed: int, lane: int, index: int) -> Uniforms:
+    return Uniforms(f"{seed}:{lane}:{index}".encode())
+
+
+def _synapse(rand: Uniforms, task_type: TaskType, shipment: dict = None) -> SupplyChainSynapse:
+    """A drawn synapse; with a recorded `shipment`, its lane, cargo, carrier and date are the shipment's."""
+    if shipment is None:
+        origin, destination = ROUTES.draw(rand)
+        product, carrier = PRODUCTS.draw(rand), CARRIERS.draw(rand)
+        ship_date = SHIP_DATES[int(rand.random() * len(SHIP_DATES))]
+    else:
+        origin, destination = shipment["origin"], shipment["destination"]
+        product = _PRODUCT_TYPES.get(shipment["product"], ProductType.general)
+        carrier, ship_date = shipment["carrier"], shipment["ship_date"]
+    return SupplyChainSynapse(
+        task_type=task_type,
+        origin=origin,
+        destination=destination,
+        product_type=product,
+        carrier=carrier,
+        ship_date=ship_date,
+        conditions=ShipmentConditions(
+            weather=WEATHER.draw(rand),
+            port_congestion=CONGESTION.draw(rand),
+            geopolitical=GEOPOLITICAL.draw(rand),
+        ),
+        random_seed=10_000_000 + int(rand.random() * 90_000_000),
+    )
+
+
+def _recorded(shipment: dict) -> dict:
+    return {
+        "actual_eta_days": round(shipment["transit_days"], 1),
+        "had_disruption": shipment["disruption_type"] is not None,
+        "disruption_type": shipment["disruption_type"],
+        "actual_route": f"{shipment['origin']} → {shipment['destination']}",
+    }
+
+
+def _lookup(synapse: SupplyChainSynapse, rng: random.Random):
+    """A recorded shipment on the synapse's route and ship date, or None."""
+    try:
+        rows = _shipments.match(synapse.origin, synapse.destination, synapse.ship_date)
+    except ValueError:  # ship_date is not YYYY-MM-DD
+        return None
+    return _shipments.row(rows[int(rng.random() * len(rows))]) if rows else None
+
+
+def ground_truth(synapse: SupplyChainSynapse, challenge_type: str, fallback_seed: int = 0, shipment: dict = None):
+    """(rng, ground truth) for a challenge; ground truth is None for near-term ones.
+
+    A historical challenge's outcome is `shipment`'s, else that of a recorded
+    shipment on the same route and date when a dataset is loaded, else
+    synthetic. `rng` is seeded from the synapse (or `fallback_seed` when it
+    has none) and has already produced the ground truth, so scoring can keep
+    drawing from it.
+    """
+    with metrics.timed("ground_truth"):
+        rng = random.Random(synapse.random_seed if synapse.random_seed else fallback_seed)
+        if challenge_type != "historical":
+            return rng, None
+        if shipment is None and _shipments is not None:
+            shipment = _lookup(synapse, rng)
+        if shipment is not None:
+            return rng, _recorded(shipment)
+        base_eta = rng.uniform(5, 30)
+        had_disruption = rng.random() < 0.3
+        return rng, {
+            "actual_eta_days": round(base_eta, 1),
+            "had_disruption": had_disruption,
+            "disruption_type": rng.choice(["weather_delay", "port_congestion", "customs_delay", None]) if had_disruption else None,
+            "actual_route": f"{synapse.origin} → {synapse.destination}",
+        }
+
+
+def challenge(seed: int, index: int, task_type: TaskType = None, synapse: SupplyChainSynapse = None):
+    """Challenge `index` of the stream seeded with `seed`.
+
+    Draws the task type too unless `task_type` is given; a caller-supplied
+    `synapse` replaces the generated one but keeps this position's challenge
+    type. Returns (synapse, challenge_type, rng, ground_truth) as ground_truth().
+    """
+    start = time.perf_counter()
+    rand = _rand(seed, _STREAM, index)
+    challenge_type = CHALLENGE_TYPES.draw(rand)
+    shipment = None
+    if synapse is None:
+        if challenge_type == "historical" and _shipments is not None:
+            shipment = _shipments.row(_shipments.sample(rand.random()))
+        synapse = _synapse(rand, task_type or TASKS.draw(rand), shipment)
+    metrics.observe("generation", time.perf_counter() - start)
+    return (synapse, challenge_type) + ground_truth(synapse, challenge_type, rand.words[-1], shipment)
+
+
+def stream(seed: int, start: int = 0, task_type: TaskType = None):
+    """Lazily yield challenge(seed, start), challenge(seed, start + 1), ... without end."""
+    for index in itertools.count(start):
+        yield challenge(seed, index, task_type)
+
+
+def tempo_challenge(tempo: int, i: int, seed: int = None):
+    """Challenge `i` of tempo `tempo`, with task TEMPO_TASKS[i]: historical for the first two, near-term for the last.
+
+    Keyed on the tempo number, so a seed (the shared stream's by default)
+    replays identical tempos. Returns (synapse, challenge_type, rng, ground_truth).
+    """
+    start = time.perf_counter()
+    rand = _rand(_seed if seed is None else seed, _TEMPO, tempo * len(TEMPO_TASKS) + i)
+    challenge_type = "historical" if i < 2 else "near_term"
+    shipment = None
+    if challenge_type == "historical" and _shipments is not None:
+        shipment = _shipments.row(_shipments.sample(rand.random()))
+    synapse = _synapse(rand, TEMPO_TASKS[i], shipment)
+    metrics.observe("generation", time.perf_counter() - start)
+    return (synapse, challenge_type) + ground_truth(synapse, challenge_type, shipment=shipment)
+
+
+# ── Shared stream ──
+# Positions are handed out in request order; concurrent requests may
+# interleave differently, but a seed always yields the same set of challenges.
+
+_lock = threading.Lock()  # guards _seed and _positions
+_seed = config.CHALLENGE_SEED
+_positions = itertools.count()
+
+
+def next_challenge(task_type: TaskType = None, synapse: SupplyChainSynapse = None):
+    """The next challenge of the shared stream (see challenge())."""
+    with _lock:
+        seed, index = _seed, next(_positions)
+    return challenge(seed, index, task_type, synapse)
+
+
+def reset(seed: int = None):
+    """Restart the shared stream from position 0, optionally under a new seed."""
+    global _seed, _positions
+    with _lock:
+        if seed is not None:
+            _seed = seed
+        _positions = itertools.count()
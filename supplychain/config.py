@@ -0,0 +1,108 @@
+"""
+Runtime configuration for the subnet simulator.
+Values are read once from environment variables at import; the defaults
+reproduce the plain in-memory demo.
+"""
+
+import os
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+# ── Miner dispatch ──
+
+# Hard deadline for a miner's response to a challenge (seconds)
+MINER_TIMEOUT_S = _env_float("SUPPLYCHAIN_MINER_TIMEOUT_S", 10.0)
+
+# How much of a stand-in miner's simulated latency is actually waited out.
+# 0 keeps dispatch instantaneous and trusts the model's reported latency;
+# 1 sleeps for the full simulated latency and records the measured round trip.
+MINER_LATENCY_SCALE = _env_float("SUPPLYCHAIN_MINER_LATENCY_SCALE", 0.0)
+
+
+# ── Seeding ──
+
+# Network loaded at startup when there is no persisted state: "default" (the
+# 8-miner / 3-validator demo), "none" (empty), or the path of a snapshot file
+# written by `python -m supplychain.snapshot`
+SEED = os.environ.get("SUPPLYCHAIN_SEED", "default")
+
+# File holding the prebuilt OpenAPI schema (`python main.py --write-openapi`);
+# empty or stale builds it in the background at startup instead
+OPENAPI_CACHE = os.environ.get("SUPPLYCHAIN_OPENAPI_CACHE", "")
+
+
+# ── Static assets ──
+
+# Build directory for the hashed, precompressed copy of static/ (`python -m
+# supplychain.assets --out DIR`); empty builds into ~/.cache/supplychain (or
+# $XDG_CACHE_HOME), never a shared, predictable temp path.
+# A build whose sources changed is rebuilt at startup either way.
+ASSET_DIR = os.environ.get("SUPPLYCHAIN_ASSET_DIR", "")
+
+
+# ── Registry ──
+
+# "dict" keeps one dict per miner/validator; "columnar" stores numeric fields
+# in typed arrays indexed by UID (far smaller for networks well past 256 UIDs)
+REGISTRY_BACKEND = os.environ.get("SUPPLYCHAIN_REGISTRY", "dict")
+
+
+# ── Persistence ──
+
+# SQLite file to mirror state into (WAL mode); empty keeps state in memory only
+DB_PATH = os.environ.get("SUPPLYCHAIN_DB_PATH", "")
+
+# Seconds between write-behind flushes; 0 writes through on every mutation
+FLUSH_INTERVAL_S = _env_float("SUPPLYCHAIN_FLUSH_INTERVAL_S", 1.0)
+
+# PRAGMA synchronous level for each flush: off | normal | full
+DURABILITY = os.environ.get("SUPPLYCHAIN_DURABILITY", "normal")
+
+
+# ── Challenges ──
+
+# Seed of the shared challenge stream; the same seed replays the same
+# challenges and tempos, so runs can be compared on identical workloads
+CHALLENGE_SEED = _env_int("SUPPLYCHAIN_CHALLENGE_SEED", 0)
+
+# Shipment dataset written by `python -m supplychain.shipments`; historical
+# challenges are recorded shipments and score against their real outcomes.
+# Empty keeps synthetic ground truth.
+SHIPMENTS_PATH = os.environ.get("SUPPLYCHAIN_SHIPMENTS", "")
+
+
+# ── Challenge history ──
+
+# Recent challenges kept in the in-memory ring buffer
+CHALLENGE_HISTORY_SIZE = _env_int("SUPPLYCHAIN_CHALLENGE_HISTORY_SIZE", 100)
+
+# Directory for the append-only log of challenges evicted from the ring; empty drops them
+CHALLENGE_SPILL_DIR = os.environ.get("SUPPLYCHAIN_CHALLENGE_SPILL_DIR", "")
+
+# Challenges per on-disk segment file (bounds memory when paging back through history)
+CHALLENGE_SEGMENT_SIZE = _env_int("SUPPLYCHAIN_CHALLENGE_SEGMENT_SIZE", 1000)
+
+
+# ── Scoring ──
+
+# Rounds the per-miner consistency EMA averages over (alpha = 2 / (window + 1))
+CONSISTENCY_WINDOW = _env_int("SUPPLYCHAIN_CONSISTENCY_WINDOW", 100)
+
+
+# ── Profiling ──
+
+# Admin token for on-demand request profiling; empty disables it entirely.
+# A request is profiled when it sends the token as the X-Profile header or ?profile= query flag.
+PROFILE_TOKEN = os.environ.get("SUPPLYCHAIN_PROFILE_TOKEN", "")
+
+# Profiles kept in memory for retrieval by id (oldest dropped first)
+PROFILE_HISTORY = _env_int("SUPPLYCHAIN_PROFILE_HISTORY", 20)
@@ -0,0 +1,80 @@
+"""
+Per-miner consistency state.
+An exponential moving average of each miner's round performance over the
+last ~window rounds, held in flat arrays indexed by UID so a whole
+challenge updates in one vectorized step.
+"""
+
+import numpy as np
+
+PRIOR = 0.75  # consistency credited to a miner before its first scored round
+
+
+class ConsistencyEMA:
+    """EMA (alpha = 2 / (window + 1)) and scored-round count for every UID."""
+
+    def __init__(self, window: int = 100, capacity: int = 256):
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+        self._ema = np.full(capacity, PRIOR)
+        self._rounds = np.zeros(capacity, dtype=np.int64)
+
+    def _grow(self, uid: int):
+        capacity = len(self._ema)
+        if uid < capacity:
+            return
+        while capacity <= uid:
+            capacity *= 2
+        extra = capacity - len(self._ema)
+        # _ema last: readers bound UIDs by len(_ema), so _rounds must already be as long
+        self._rounds = np.concatenate([self._rounds, np.zeros(extra, dtype=np.int64)])
+        self._ema = np.concatenate([self._ema, np.full(extra, PRIOR)])
+
+    def get(self, uid: int):
+        """(ema, rounds) for one UID; unseen UIDs report the prior and 0 rounds."""
+        if uid >= len(self._ema):
+            return PRIOR, 0
+        return self._ema[uid].item(), self._rounds[uid].item()
+
+    def values(self, uids) -> np.ndarray:
+        """Current EMA of each UID in `uids` (read-only, so safe next to a concurrent update)."""
+        uids = np.asarray(uids, dtype=np.int64)
+        ema = self._ema
+        known = uids < len(ema)
+        if known.all():
+            return ema[uids]
+        out = np.full(len(uids), PRIOR)
+        out[known] = ema[uids[known]]
+        return out
+
+    def update(self, uids, performance):
+        """Fold one round's performance (0..1) into each UID's EMA. UIDs must be unique."""
+        uids = np.asarray(uids, dtype=np.int64)
+        if not len(uids):
+            return
+        self._grow(int(uids.max()))
+        ema = self._ema[uids]
+        self._ema[uids] = ema + self.alpha * (np.asarray(performance, dtype=np.float64) - ema)
+        self._rounds[uids] += 1
+
+    def advance(self, uids, performance, rounds):
+        """Closed form of `rounds` updates with the same `performance` value, per UID."""
+        uids = np.asarray(uids, dtype=np.int64)
+        if not len(uids):
+            return
+        self._grow(int(uids.max()))
+        rounds = np.asarray(rounds, dtype=np.int64)
+        keep = (1 - self.alpha) ** rounds
+        self._ema[uids] = keep * self._ema[uids] + (1 - keep) * np.asarray(performance, dtype=np.float64)
+        self._rounds[uids] += rounds
+
+    def set(self, uid: int, ema: float, rounds: int):
+        """Restore one UID's saved state."""
+        self._grow(uid)
+        self._ema[uid] = ema
+        self._rounds[uid] = rounds
+
+    def reset(self, uid: int):
+        if uid < len(self._ema):
+            self._ema[uid] = PRIOR
+            self._rounds[uid] = 0
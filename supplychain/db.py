@@ -1,25 +1,100 @@
 """
 In-memory database for subnet state simulation.
 Pre-populated with realistic miners, validators, and network data.
+Optionally mirrored to SQLite (config.DB_PATH) and rehydrated on restart.
+Safe to mutate from FastAPI's threadpool: writers take narrow locks (striped
+by UID for per-record updates), readers take none.
 """
 
+import atexit
+import bisect
 import random
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from . import config
+from .consistency import ConsistencyEMA
+from .history import ChallengeHistory
+from .persistence import SQLiteStore
+from . import snapshot
+from .registry import MINER_SCHEMA, VALIDATOR_SCHEMA, make_registry
+from .scoring import round_performance
+from .scorestats import ScoreStats, score_columns
+from .yuma import MINER_CUT, yuma_epoch
+
 # ── Global Subnet State ──
 
-_state = {
-    "block_height": 2_847_320,
-    "current_tempo": 7912,
-    "total_emission_per_tempo": 1.024,  # TAO per tempo
-    "miners": {},
-    "validators": {},
-    "challenges": [],
-    "leaderboard_cache": [],
-    "next_miner_uid": 0,
-    "next_validator_uid": 0,
-}
+def _fresh_state() -> dict:
+    return {
+        "block_height": 2_847_320,
+        "current_tempo": 7912,
+        "total_emission_per_tempo": 1.024,  # TAO per tempo
+        "miners": make_registry(config.REGISTRY_BACKEND, MINER_SCHEMA, lambda: _all_stripes(_miner_locks)),
+        "validators": make_registry(config.REGISTRY_BACKEND, VALIDATOR_SCHEMA,
+                                    lambda: _all_stripes(_validator_locks)),
+        "challenges": ChallengeHistory(
+            config.CHALLENGE_HISTORY_SIZE, config.CHALLENGE_SPILL_DIR, config.CHALLENGE_SEGMENT_SIZE,
+        ),
+        "leaderboard_index": [],  # sorted (-avg_score, uid) keys, best miner first; replaced, never mutated
+        "leaderboard_keys": {},   # uid -> its key in leaderboard_index
+        "miner_hotkeys": {},      # hotkey -> uid
+        "miner_coldkeys": {},     # coldkey -> [uid, ...]
+        "validator_hotkeys": {},
+        "validator_coldkeys": {},
+        "weights": {},            # validator uid -> {miner uid: weight}, last set_weights call
+        "bonds": {},              # validator uid -> {miner uid: bond}, Yuma bond EMA
+        "consistency": ConsistencyEMA(config.CONSISTENCY_WINDOW),
+        "score_stats": ScoreStats(),
+        "streaks": {},            # uid -> consecutive closed tempos in the top STREAK_RANKS; replaced, never mutated
+        "next_miner_uid": 0,
+        "next_validator_uid": 0,
+    }
+
+
+# Leaderboard places that extend a miner's streak when a tempo closes
+STREAK_RANKS = 10
+
+_state = _fresh_state()
+
+
+# ── Locking ──
+# Route handlers run concurrently in FastAPI's threadpool. Every read-modify-write
+# holds the narrowest lock covering it; nothing holds two of these at once except
+# in the order registry -> index, or registry -> every stripe while a columnar
+# registry grows. Reads take no lock: registries iterate over snapshots and the
+# leaderboard index is swapped, not edited, so a reader always sees a complete,
+# sorted list.
+
+LOCK_STRIPES = 64
+
+_miner_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]      # miner record fields, by uid % LOCK_STRIPES
+_validator_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]  # validator record fields, likewise
+_registry_lock = threading.Lock()     # membership, hotkey/coldkey indexes, UID counters
+_index_lock = threading.Lock()        # leaderboard index swaps
+_chain_lock = threading.Lock()        # block height and tempo
+_history_lock = threading.Lock()      # challenge history appends
+_consistency_lock = threading.Lock()  # consistency EMA arrays
+_stats_lock = threading.Lock()        # per-miner score statistics arrays
+
+
+@contextmanager
+def _all_stripes(locks):
+    """Hold every stripe of a registry's record locks, in order."""
+    for lock in locks:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+
+
+# Held for a whole Yuma epoch (weights -> bonds -> payout); bulk evolution holds it too
+epoch_lock = threading.Lock()
 
 
 def _init_default_data():
@@ -97,7 +172,7 @@ def _init_default_data():
 
     for m in default_miners:
         uid = _state["next_miner_uid"]
-        _state["miners"][uid] = {
+        _load_miner({
             "uid": uid,
             "hotkey": m["hotkey"],
             "coldkey": m["coldkey"],
@@ -111,7 +186,7 @@ def _init_default_data():
             "avg_score": m["avg_score"],
             "total_tau_earned": m["total_tau_earned"],
             "last_active_block": _state["block_height"] - random.randint(0, 50),
-        }
+        })
         _state["next_miner_uid"] += 1
 
     # Pre-seed 3 validators
@@ -138,7 +213,7 @@ def _init_default_data():
 
     for v in default_validators:
         uid = _state["next_validator_uid"]
-        _state["validators"][uid] = {
+        _load_validator({
             "uid": uid,
             "hotkey": v["hotkey"],
             "coldkey": v["coldkey"],
@@ -149,12 +224,181 @@ def _init_default_data():
             "challenges_sent": v["challenges_sent"],
             "last_weight_block": _state["block_height"] - random.randint(0, 100),
             "bond_strength": v["bond_strength"],
-        }
+        })
         _state["next_validator_uid"] += 1
 
+    _reindex(list(_state["miners"]))
+
+
+# ── Leaderboard Index ──
+# Kept in step by every avg_score write so ranking reads never re-sort.
+# Ties resolve by ascending UID, same as a stable sort over the registry.
+
+# Up to this many changed miners, copy and patch the index; past it, rebuild by merge
+_PATCH_LIMIT = 32
+
+
+def _reindex(uids):
+    """Re-rank `uids` at their current avg_score (dropping deregistered ones) and publish a new index.
+
+    Reads the score from the record under the lock, so whichever writer
+    publishes last leaves the index matching the registry.
+    """
+    miners = _state["miners"]
+    with _index_lock:
+        keys = _state["leaderboard_keys"]
+        changed = set(uids)
+        stale, fresh = [], []
+        for uid in changed:
+            old = keys.pop(uid, None)
+            if old is not None:
+                stale.append(old)
+            miner = miners.get(uid)
+            if miner is not None:
+                keys[uid] = (-miner["avg_score"], uid)
+                fresh.append(keys[uid])
+
+        if len(changed) <= _PATCH_LIMIT:
+            index = list(_state["leaderboard_index"])
+            for key in stale:
+                del index[bisect.bisect_left(index, key)]
+            for key in fresh:
+                bisect.insort(index, key)
+        else:
+            index = [key for key in _state["leaderboard_index"] if key[1] not in changed]
+            index.extend(sorted(fresh))
+            index.sort()  # two sorted runs: a linear merge
+        _state["leaderboard_index"] = index
+
+
+# ── Key Indexes ──
+# hotkey -> uid and coldkey -> [uids] for miners and validators, so uniqueness
+# checks and owner lookups never scan the registry. Writers mutate the uid lists
+# in place under _registry_lock; readers copy one before walking it.
+
+def _index_keys(kind: str, record: dict):
+    _state[f"{kind}_hotkeys"][record["hotkey"]] = record["uid"]
+    _state[f"{kind}_coldkeys"].setdefault(record["coldkey"], []).append(record["uid"])
+
+
+def _unindex_keys(kind: str, record: dict):
+    _state[f"{kind}_hotkeys"].pop(record["hotkey"], None)
+    coldkeys = _state[f"{kind}_coldkeys"]
+    uids = coldkeys.get(record["coldkey"])
+    if uids is None:
+        return
+    if record["uid"] in uids:
+        uids.remove(record["uid"])
+    if not uids:
+        del coldkeys[record["coldkey"]]
+
+
+def _owned(kind: str, coldkey: str) -> list:
+    """Records registered to `coldkey`, from a copy of its uid list."""
+    registry = _state[f"{kind}s"]
+    uids = tuple(_state[f"{kind}_coldkeys"].get(coldkey, ()))
+    return [record for record in map(registry.get, uids) if record is not None]
+
+
+def _load_miner(record: dict) -> dict:
+    """Place a full miner record in the registry and key indexes (callers re-rank it)."""
+    uid = record["uid"]
+    _state["miners"][uid] = record
+    _index_keys("miner", record)
+    return _state["miners"][uid]
+
+
+def _load_validator(record: dict) -> dict:
+    uid = record["uid"]
+    _state["validators"][uid] = record
+    _index_keys("validator", record)
+    return _state["validators"][uid]
+
+
+# ── Persistence ──
+
+def _restore(saved: dict):
+    """Rebuild state (and its indexes) from a SQLiteStore or snapshot-file snapshot."""
+    for key, value in saved["meta"].items():
+        _state[key] = value
+    streaks = {}
+    for record in saved["miners"]:
+        consistency = record.pop("consistency", None)
+        score_stats = record.pop("score_stats", None)
+        streak = record.pop("streak", 0)
+        _load_miner(record)
+        if consistency:
+            _state["consistency"].set(record["uid"], consistency["ema"], consistency["rounds"])
+        if score_stats:
+            _state["score_stats"].set(record["uid"], score_stats)
+        if streak:
+            streaks[record["uid"]] = streak
+    _state["streaks"] = streaks
+    _reindex(list(_state["miners"]))
+    for record in saved["validators"]:
+        _load_validator(record)
+    # Snapshot files carry no Yuma state; a SQLite store restores the last weights and bond EMA
+    for table in ("weights", "bonds"):
+        _state[table].update(saved.get(table, {}))
+    for challenge in saved["challenges"]:
+        _state["challenges"].append(challenge)
+
+
+def _seed():
+    """Populate an empty network as config.SEED says: default demo, nothing, or a snapshot file."""
+    if config.SEED == "none":
+        return
+    if config.SEED == "default":
+        _init_default_data()
+    else:
+        _restore(snapshot.load(config.SEED))
+
+
+def _miner_extras(uid: int) -> dict:
+    """Per-miner state held outside the record, saved in its SQLite row (and popped again by _restore)."""
+    ema, rounds = _state["consistency"].get(uid)
+    return {
+        "consistency": {"ema": ema, "rounds": rounds},
+        "score_stats": _state["score_stats"].state(uid),
+        "streak": _state["streaks"].get(uid, 0),
+    }
+
+
+def _mark_miners(uids):
+    """Queue the SQLite rows of `uids` that are still registered."""
+    miners = _state["miners"]
+    _store.mark_many("miners", [uid for uid in uids if uid in miners])
+
+
+def _open_store():
+    if not config.DB_PATH:
+        return None
+    store = SQLiteStore(config.DB_PATH, config.FLUSH_INTERVAL_S, config.DURABILITY, config.CHALLENGE_HISTORY_SIZE)
+    store.attach(_state, extras={"miners": _miner_extras})
+    saved = store.load()
+    if saved:
+        _restore(saved)
+    else:
+        _seed()
+        store.mark_all()
+    store.start()
+    atexit.register(store.close)
+    return store
+
+
+def _flush_history():
+    """Spill the in-memory challenge ring at exit. With SQLite it restores the ring itself, so only close."""
+    with _history_lock:
+        if _store is None:
+            _state["challenges"].flush()
+        _state["challenges"].close()
 
-# Initialize on import
-_init_default_data()
+
+# Initialize on import: rehydrate from disk if configured, else seed per config.SEED
+_store = _open_store()
+if _store is None:
+    _seed()
+atexit.register(_flush_history)
 
 
 # ── Access Functions ──
@@ -163,6 +407,19 @@ def get_state():
     return _state
 
 
+def reset_state():
+    """Throw away all subnet state and re-seed it (per config.SEED) in place.
+
+    For isolated simulation replicas; refuses to run while mirrored to SQLite.
+    """
+    if _store:
+        raise RuntimeError("reset_state() would desync the SQLite store; unset SUPPLYCHAIN_DB_PATH")
+    _state["challenges"].close()
+    _state.clear()
+    _state.update(_fresh_state())
+    _seed()
+
+
 def get_miners():
     return _state["miners"]
 
@@ -172,24 +429,60 @@ def get_miner(uid: int):
 
 
 def add_miner(data: dict) -> dict:
-    uid = _state["next_miner_uid"]
-    _state["miners"][uid] = {
-        "uid": uid,
-        "hotkey": data["hotkey"],
-        "coldkey": data["coldkey"],
-        "tier": data.get("tier", "entry"),
-        "ip": data["ip"],
-        "port": data.get("port", 8091),
-        "model_name": data.get("model_name"),
-        "stake": 0.0,
-        "is_active": True,
-        "total_challenges": 0,
-        "avg_score": 0.0,
-        "total_tau_earned": 0.0,
-        "last_active_block": _state["block_height"],
-    }
-    _state["next_miner_uid"] += 1
-    return _state["miners"][uid]
+    """Register a new miner; raises ValueError if its hotkey is already registered."""
+    with _registry_lock:
+        if data["hotkey"] in _state["miner_hotkeys"]:
+            raise ValueError("Hotkey already registered")
+        uid = _state["next_miner_uid"]
+        miner = _load_miner({
+            "uid": uid,
+            "hotkey": data["hotkey"],
+            "coldkey": data["coldkey"],
+            "tier": data.get("tier", "entry"),
+            "ip": data["ip"],
+            "port": data.get("port", 8091),
+            "model_name": data.get("model_name"),
+            "stake": 0.0,
+            "is_active": True,
+            "total_challenges": 0,
+            "avg_score": 0.0,
+            "total_tau_earned": 0.0,
+            "last_active_block": _state["block_height"],
+        })
+        _state["next_miner_uid"] += 1
+        _reindex([uid])
+    if _store:
+        _store.mark("miners", uid)
+        _store.mark_meta()
+    return miner
+
+
+def remove_miner(uid: int):
+    """Deregister a miner. Returns the removed record, or None if unknown."""
+    with _registry_lock:
+        miner = _state["miners"].pop(uid, None)
+        if miner:
+            _unindex_keys("miner", miner)
+            _reindex([uid])
+    if miner:
+        with _consistency_lock:
+            _state["consistency"].reset(uid)
+        with _stats_lock:
+            _state["score_stats"].reset(uid)
+        with _chain_lock:
+            _state["streaks"] = {u: n for u, n in _state["streaks"].items() if u != uid}
+        if _store:
+            _store.mark_deleted("miners", uid)
+    return miner
+
+
+def get_miner_by_hotkey(hotkey: str):
+    uid = _state["miner_hotkeys"].get(hotkey)
+    return _state["miners"][uid] if uid is not None else None
+
+
+def get_miners_by_coldkey(coldkey: str):
+    return _owned("miner", coldkey)
 
 
 def get_validators():
@@ -201,53 +494,379 @@ def get_validator(uid: int):
 
 
 def add_validator(data: dict) -> dict:
-    uid = _state["next_validator_uid"]
-    _state["validators"][uid] = {
-        "uid": uid,
-        "hotkey": data["hotkey"],
-        "coldkey": data["coldkey"],
-        "ip": data["ip"],
-        "port": data.get("port", 8092),
-        "stake": data.get("stake", 0.0),
-        "is_active": True,
-        "challenges_sent": 0,
-        "last_weight_block": None,
-        "bond_strength": 0.0,
-    }
-    _state["next_validator_uid"] += 1
-    return _state["validators"][uid]
+    """Register a new validator; raises ValueError if its hotkey is already registered."""
+    with _registry_lock:
+        if data["hotkey"] in _state["validator_hotkeys"]:
+            raise ValueError("Hotkey already registered")
+        uid = _state["next_validator_uid"]
+        validator = _load_validator({
+            "uid": uid,
+            "hotkey": data["hotkey"],
+            "coldkey": data["coldkey"],
+            "ip": data["ip"],
+            "port": data.get("port", 8092),
+            "stake": data.get("stake", 0.0),
+            "is_active": True,
+            "challenges_sent": 0,
+            "last_weight_block": None,
+            "bond_strength": 0.0,
+        })
+        _state["next_validator_uid"] += 1
+    if _store:
+        _store.mark("validators", uid)
+        _store.mark_meta()
+    return validator
+
+
+def remove_validator(uid: int):
+    """Deregister a validator. Returns the removed record, or None if unknown."""
+    with _registry_lock:
+        validator = _state["validators"].pop(uid, None)
+        if validator:
+            _unindex_keys("validator", validator)
+    if validator:
+        _state["weights"].pop(uid, None)
+        _state["bonds"].pop(uid, None)
+        if _store:
+            for table in ("validators", "weights", "bonds"):
+                _store.mark_deleted(table, uid)
+    return validator
+
+
+def get_validator_by_hotkey(hotkey: str):
+    uid = _state["validator_hotkeys"].get(hotkey)
+    return _state["validators"][uid] if uid is not None else None
+
 
+def get_validators_by_coldkey(coldkey: str):
+    return _owned("validator", coldkey)
 
-def add_challenge(challenge: dict):
-    _state["challenges"].append(challenge)
-    if len(_state["challenges"]) > 100:
-        _state["challenges"] = _state["challenges"][-100:]
+
+def record_validator_activity(uid: int, challenges: int = 1, weight_block: int = None):
+    """Count challenges a validator sent and, if it set weights, the block it did so at."""
+    validator = _state["validators"].get(uid)
+    if validator:
+        with _validator_locks[uid % LOCK_STRIPES]:
+            validator["challenges_sent"] += challenges
+            if weight_block is not None:
+                validator["last_weight_block"] = weight_block
+        if _store:
+            _store.mark("validators", uid)
+
+
+def add_challenge(challenge: dict) -> int:
+    with _history_lock:
+        seq = _state["challenges"].append(challenge)
+    if _store:
+        _store.add_challenge(challenge)
+    return seq
 
 
 def get_challenges(limit: int = 20):
-    return list(reversed(_state["challenges"][-limit:]))
+    return _state["challenges"].recent(limit)
+
+
+def challenge_history_size():
+    """(challenges held in memory, challenges ever recorded)."""
+    history = _state["challenges"]
+    return len(history), history.total
+
+
+def store_healthy():
+    """None without SQLite; else whether the latest write-behind flush succeeded."""
+    return _store.healthy if _store else None
+
+
+def page_challenges(cursor: int = None, limit: int = 20):
+    """(challenges newest first, next_cursor) reading back through spilled history."""
+    return _state["challenges"].page(cursor, limit)
 
 
 def advance_block(n: int = 1):
-    _state["block_height"] += n
+    with _chain_lock:
+        _state["block_height"] += n
+    if _store:
+        _store.mark_meta()
+
+
+def set_streaks(streaks: dict):
+    """Replace every top-10 streak ({uid: tempos}, nonzero entries only); for fast-forward."""
+    with _chain_lock:
+        old, _state["streaks"] = _state["streaks"], dict(streaks)
+    if _store:
+        _mark_miners(set(old) | set(streaks))
+
+
+def get_streaks() -> dict:
+    """uid -> consecutive closed tempos in the top 10; miners not in it are absent."""
+    return _state["streaks"]
+
+
+def skip_tempos(n: int):
+    """Move the chain `n` tempos ahead without running epochs (fast-forward accounts for those itself)."""
+    with _chain_lock:
+        _state["current_tempo"] += n
+        _state["block_height"] += 360 * n
+    if _store:
+        _store.mark_meta()
 
 
 def advance_tempo():
-    _state["current_tempo"] += 1
-    _state["block_height"] += 360
+    """Close the current tempo: run Yuma Consensus, pay out emission, extend top-10 streaks, move to the next tempo."""
+    epoch = run_epoch()
+    top = [m["uid"] for m in get_top_miners(STREAK_RANKS)]
+    with _chain_lock:
+        streaks = _state["streaks"]
+        _state["streaks"] = {uid: streaks.get(uid, 0) + 1 for uid in top}
+        _state["current_tempo"] += 1
+        _state["block_height"] += 360
+    if _store:
+        _store.mark_meta()
+        _mark_miners(set(streaks) | set(top))
+    return epoch
+
+
+# ── Weights & Yuma Consensus ──
+
+def set_weights(uid: int, weights: dict):
+    """Replace a validator's weight row ({miner uid: weight}); it counts from the next epoch."""
+    if uid in _state["validators"]:
+        _state["weights"][uid] = dict(weights)
+        if _store:
+            _store.mark("weights", uid)
+
+
+def get_weights(uid: int):
+    return _state["weights"].get(uid)
+
+
+def epoch_inputs(only=None):
+    """Yuma inputs from the live state: (miner_uids, validator_uids, weights, bonds, stake).
+
+    Active miners are the columns (restricted to the UIDs in `only`, in that
+    order, when given); active validators with a weight row are the rows.
+    """
+    miners, validators = _state["miners"], _state["validators"]
+    if only is None:
+        miner_uids = [uid for uid, m in miners.items() if m["is_active"]]
+    else:
+        miner_uids = [uid for uid in only if miners.get(uid) and miners[uid]["is_active"]]
+    validator_uids = [uid for uid, v in validators.items() if v["is_active"] and uid in _state["weights"]]
+    # miner uid -> matrix column (-1 for inactive / deregistered miners)
+    column = np.full(max(miner_uids, default=0) + 1, -1)
+    column[miner_uids] = np.arange(len(miner_uids))
+
+    shape = (len(validator_uids), len(miner_uids))
+    weights, bonds = np.zeros(shape), np.zeros(shape)
+    for i, vuid in enumerate(validator_uids):
+        for matrix, rows in ((weights, _state["weights"]), (bonds, _state["bonds"])):
+            row = rows.get(vuid)
+            if not row:
+                continue
+            row_uids = np.fromiter(row.keys(), dtype=np.int64, count=len(row))
+            values = np.fromiter(row.values(), dtype=np.float64, count=len(row))
+            cols = np.where(row_uids < len(column), column[np.minimum(row_uids, len(column) - 1)], -1)
+            matrix[i, cols[cols >= 0]] = values[cols >= 0]
+    stake = np.array([validators[uid]["stake"] for uid in validator_uids], dtype=np.float64)
+    return miner_uids, validator_uids, weights, bonds, stake
+
+
+def store_bonds(miner_uids, validator_uids, bonds, incentive):
+    """Save an epoch's bond matrix and set each validator's bond_strength from it."""
+    validators = _state["validators"]
+    bond_strength = bonds @ incentive
+    for i, uid in enumerate(validator_uids):
+        _state["bonds"][uid] = dict(zip(miner_uids, bonds[i].tolist()))
+        with _validator_locks[uid % LOCK_STRIPES]:
+            validators[uid]["bond_strength"] = round(bond_strength[i].item(), 4)
+        if _store:
+            _store.mark("validators", uid)
+            _store.mark("bonds", uid)
+
+
+def run_epoch() -> dict:
+    """Run Yuma over every active validator's weights and credit the miner share of this tempo's emission.
+
+    Miners earn total_emission_per_tempo * MINER_CUT in proportion to their
+    incentive; each validator's bond_strength becomes the share of that
+    incentive its bonds cover. Returns {"incentive": {uid: ...},
+    "dividends": {uid: ...}, "consensus": {uid: ...}, "miner_emission": float}.
+    """
+    miners = _state["miners"]
+    with epoch_lock:
+        miner_uids, validator_uids, weights, bonds, stake = epoch_inputs()
+
+        result = yuma_epoch(weights, stake, bonds)
+        incentive = result["incentive"]
+
+        emission = _state["total_emission_per_tempo"] * MINER_CUT
+        for uid, share in zip(miner_uids, incentive.tolist()):
+            miner = miners.get(uid)
+            if share > 0 and miner:
+                with _miner_locks[uid % LOCK_STRIPES]:
+                    miner["total_tau_earned"] = round(miner["total_tau_earned"] + emission * share, 4)
+                if _store:
+                    _store.mark("miners", uid)
+
+        store_bonds(miner_uids, validator_uids, result["bonds"], incentive)
+
+    return {
+        "miner_emission": emission,
+        "incentive": dict(zip(miner_uids, _round_list(incentive))),
+        "consensus": dict(zip(miner_uids, _round_list(result["consensus"]))),
+        "dividends": dict(zip(validator_uids, _round_list(result["dividends"]))),
+    }
 
 
-def update_miner_score(uid: int, score: float, tau: float):
-    miner = _state["miners"].get(uid)
-    if miner:
-        total = miner["total_challenges"]
-        miner["avg_score"] = round((miner["avg_score"] * total + score) / (total + 1), 4)
-        miner["total_challenges"] += 1
-        miner["total_tau_earned"] = round(miner["total_tau_earned"] + tau, 4)
-        miner["last_active_block"] = _state["block_height"]
+def _round_list(values, ndigits: int = 6):
+    return [round(v, ndigits) for v in values.tolist()]
+
+
+def set_miner_totals(totals):
+    """Overwrite running totals for many miners at once (bulk evolution).
+
+    `totals` holds (uid, avg_score, total_challenges, total_tau_earned) rows.
+    """
+    miners, block = _state["miners"], _state["block_height"]
+    touched = []
+    for uid, avg_score, total_challenges, total_tau_earned in totals:
+        miner = miners.get(uid)
+        if not miner:
+            continue
+        with _miner_locks[uid % LOCK_STRIPES]:
+            miner["avg_score"] = round(avg_score, 4)
+            miner["total_challenges"] = total_challenges
+            miner["total_tau_earned"] = round(total_tau_earned, 4)
+            miner["last_active_block"] = block
+        touched.append(uid)
+        if _store:
+            _store.mark("miners", uid)
+    _reindex(touched)
+
+
+def update_miner_scores(updates):
+    """Fold one new score into each miner's average ((uid, score) pairs), then re-rank them together."""
+    miners, block = _state["miners"], _state["block_height"]
+    touched = []
+    for uid, score in updates:
+        miner = miners.get(uid)
+        if not miner:
+            continue
+        with _miner_locks[uid % LOCK_STRIPES]:
+            total = miner["total_challenges"]
+            miner["avg_score"] = round((miner["avg_score"] * total + score) / (total + 1), 4)
+            miner["total_challenges"] = total + 1
+            miner["last_active_block"] = block
+        touched.append(uid)
+        if _store:
+            _store.mark("miners", uid)
+    _reindex(touched)
+
+
+def update_miner_score(uid: int, score: float):
+    update_miner_scores([(uid, score)])
+
+
+# ── Consistency ──
+
+def get_consistency(uid: int):
+    """(ema, rounds) of a miner's consistency EMA."""
+    return _state["consistency"].get(uid)
+
+
+def consistency_scores(uids):
+    """Consistency EMA of each miner in `uids`, as a numpy column."""
+    return _state["consistency"].values(uids)
+
+
+def record_consistency(scores: list):
+    """Fold a ground-truth-scored challenge (score_challenge results) into every miner's consistency EMA."""
+    uids, performance = round_performance(scores)
+    with _consistency_lock:
+        _state["consistency"].update(uids, performance)
+    if _store:
+        _mark_miners(uids.tolist())
+
+
+def advance_consistency(uids, performance, rounds):
+    """Fold `rounds` rounds of mean `performance` into each miner's consistency EMA at once."""
+    with _consistency_lock:
+        _state["consistency"].advance(uids, performance, rounds)
+    if _store:
+        _mark_miners(uids)
+
+
+# ── Score statistics ──
+
+def score_stats() -> ScoreStats:
+    """Per-miner running statistics of every ScoreBreakdown dimension (read-only use)."""
+    return _state["score_stats"]
+
+
+def record_score_stats(scores: list):
+    """Fold one challenge's score_challenge results into each miner's score statistics."""
+    uids, values = score_columns(scores)
+    with _stats_lock:
+        _state["score_stats"].update(uids, values)
+    if _store:
+        _mark_miners(uids.tolist())
+
+
+def merge_score_stats(uids, count, total, total_sq, sketch):
+    """Fold many scores per miner at once (see ScoreStats.merge)."""
+    with _stats_lock:
+        _state["score_stats"].merge(uids, count, total, total_sq, sketch)
+    if _store:
+        _mark_miners(uids)
+
+
+def total_stake() -> float:
+    return _state["miners"].total("stake") + _state["validators"].total("stake")
+
+
+def count_active_miners() -> int:
+    return _state["miners"].count_active()
+
+
+def count_active_validators() -> int:
+    return _state["validators"].count_active()
+
+
+def total_miner_score() -> float:
+    return _state["miners"].total("avg_score")
 
 
 def get_leaderboard():
-    miners = list(_state["miners"].values())
-    miners.sort(key=lambda m: m["avg_score"], reverse=True)
-    return miners
+    miners = _state["miners"]
+    ranked = (miners.get(uid) for _, uid in _state["leaderboard_index"])
+    return [m for m in ranked if m is not None]
+
+
+def get_top_miners(k: int, active_only: bool = False):
+    """Best `k` miners by avg_score, walking the index from the top."""
+    miners = _state["miners"]
+    top = []
+    for _, uid in _state["leaderboard_index"]:
+        if len(top) >= k:
+            break
+        miner = miners.get(uid)
+        if miner is None or (active_only and not miner["is_active"]):
+            continue
+        top.append(miner)
+    return top
+
+
+def get_miner_rank(uid: int):
+    """1-based leaderboard rank of a miner, or None if unknown."""
+    miner = _state["miners"].get(uid)
+    if not miner:
+        return None
+    return bisect.bisect_left(_state["leaderboard_index"], (-miner["avg_score"], uid)) + 1
+
+
+def get_miner_at_rank(rank: int):
+    """Miner holding 1-based `rank`, or None if out of range."""
+    index = _state["leaderboard_index"]
+    if not 1 <= rank <= len(index):
+        return None
+    return _state["miners"].get(index[rank - 1][1])
@@ -0,0 +1,113 @@
+"""
+Miner Dispatch Layer
+Fans a SupplyChainSynapse out to every miner at once and enforces the
+per-miner response deadline. Miners that miss it are dropped from the
+round, so a tempo takes about as long as its slowest on-time miner.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from . import config
+from .ai import run_miner_prediction
+
+# (miner record, synapse dict) -> raw MinerPrediction-shaped dict
+MinerEndpoint = Callable[[dict, dict], Awaitable[dict]]
+
+
+async def local_miner_endpoint(miner: dict, synapse_dict: dict) -> dict:
+    """Stand-in for a miner axon: runs the tier model in-process, then waits out its simulated latency."""
+    result = run_miner_prediction(synapse_dict, miner["tier"])
+    if config.MINER_LATENCY_SCALE > 0:
+        await asyncio.sleep(result["response_time_ms"] / 1000 * config.MINER_LATENCY_SCALE)
+    return result
+
+
+async def _query_miner(endpoint: MinerEndpoint, miner: dict, synapse_dict: dict) -> dict:
+    start = time.perf_counter()
+    result = await endpoint(miner, synapse_dict)
+    if config.MINER_LATENCY_SCALE > 0:
+        # Real round trip replaces the latency the model reported for itself
+        result["response_time_ms"] = round((time.perf_counter() - start) * 1000, 0)
+    result["miner_uid"] = miner["uid"]
+    result["miner_hotkey"] = miner["hotkey"]
+    return result
+
+
+async def dispatch(
+    synapse_dict: dict,
+    miners: List[dict],
+    timeout: Optional[float] = None,
+    endpoint: MinerEndpoint = local_miner_endpoint,
+) -> dict:
+    """Query all `miners` concurrently and collect whatever arrives before the deadline.
+
+    Returns {"predictions": [...], "timed_out": [uid, ...], "elapsed_ms": float}.
+    Predictions keep the order of `miners`, not arrival order, so scoring
+    stays deterministic. A miner that raises is treated like a timeout.
+    """
+    timeout = config.MINER_TIMEOUT_S if timeout is None else timeout
+    start = time.perf_counter()
+
+    tasks = [asyncio.ensure_future(_query_miner(endpoint, m, synapse_dict)) for m in miners]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    predictions, timed_out = [], []
+    for miner, task in zip(miners, tasks):
+        if task.cancelled() or task.exception() is not None:
+            timed_out.append(miner["uid"])
+            continue
+        result = task.result()
+        # Without real sleeping, the model's own latency decides who missed the deadline
+        if config.MINER_LATENCY_SCALE <= 0 and result["response_time_ms"] > timeout * 1000:
+            timed_out.append(miner["uid"])
+            continue
+        predictions.append(result)
+
+    return {
+        "predictions": predictions,
+        "timed_out": timed_out,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+# ── Blocking entry point ──
+# Sync route handlers run in FastAPI's threadpool, outside any event loop. They
+# all hand their dispatches to one long-lived loop on a daemon thread instead
+# of building and tearing down a loop per challenge with asyncio.run().
+
+_loop_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+
+
+def _dispatch_loop() -> asyncio.AbstractEventLoop:
+    """The shared dispatch loop, started on first use (and again in a forked child, which has no loop thread)."""
+    global _loop, _loop_pid
+    loop = _loop
+    if loop is not None and _loop_pid == os.getpid():
+        return loop
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="miner-dispatch", daemon=True).start()
+            _loop, _loop_pid = loop, os.getpid()
+        return _loop
+
+
+def dispatch_sync(
+    synapse_dict: dict,
+    miners: List[dict],
+    timeout: Optional[float] = None,
+    endpoint: MinerEndpoint = local_miner_endpoint,
+) -> dict:
+    """Blocking wrapper for sync callers: runs dispatch() on the shared loop and waits for its result."""
+    return asyncio.run_coroutine_threadsafe(dispatch(synapse_dict, miners, timeout, endpoint), _dispatch_loop()).result()
@@ -0,0 +1,68 @@
+"""
+JSON fast path for hot responses.
+Internal records already have the wire shape, so these endpoints encode
+them straight to bytes instead of building Pydantic models and letting
+FastAPI validate them again. Uses orjson when installed, else the stdlib.
+"""
+
+import json
+import math
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj):
+    """Copy of `obj` with NaN / Infinity replaced by None, the way orjson writes them."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    if isinstance(obj, BaseModel):
+        return _finite(obj.model_dump())
+    return obj
+
+
+def _stdlib_dumps(content) -> str:
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+def dumps(content) -> bytes:
+    """Encode plain records (dicts, lists, str enums, Pydantic models) to compact JSON bytes.
+
+    Non-finite floats become null with either encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        encoded = _stdlib_dumps(content)
+    except ValueError:  # NaN / Infinity somewhere; rare, so only then pay for the copy
+        encoded = _stdlib_dumps(_finite(content))
+    return encoded.encode("utf-8")
+
+
+def loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders with dumps(); return it to skip response_model validation."""
+
+    def render(self, content) -> bytes:
+        with metrics.timed("serialization"):
+            return dumps(content)
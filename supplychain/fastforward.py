@@ -0,0 +1,244 @@
+"""
+Fast-forward mode.
+Advances the subnet many tempos in one call with array math instead of
+running every challenge: a few real tempo cycles calibrate each miner's
+score distribution, then whole tempos are resampled from it, Yuma runs
+over all of them in batches, and only totals (plus optional checkpoints)
+are written back and reported.
+"""
+
+import random
+import time
+
+import numpy as np
+
+from . import db
+from .challenges import TEMPO_TASKS, tempo_challenge
+from .dispatch import dispatch_sync
+from .scoring import round_performance, score_challenge
+from .scorestats import BINS, DIMENSIONS, bins, score_columns
+from .yuma import MINER_CUT, yuma_epochs
+
+# Cap on epochs x validators x miners weight cells held in memory at once
+BATCH_CELLS = 4_000_000
+
+
+def _calibrate(miners: list, tempos: int, seed: int) -> dict:
+    """Run `tempos` real tempo cycles (without recording them) and collect per-miner columns.
+
+    Returns (tempos x miners) arrays: score_sum / score_count over all three
+    challenges and perf_sum / perf_count over the ground-truth ones, plus
+    per-dimension dim_sum / dim_sq (tempos x miners x D) and sketch
+    (tempos x miners x D x BINS) for the score statistics.
+    """
+    uids = [m["uid"] for m in miners]
+    column = {uid: j for j, uid in enumerate(uids)}
+    shape = (tempos, len(uids))
+    out = {key: np.zeros(shape) for key in ("score_sum", "score_count", "perf_sum", "perf_count")}
+    out["dim_sum"] = np.zeros(shape + (len(DIMENSIONS),))
+    out["dim_sq"] = np.zeros(shape + (len(DIMENSIONS),))
+    out["sketch"] = np.zeros(shape + (len(DIMENSIONS), BINS), dtype=np.uint8)  # at most 3 per tempo
+    consistency = db.consistency_scores(uids)
+
+    for t in range(tempos):
+        for i in range(len(TEMPO_TASKS)):
+            synapse, _, rng, ground_truth = tempo_challenge(t, i, seed)
+            predictions = dispatch_sync(synapse.dict(), miners)["predictions"]
+            if not predictions:
+                continue
+            answered = [p["miner_uid"] for p in predictions]
+            scores = score_challenge(
+                answered,
+                [p["miner_hotkey"] for p in predictions],
+                [p["predicted_eta_days"] for p in predictions],
+                [p["disruption_risk"] for p in predictions],
+                [p["response_time_ms"] for p in predictions],
+                consistency[[column[uid] for uid in answered]],
+                ground_truth, 0.0, rng,
+            )
+            cols = [column[s["miner_uid"]] for s in scores]
+            out["score_sum"][t, cols] += [s["score"]["final_score"] for s in scores]
+            out["score_count"][t, cols] += 1
+            _, values = score_columns(scores)
+            out["dim_sum"][t, cols] += values
+            out["dim_sq"][t, cols] += values ** 2
+            out["sketch"][t, np.asarray(cols)[:, None], np.arange(len(DIMENSIONS)), bins(values)] += 1
+            if ground_truth:
+                _, perf = round_performance(scores)
+                out["perf_sum"][t, cols] += perf
+                out["perf_count"][t, cols] += 1
+    return out
+
+
+def _streaks(miner_uids: list, averages, tempos: int) -> dict:
+    """Top-10 streaks after `tempos` fast-forwarded tempos, as advance_tempo would have kept them.
+
+    Ranks every registered miner by (-round(avg_score, 4), uid) after each
+    tempo, the leaderboard's order; inactive miners keep their average.
+    """
+    registry = db.get_miners()
+    everyone = sorted(registry.keys())
+    n, k = len(everyone), min(db.STREAK_RANKS, len(everyone))
+    column = {uid: j for j, uid in enumerate(everyone)}
+    active = [column[uid] for uid in miner_uids]
+    fixed = np.array([registry[uid]["avg_score"] for uid in everyone])
+    streak = np.zeros(n, dtype=np.int64)
+    for uid, count in db.get_streaks().items():
+        if uid in column:
+            streak[column[uid]] = count
+
+    batch = max(1, BATCH_CELLS // max(1, n))
+    for lo in range(0, tempos, batch):
+        hi = min(tempos, lo + batch)
+        avg = np.repeat(fixed[None], hi - lo, axis=0)
+        avg[:, active] = averages(lo, hi)[0]
+        avg = avg.round(4)
+        # kth best score per tempo; ties at it go to the lowest UIDs (columns are in UID order)
+        kth = np.partition(avg, n - k, axis=1)[:, n - k, None]
+        above = avg > kth
+        tied = avg == kth
+        in_top = above | (tied & (np.cumsum(tied, axis=1) <= k - above.sum(axis=1, keepdims=True)))
+        # Trailing run of top-10 tempos in this batch; miners never out of it extend their streak
+        out = ~in_top[::-1]
+        ever_out = out.any(axis=0)
+        streak = np.where(ever_out, out.argmax(axis=0), streak + (hi - lo))
+    return {uid: count for uid, count in zip(everyone, streak.tolist()) if count}
+
+
+def fast_forward(tempos: int, checkpoints: int = 0, calibration: int = 16, seed: int = None) -> dict:
+    """Advance the network `tempos` tempos in bulk and return aggregates.
+
+    The highest-stake active validator plays lead, as in the tempo cycle
+    endpoint; every other validator keeps its current weight row. Holds
+    db.epoch_lock throughout, so tempo closes elsewhere wait for it. Raises
+    ValueError if there is no active validator or miner.
+    """
+    with db.epoch_lock:
+        return _fast_forward(tempos, checkpoints, calibration, seed)
+
+
+def _fast_forward(tempos: int, checkpoints: int, calibration: int, seed) -> dict:
+    start = time.perf_counter()
+    state = db.get_state()
+    validators = [v for v in db.get_validators().values() if v["is_active"]]
+    miners = [m for m in db.get_miners().values() if m["is_active"]]
+    if not validators:
+        raise ValueError("No active validators")
+    if not miners:
+        raise ValueError("No active miners")
+    lead = max(validators, key=lambda v: v["stake"])
+    rand = random.Random(seed)
+    rng = np.random.default_rng(seed)
+
+    # Resample whole calibrated tempos
+    sample = _calibrate(miners, calibration, rand.getrandbits(63))
+    picks = rng.integers(calibration, size=tempos)
+    score_sum, score_count = sample["score_sum"][picks], sample["score_count"][picks]
+    tempo_mean = np.divide(score_sum, score_count, out=np.zeros_like(score_sum), where=score_count > 0)
+
+    # Yuma over every tempo: only the lead's row changes from one tempo to the next
+    uids = [m["uid"] for m in miners]
+    db.set_weights(lead["uid"], dict(zip(uids, tempo_mean[0].tolist())))
+    # Only the calibrated miners take part; one registered or activated since then has no
+    # samples and sits this run out, and one deregistered since then drops out
+    miner_uids, validator_uids, weights, bonds, stake = db.epoch_inputs(only=uids)
+    lead_row = validator_uids.index(lead["uid"])
+    pos = {uid: j for j, uid in enumerate(uids)}
+    order = [pos[uid] for uid in miner_uids]  # calibration column of each epoch column
+    tempo_mean = tempo_mean[:, order]
+
+    batch = max(1, BATCH_CELLS // max(1, weights.size))
+    incentive = np.empty((tempos, len(miner_uids)))
+    for lo in range(0, tempos, batch):
+        hi = min(tempos, lo + batch)
+        stacked = np.repeat(weights[None], hi - lo, axis=0)
+        stacked[:, lead_row, :] = tempo_mean[lo:hi]
+        epoch = yuma_epochs(stacked, stake, bonds)
+        incentive[lo:hi] = epoch["incentive"]
+        bonds = epoch["bonds"]
+    db.store_bonds(miner_uids, validator_uids, bonds, incentive[-1])
+    db.set_weights(lead["uid"], dict(zip(miner_uids, tempo_mean[-1].tolist())))
+
+    # Running totals per tempo, aligned with miner_uids
+    emission = state["total_emission_per_tempo"] * MINER_CUT
+    tau = np.cumsum(emission * incentive, axis=0)
+    challenges = np.cumsum(score_count[:, order], axis=0)
+    score_total = np.cumsum(score_sum[:, order], axis=0)
+
+    registry = db.get_miners()
+    base_tau = np.array([registry[uid]["total_tau_earned"] for uid in miner_uids])
+    base_avg = np.array([registry[uid]["avg_score"] for uid in miner_uids])
+    base_count = np.array([registry[uid]["total_challenges"] for uid in miner_uids], dtype=np.float64)
+
+    def averages(lo: int, hi: int):
+        """avg_score and total_challenges after each of tempos lo..hi-1."""
+        count = base_count + challenges[lo:hi]
+        avg = np.divide(base_avg * base_count + score_total[lo:hi], count,
+                        out=np.broadcast_to(base_avg, count.shape).copy(), where=count > 0)
+        return avg, count
+
+    def totals(t: int):
+        avg, count = averages(t, t + 1)
+        return avg[0], count[0], base_tau + tau[t]
+
+    start_tempo, start_block = state["current_tempo"], state["block_height"]
+    snapshots = []
+    if checkpoints:
+        for t in np.unique(np.linspace(0, tempos - 1, min(checkpoints, tempos)).round().astype(int)).tolist():
+            avg, _, total_tau = totals(t)
+            snapshots.append({
+                "tempo": start_tempo + t + 1,
+                "block_height": start_block + 360 * (t + 1),
+                "miners": {
+                    uid: {"avg_score": round(a, 4), "total_tau_earned": round(x, 4)}
+                    for uid, a, x in zip(miner_uids, avg.tolist(), total_tau.tolist())
+                },
+            })
+
+    # Write the end state back
+    avg, count, total_tau = totals(tempos - 1)
+    db.set_miner_totals(zip(miner_uids, avg.tolist(), count.astype(np.int64).tolist(), total_tau.tolist()))
+    perf_sum, perf_count = sample["perf_sum"][picks].sum(axis=0), sample["perf_count"][picks].sum(axis=0)
+    db.advance_consistency(
+        uids,
+        np.divide(perf_sum, perf_count, out=np.zeros_like(perf_sum), where=perf_count > 0),
+        perf_count.astype(np.int64),
+    )
+    picked = np.bincount(picks, minlength=calibration)
+    db.merge_score_stats(
+        uids,
+        (picked @ sample["score_count"]).astype(np.int64),
+        np.tensordot(picked, sample["dim_sum"], 1),
+        np.tensordot(picked, sample["dim_sq"], 1),
+        np.tensordot(picked, sample["sketch"], 1),
+    )
+    db.set_streaks(_streaks(miner_uids, averages, tempos))
+    db.skip_tempos(tempos)
+    db.record_validator_activity(lead["uid"], 3 * tempos, weight_block=state["block_height"])
+
+    miner_tau = tau[-1]
+    return {
+        "tempos": tempos,
+        "start_tempo": start_tempo,
+        "end_tempo": state["current_tempo"],
+        "start_block": start_block,
+        "end_block": state["block_height"],
+        "lead_validator_uid": lead["uid"],
+        "calibration_tempos": calibration,
+        "total_emission_tao": round(state["total_emission_per_tempo"] * tempos, 6),
+        "miner_emission_tao": round(miner_tau.sum().item(), 6),
+        "miners": [
+            {
+                "uid": uid,
+                "avg_score_start": round(b, 4),
+                "avg_score": round(a, 4),
+                "tau_earned": round(x, 6),
+                "total_tau_earned": round(registry[uid]["total_tau_earned"], 4),
+                "mean_incentive": round(i, 6),
+            }
+            for uid, b, a, x, i in zip(miner_uids, base_avg.tolist(), avg.tolist(), miner_tau.tolist(),
+                                       incentive.mean(axis=0).tolist())
+        ],
+        "checkpoints": snapshots,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
@@ -0,0 +1,160 @@
+"""
+Challenge history: a fixed-capacity ring buffer of recent challenges,
+backed by an append-only on-disk segment log for everything older.
+Every challenge gets a sequence number; cursors are sequence numbers, so
+paging can walk the whole history one bounded segment at a time. flush()
+writes the ring out too, so a restart reads the whole history back.
+"""
+
+import bisect
+import json
+import os
+from typing import List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+_SEGMENT_PREFIX = "challenges-"
+_SEGMENT_SUFFIX = ".ndjson"
+
+
+class ChallengeHistory:
+    """Most recent `capacity` challenges in memory; evicted ones spill to `spill_dir` (if set)."""
+
+    def __init__(self, capacity: int = 100, spill_dir: str = "", segment_size: int = 1000):
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.segment_size = segment_size
+        self._slots = [None] * capacity
+        self._segments = []      # start seq of each segment file, ascending
+        self._spilled = 0        # seqs [0, _spilled) live on disk
+        self._file = None        # append handle on the newest segment, kept open between spills
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._scan_segments()
+        self._next_seq = self._spilled   # carry numbering on from a previous process
+        self._ring_start = self._next_seq
+
+    # ── Ring buffer ──
+
+    def append(self, record: dict) -> int:
+        """Store `record` and return its sequence number. O(1); evicts the oldest when full."""
+        seq = self._next_seq
+        if seq - self._ring_start == self.capacity:
+            if self.spill_dir and self._ring_start >= self._spilled:
+                self._spill(self._ring_start, self._slots[self._ring_start % self.capacity])
+            self._ring_start += 1
+        self._slots[seq % self.capacity] = record
+        self._next_seq = seq + 1
+        return seq
+
+    def flush(self):
+        """Spill every in-memory record not yet on disk (at shutdown); they stay readable from the ring."""
+        if not self.spill_dir:
+            return
+        for seq in range(max(self._ring_start, self._spilled), self._next_seq):
+            self._spill(seq, self._slots[seq % self.capacity])
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def total(self) -> int:
+        """Challenges ever recorded (memory + disk)."""
+        return self._next_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        """Oldest sequence number still readable."""
+        return self._segments[0] if self._segments else self._ring_start
+
+    def __len__(self):
+        return self._next_seq - self._ring_start
+
+    def __iter__(self):
+        """Records held in memory, oldest first."""
+        for seq in range(self._ring_start, self._next_seq):
+            yield self._slots[seq % self.capacity]
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        """Newest `limit` in-memory records, newest first."""
+        start = max(self._ring_start, self._next_seq - limit)
+        return [self._slots[seq % self.capacity] for seq in range(self._next_seq - 1, start - 1, -1)]
+
+    # ── Cursor paging ──
+
+    def page(self, cursor: Optional[int] = None, limit: int = 10) -> Tuple[List[dict], Optional[int]]:
+        """Records with seq < `cursor` (newest first when cursor is None), up to `limit`.
+
+        Returns (records, next_cursor); next_cursor is None once the oldest
+        record has been returned.
+        """
+        end = self._next_seq if cursor is None else min(cursor, self._next_seq)
+        start = max(self.oldest_seq, end - limit)
+        records = []
+        seq = end - 1
+        while seq >= start:
+            if seq >= self._ring_start:
+                records.append(self._slots[seq % self.capacity])
+                seq -= 1
+                continue
+            # Older than the ring: read back one segment's worth from disk
+            chunk = self._read_spilled(max(start, self._segment_start(seq)), seq + 1)
+            if not chunk:
+                break
+            records.extend(reversed(chunk))
+            seq -= len(chunk)
+        next_cursor = start if start > self.oldest_seq else None
+        return records, next_cursor
+
+    # ── Segment log ──
+
+    def _segment_path(self, start: int) -> str:
+        return os.path.join(self.spill_dir, f"{_SEGMENT_PREFIX}{start:012d}{_SEGMENT_SUFFIX}")
+
+    def _scan_segments(self):
+        starts = sorted(
+            int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.spill_dir)
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+        )
+        self._segments = starts
+        if starts:
+            with open(self._segment_path(starts[-1]), "rb+") as f:
+                data = f.read()
+                complete = data.rfind(b"\n") + 1
+                if complete < len(data):
+                    # A crash cut the last record short; drop it so the next spill starts a clean line
+                    f.truncate(complete)
+            self._spilled = starts[-1] + data.count(b"\n", 0, complete)
+
+    def _spill(self, seq: int, record: dict):
+        if not self._segments or seq - self._segments[-1] >= self.segment_size:
+            self._segments.append(seq)
+            self.close()
+        if self._file is None:
+            self._file = open(self._segment_path(self._segments[-1]), "a", encoding="utf-8")
+        self._file.write(json.dumps(jsonable_encoder(record)) + "\n")
+        self._file.flush()  # whole lines reach the file, so pagers reading it never see a torn record
+        self._spilled = seq + 1
+
+    def _segment_start(self, seq: int) -> int:
+        """Start seq of the segment holding `seq`."""
+        pos = bisect.bisect_right(self._segments, seq) - 1
+        return self._segments[max(pos, 0)] if self._segments else 0
+
+    def _read_spilled(self, start: int, end: int) -> List[dict]:
+        """Spilled records [start, end), all within one segment, oldest first."""
+        if not self._segments or end <= start:
+            return []
+        segment = self._segment_start(start)
+        records = []
+        with open(self._segment_path(segment), "r", encoding="utf-8") as f:
+            for offset, line in enumerate(f):
+                seq = segment + offset
+                if seq >= end or not line.endswith("\n"):  # stop at a partial trailing line
+                    break
+                if seq >= start:
+                    records.append(json.loads(line))
+        return records
@@ -0,0 +1,128 @@
+"""
+Hot-path metrics in Prometheus text format.
+Stage timings go into fixed-bucket histograms and events into counters;
+recording is a bisect plus two additions into a per-thread shard, and
+the text is only built when /metrics is scraped.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+# Stages of a challenge cycle, in pipeline order
+STAGES = (
+    "generation",      # building the synapse
+    "ground_truth",    # drawing the historical outcome
+    "dispatch",        # fan-out to all miners and collecting responses
+    "prediction",      # one miner's model run
+    "scoring",         # score or estimate every prediction of a challenge
+    "ranking",         # ordering, emission split and result rows
+    "state_update",    # registry, consistency, weights and history writes
+    "serialization",   # encoding a response body
+)
+
+# Upper bounds in seconds; per-miner predictions sit in the tens of microseconds,
+# a dispatch to thousands of miners in the hundreds of milliseconds
+BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+COUNTERS = {
+    "challenges": "Challenges dispatched to miners",
+    "predictions": "Miner predictions received before the deadline",
+    "timeouts": "Miner responses dropped for missing the deadline",
+    "store_errors": "SQLite flushes that failed (their batch is retried on the next flush)",
+    "store_dropped": "Records left out of SQLite because they could not be encoded",
+}
+
+# Each thread records into its own shard, so the hot path takes no lock;
+# a scrape sums the shards. Shards outlive their threads so no counts are lost.
+_lock = threading.Lock()  # guards _shards
+_shards = []
+_local = threading.local()
+
+
+def _new_shard() -> dict:
+    shard = {
+        "buckets": {stage: [0] * (len(BUCKETS) + 1) for stage in STAGES},  # last slot is +Inf
+        "sums": dict.fromkeys(STAGES, 0.0),
+        "counters": dict.fromkeys(COUNTERS, 0),
+    }
+    with _lock:
+        _shards.append(shard)
+    return shard
+
+
+def _shard() -> dict:
+    try:
+        return _local.shard
+    except AttributeError:
+        _local.shard = _new_shard()
+        return _local.shard
+
+
+def observe(stage: str, seconds: float):
+    """Record one `stage` duration."""
+    shard = _shard()
+    shard["buckets"][stage][bisect_left(BUCKETS, seconds)] += 1
+    shard["sums"][stage] += seconds
+
+
+def inc(counter: str, amount: int = 1):
+    _shard()["counters"][counter] += amount
+
+
+class timed:
+    """Context manager that observes the duration of its block under `stage`."""
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def render(gauges: dict) -> str:
+    """Everything recorded so far plus `gauges` ({name: (help, value)}) as Prometheus text (format 0.0.4)."""
+    with _lock:
+        shards = list(_shards)
+    buckets = {stage: [sum(counts) for counts in zip(*(sh["buckets"][stage] for sh in shards))] or [0] * (len(BUCKETS) + 1)
+               for stage in STAGES}
+    sums = {stage: sum(sh["sums"][stage] for sh in shards) for stage in STAGES}
+    counters = {name: sum(sh["counters"][name] for sh in shards) for name in COUNTERS}
+
+    lines = [
+        "# HELP supplychain_stage_duration_seconds Time spent in each stage of a challenge cycle",
+        "# TYPE supplychain_stage_duration_seconds histogram",
+    ]
+    for stage in STAGES:
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ("+Inf",), buckets[stage]):
+            cumulative += count
+            le = bound if isinstance(bound, str) else repr(bound)
+            lines.append(f'supplychain_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+        lines.append(f'supplychain_stage_duration_seconds_sum{{stage="{stage}"}} {sums[stage]!r}')
+        lines.append(f'supplychain_stage_duration_seconds_count{{stage="{stage}"}} {cumulative}')
+
+    for name, help_text in COUNTERS.items():
+        lines += [
+            f"# HELP supplychain_{name}_total {help_text}",
+            f"# TYPE supplychain_{name}_total counter",
+            f"supplychain_{name}_total {counters[name]}",
+        ]
+
+    for name, (help_text, value) in gauges.items():
+        lines += [
+            f"# HELP supplychain_{name} {help_text}",
+            f"# TYPE supplychain_{name} gauge",
+            f"supplychain_{name} {value}",
+        ]
+    return "\n".join(lines) + "\n"
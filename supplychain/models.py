@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from enum import Enum
 
 
@@ -124,6 +124,33 @@ class MinerInfo(BaseModel):
     last_active_block: Optional[int] = None
 
 
+class MinerConsistency(BaseModel):
+    uid: int
+    hotkey: str
+    ema: float = Field(..., ge=0, le=1, description="Raw consistency EMA (the consistency term of ScoreBreakdown)")
+    rounds: int = Field(..., description="Ground-truth-scored rounds folded into the EMA")
+    window: int = Field(..., description="Rounds the EMA averages over")
+    alpha: float = Field(..., description="EMA smoothing factor, 2 / (window + 1)")
+
+
+class DimensionStats(BaseModel):
+    mean: float
+    std: float = Field(..., description="Population standard deviation (Welford)")
+    p10: float = Field(..., description="Approximate 10th percentile, within 1/32")
+    p50: float = Field(..., description="Approximate median, within 1/32")
+    p90: float = Field(..., description="Approximate 90th percentile, within 1/32")
+
+
+class MinerScoreStats(BaseModel):
+    uid: int
+    hotkey: str
+    scored: int = Field(..., description="Scored challenges the statistics cover")
+    streak: int = Field(0, description="Consecutive tempos in top 10")
+    dimensions: Dict[str, DimensionStats] = Field(
+        default_factory=dict, description="Per ScoreBreakdown field (disruption_bonus as 0/1); empty until scored",
+    )
+
+
 # ── Validator Registration & Info ──
 
 class ValidatorRegister(BaseModel):
@@ -155,6 +182,7 @@ class ChallengeResult(BaseModel):
     challenge_type: str = Field(..., description="historical (70%) or near_term (30%)")
     ground_truth: Optional[dict] = Field(None, description="Actual shipment outcome (for historical)")
     miner_predictions: List[MinerPrediction]
+    timed_out_miners: List[int] = Field(default_factory=list, description="UIDs that missed the response deadline")
     scores: List[MinerScoreResult]
     timestamp: str
     tempo: int
@@ -199,8 +227,8 @@ class LeaderboardEntry(BaseModel):
     avg_score: float
     total_challenges: int
     total_tau_earned: float
-    eta_accuracy_avg: float
-    disruption_accuracy_avg: float
+    eta_accuracy_avg: Optional[float] = Field(None, description="Running mean eta_accuracy; null until scored")
+    disruption_accuracy_avg: Optional[float] = Field(None, description="Running mean disruption_accuracy; null until scored")
     streak: int = Field(0, description="Consecutive tempos in top 10")
 
 
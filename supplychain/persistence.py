@@ -0,0 +1,254 @@
+"""
+Durable SQLite state backend.
+Mirrors the in-memory subnet state into a WAL-mode SQLite file. Mutations
+only mark records dirty; a background thread flushes them in one batched
+transaction per interval, so many score updates to the same miner cost a
+single row write.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+
+from fastapi.encoders import jsonable_encoder
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+SYNCHRONOUS_LEVELS = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+# Tables of one JSON record per uid, mirroring the state dict of the same name
+RECORD_TABLES = ("miners", "validators", "weights", "bonds")
+
+META_KEYS = ("block_height", "current_tempo", "total_emission_per_tempo", "next_miner_uid", "next_validator_uid")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS miners (uid INTEGER PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS validators (uid INTEGER PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS weights (uid INTEGER PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS bonds (uid INTEGER PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS challenges (seq INTEGER PRIMARY KEY AUTOINCREMENT, record TEXT NOT NULL);
+"""
+
+
+class SQLiteStore:
+    """Write-behind mirror of db._state.
+
+    flush_interval <= 0 writes through on every mutation; durability maps
+    to PRAGMA synchronous (off / normal / full).
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, durability: str = "normal", challenge_window: int = 100):
+        if durability not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability!r} (expected one of {sorted(SYNCHRONOUS_LEVELS)})")
+        self.path = path
+        self.flush_interval = flush_interval
+        self.challenge_window = challenge_window
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS_LEVELS[durability]}")
+        self._conn.executescript(_SCHEMA)
+
+        self._state = {}
+        self._extras = {}
+        self._lock = threading.Lock()        # guards the dirty sets
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._dirty = {table: set() for table in RECORD_TABLES}
+        self._deleted = {table: set() for table in RECORD_TABLES}
+        self._meta_dirty = False
+        self._pending_challenges = []
+
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None  # repr of the exception that failed the latest flush; None once one succeeds
+
+    # ── Load / lifecycle ──
+
+    def load(self):
+        """Read the persisted state. Returns None if the file holds no state yet.
+
+        The snapshot is {"meta": {...}, "miners": [...], "validators": [...],
+        "challenges": [...]} with plain-dict records, oldest challenge first,
+        plus "weights" and "bonds": {validator uid: {miner uid: value}}.
+        """
+        meta = {key: json.loads(value) for key, value in self._conn.execute("SELECT key, value FROM meta")}
+        if not meta:
+            return None
+        return {
+            "meta": meta,
+            "miners": [json.loads(r) for (r,) in self._conn.execute("SELECT record FROM miners ORDER BY uid")],
+            "validators": [json.loads(r) for (r,) in self._conn.execute("SELECT record FROM validators ORDER BY uid")],
+            # JSON object keys are strings; weight and bond rows are keyed by miner uid
+            **{
+                table: {
+                    uid: {int(miner): value for miner, value in json.loads(r).items()}
+                    for uid, r in self._conn.execute(f"SELECT uid, record FROM {table}")
+                }
+                for table in ("weights", "bonds")
+            },
+            "challenges": [
+                json.loads(r) for (r,) in self._conn.execute(
+                    "SELECT record FROM (SELECT seq, record FROM challenges ORDER BY seq DESC LIMIT ?) ORDER BY seq",
+                    (self.challenge_window,),
+                )
+            ],
+        }
+
+    def attach(self, state: dict, extras: dict = None):
+        """Point the store at the live state dict it mirrors.
+
+        `extras` maps a table to a function of uid returning fields kept
+        outside the record (e.g. per-miner arrays) to write along with it.
+        """
+        self._state = state
+        self._extras = extras or {}
+
+    def start(self):
+        if self.flush_interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sqlite-write-behind", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self._conn.close()
+
+    @property
+    def healthy(self) -> bool:
+        """False while the latest flush failed (its batch is queued for the next one)."""
+        return self.last_error is None
+
+    def _run(self):
+        # Nothing may end this loop: a dead writer would drop every later write silently
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                log.exception("SQLite write-behind flush failed; retrying in %ss", self.flush_interval)
+
+    # ── Dirty tracking ──
+
+    def _after_mark(self):
+        if self.flush_interval <= 0:
+            self.flush()
+
+    def mark(self, table: str, uid: int):
+        with self._lock:
+            self._dirty[table].add(uid)
+            self._deleted[table].discard(uid)
+        self._after_mark()
+
+    def mark_many(self, table: str, uids):
+        uids = list(uids)
+        with self._lock:
+            self._dirty[table].update(uids)
+            self._deleted[table].difference_update(uids)
+        self._after_mark()
+
+    def mark_deleted(self, table: str, uid: int):
+        with self._lock:
+            self._dirty[table].discard(uid)
+            self._deleted[table].add(uid)
+        self._after_mark()
+
+    def mark_meta(self):
+        with self._lock:
+            self._meta_dirty = True
+        self._after_mark()
+
+    def mark_all(self):
+        with self._lock:
+            for table in RECORD_TABLES:
+                self._dirty[table].update(self._state[table])
+            self._meta_dirty = True
+            self._pending_challenges.extend(self._state["challenges"])
+        self._after_mark()
+
+    def add_challenge(self, challenge: dict):
+        with self._lock:
+            self._pending_challenges.append(challenge)
+        self._after_mark()
+
+    # ── Flush ──
+
+    def flush(self):
+        """Write everything marked since the last flush in a single transaction."""
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {table: set() for table in RECORD_TABLES}
+                deleted, self._deleted = self._deleted, {table: set() for table in RECORD_TABLES}
+                meta_dirty, self._meta_dirty = self._meta_dirty, False
+                challenges, self._pending_challenges = self._pending_challenges, []
+            if not (meta_dirty or challenges or any(dirty.values()) or any(deleted.values())):
+                return
+
+            state = self._state
+            rows = {table: self._encoded(table, self._records(table, uids)) for table, uids in dirty.items()}
+            encoded = [(r,) for _, r in self._encoded(
+                "challenges", ((c.get("challenge_id"), jsonable_encoder(c)) for c in challenges))]
+
+            conn = self._conn
+            try:
+                conn.execute("BEGIN")
+                for table in RECORD_TABLES:
+                    if rows[table]:
+                        conn.executemany(f"INSERT OR REPLACE INTO {table} (uid, record) VALUES (?, ?)", rows[table])
+                    if deleted[table]:
+                        conn.executemany(f"DELETE FROM {table} WHERE uid = ?", [(uid,) for uid in deleted[table]])
+                if meta_dirty:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [(key, json.dumps(state[key])) for key in META_KEYS],
+                    )
+                if encoded:
+                    conn.executemany("INSERT INTO challenges (record) VALUES (?)", encoded)
+                    conn.execute(
+                        "DELETE FROM challenges WHERE seq <= (SELECT MAX(seq) FROM challenges) - ?",
+                        (self.challenge_window,),
+                    )
+                conn.execute("COMMIT")
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self._requeue(dirty, deleted, meta_dirty, challenges)
+                self.last_error = repr(e)
+                metrics.inc("store_errors")
+                raise
+            self.last_error = None
+
+    def _records(self, table: str, uids):
+        """(uid, record plus its extras) for each of `uids` still in the state."""
+        records, extra = self._state[table], self._extras.get(table)
+        for uid in uids:
+            record = records.get(uid)
+            if record is not None:
+                yield uid, dict(record, **extra(uid)) if extra else dict(record)
+
+    def _encoded(self, table: str, items) -> list:
+        """(key, JSON) for each (key, record) in `items`.
+
+        A record that cannot be encoded is logged, counted and skipped, so one
+        bad record cannot fail every later flush.
+        """
+        out = []
+        for key, record in items:
+            try:
+                out.append((key, json.dumps(record)))
+            except (TypeError, ValueError):
+                log.exception("Cannot encode %s record %s for SQLite; skipped", table, key)
+                metrics.inc("store_dropped")
+        return out
+
+    def _requeue(self, dirty, deleted, meta_dirty, challenges):
+        with self._lock:
+            for table in RECORD_TABLES:
+                self._dirty[table] |= dirty[table] - self._deleted[table]
+                self._deleted[table] |= deleted[table] - self._dirty[table]
+            self._meta_dirty = self._meta_dirty or meta_dirty
+            self._pending_challenges[:0] = challenges
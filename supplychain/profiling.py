@@ -0,0 +1,166 @@
+"""
+On-demand request profiling.
+With SUPPLYCHAIN_PROFILE_TOKEN set, a request that carries the token (X-Profile
+header or ?profile= query flag) has its handler traced and stored as collapsed
+stacks, ready for flamegraph.pl or speedscope. Without the token the router
+uses the stock APIRoute, so unprofiled requests run no profiling code at all.
+"""
+
+import contextvars
+import functools
+import hmac
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+from . import config
+
+# Set for the duration of a request that asked to be profiled
+_current: contextvars.ContextVar = contextvars.ContextVar("supplychain_profile", default=None)
+
+_reports: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def authorized(token: Optional[str]) -> bool:
+    return bool(config.PROFILE_TOKEN) and token is not None and hmac.compare_digest(token, config.PROFILE_TOKEN)
+
+
+def requested_token(request: Request) -> Optional[str]:
+    return request.headers.get("x-profile") or request.query_params.get("profile")
+
+
+# ── Tracer ──
+
+def _label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _c_label(func) -> str:
+    module = getattr(func, "__module__", None) or type(getattr(func, "__self__", None)).__name__
+    return f"{module}:{getattr(func, '__qualname__', repr(func))}"
+
+
+class _Tracer:
+    """sys.setprofile hook that accumulates self time per call stack (this thread only)."""
+
+    def __init__(self):
+        self.labels = []   # current call stack
+        self.frames = []   # [start, time spent in children] per stack entry
+        self.self_time = {}  # tuple(stack) -> seconds
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            self.labels.append(_label(frame) if event == "call" else _c_label(arg))
+            self.frames.append([now, 0.0])
+        elif self.labels:  # return, c_return, c_exception
+            start, children = self.frames.pop()
+            elapsed = now - start
+            key = tuple(self.labels)
+            self.self_time[key] = self.self_time.get(key, 0.0) + elapsed - children
+            self.labels.pop()
+            if self.frames:
+                self.frames[-1][1] += elapsed
+
+    def collapsed(self) -> str:
+        """One `frame;frame;frame microseconds` line per stack, heaviest first."""
+        lines = [
+            (round(seconds * 1e6), ";".join(stack))
+            for stack, seconds in self.self_time.items()
+        ]
+        lines.sort(reverse=True)
+        return "".join(f"{stack} {us}\n" for us, stack in lines if us > 0)
+
+
+def _traced(endpoint):
+    """Wrap a sync endpoint so it runs under the tracer when its request asked for a profile."""
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        report = _current.get()
+        if report is None:
+            return endpoint(*args, **kwargs)
+        tracer = _Tracer()
+        start = time.perf_counter()
+        sys.setprofile(tracer)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+            report["handler_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            report["stacks"] = tracer.collapsed()
+
+    return wrapper
+
+
+# ── Route class ──
+
+def unprofiled(endpoint):
+    """Mark an endpoint ProfilingRoute never traces, e.g. the admin routes that take the token to read profiles."""
+    endpoint.__unprofiled__ = True
+    return endpoint
+
+
+class ProfilingRoute(APIRoute):
+    """APIRoute whose handler can be traced per request (sync endpoints; streamed bodies are not covered)."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        self.profiled = not getattr(endpoint, "__unprofiled__", False)
+        super().__init__(path, _traced(endpoint) if self.profiled else endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not self.profiled:
+            return handler
+
+        async def profiled_handler(request: Request):
+            if not authorized(requested_token(request)):
+                return await handler(request)
+
+            profile_id = uuid.uuid4().hex[:12]
+            report = {
+                "profile_id": profile_id,
+                "method": request.method,
+                "path": request.url.path,
+                "route": self.path,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "handler_ms": None,
+                "stacks": "",
+            }
+            token = _current.set(report)
+            start = time.perf_counter()
+            try:
+                response = await handler(request)
+            finally:
+                _current.reset(token)
+                report["total_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                _store(report)
+            response.headers["X-Profile-Id"] = profile_id
+            return response
+
+        return profiled_handler
+
+
+# ── Stored reports ──
+
+def _store(report: dict):
+    _reports[report["profile_id"]] = report
+    while len(_reports) > config.PROFILE_HISTORY:
+        _reports.popitem(last=False)
+
+
+def get_report(profile_id: str) -> Optional[dict]:
+    return _reports.get(profile_id)
+
+
+def list_reports() -> list:
+    """Stored reports without their stacks, newest first."""
+    return [{k: v for k, v in r.items() if k != "stacks"} for r in reversed(_reports.values())]
@@ -0,0 +1,235 @@
+"""
+Registry backends for miners and validators.
+Both map uid -> record and behave like the dict of dicts db.py has always
+used; the columnar backend stores each numeric field in a typed numpy
+array indexed by UID and interns string fields into a shared side table.
+"""
+
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+
+import numpy as np
+
+
+# field -> storage kind ("f8" float, "i8"/"i4" int, "?" bool, "str" interned string)
+MINER_SCHEMA = {
+    "hotkey": "str",
+    "coldkey": "str",
+    "tier": "str",
+    "ip": "str",
+    "port": "i4",
+    "model_name": "str",
+    "stake": "f8",
+    "is_active": "?",
+    "total_challenges": "i8",
+    "avg_score": "f8",
+    "total_tau_earned": "f8",
+    "last_active_block": "i8",
+}
+
+VALIDATOR_SCHEMA = {
+    "hotkey": "str",
+    "coldkey": "str",
+    "ip": "str",
+    "port": "i4",
+    "stake": "f8",
+    "is_active": "?",
+    "challenges_sent": "i8",
+    "last_weight_block": "i8",
+    "bond_strength": "f8",
+}
+
+_INT_NULL = {"i8": np.iinfo(np.int64).min, "i4": np.iinfo(np.int32).min}
+_STR_NULL = -1
+
+
+class DictRegistry(dict):
+    """Default backend: one plain dict per record.
+
+    Iteration walks a snapshot of the keys/records, so a registration on
+    another thread cannot break a reader mid-loop.
+    """
+
+    def __init__(self, schema: dict, exclusive=None):
+        super().__init__()
+        self.schema = schema  # inserts never move other records, so `exclusive` is not needed
+
+    def __iter__(self):
+        return iter(list(dict.keys(self)))
+
+    def keys(self):
+        return list(dict.keys(self))
+
+    def values(self):
+        return list(dict.values(self))
+
+    def items(self):
+        return list(dict.items(self))
+
+    def total(self, field: str, active_only: bool = False) -> float:
+        return sum(r[field] for r in self.values() if r["is_active"] or not active_only)
+
+    def count_active(self) -> int:
+        return sum(1 for r in self.values() if r["is_active"])
+
+
+class _Row(MutableMapping):
+    """Live view of one UID's slot; reads and writes go straight to the columns."""
+
+    __slots__ = ("_registry", "_uid")
+
+    def __init__(self, registry: "ColumnarRegistry", uid: int):
+        self._registry = registry
+        self._uid = uid
+
+    def __getitem__(self, field):
+        if field == "uid":
+            return self._uid
+        return self._registry._read(field, self._uid)
+
+    def __setitem__(self, field, value):
+        if field == "uid":
+            raise KeyError("uid is the slot index and cannot be reassigned")
+        self._registry._write(field, self._uid, value)
+
+    def __delitem__(self, field):
+        raise TypeError("registry rows have a fixed schema")
+
+    def __iter__(self):
+        yield "uid"
+        yield from self._registry.schema
+
+    def __len__(self):
+        return len(self._registry.schema) + 1
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ColumnarRegistry(MutableMapping):
+    """Array-backed backend: one typed column per field, slot index == UID.
+
+    Growing replaces every column, so `exclusive` (a context manager factory)
+    must shut out the callers' row writers while it happens; otherwise a write
+    could land in a column that is being retired. Lock-free readers stay safe:
+    the new columns are published before the presence mask that admits the
+    new UIDs.
+    """
+
+    def __init__(self, schema: dict, capacity: int = 256, exclusive=None):
+        self.schema = schema
+        self._exclusive = exclusive or nullcontext
+        self._capacity = capacity
+        self._present = np.zeros(capacity, dtype=bool)
+        self._columns = {
+            field: np.full(capacity, _STR_NULL if kind == "str" else _INT_NULL.get(kind, 0),
+                           dtype="i4" if kind == "str" else kind)
+            for field, kind in schema.items()
+        }
+        self._strings = []       # interned string table
+        self._string_ids = {}    # string -> position in _strings
+
+    # ── Storage ──
+
+    def _grow(self, uid: int):
+        capacity = self._capacity
+        while capacity <= uid:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        extra = capacity - self._capacity
+        with self._exclusive():
+            columns = {}
+            for field, kind in self.schema.items():
+                column = self._columns[field]
+                fill = _STR_NULL if kind == "str" else _INT_NULL.get(kind, 0)
+                columns[field] = np.concatenate([column, np.full(extra, fill, dtype=column.dtype)])
+            self._columns = columns
+            self._present = np.concatenate([self._present, np.zeros(extra, dtype=bool)])
+            self._capacity = capacity
+
+    def _intern(self, value: str) -> int:
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = sid
+        return sid
+
+    def _read(self, field: str, uid: int):
+        kind = self.schema[field]
+        raw = self._columns[field][uid]
+        if kind == "str":
+            return None if raw == _STR_NULL else self._strings[raw]
+        if kind in _INT_NULL and raw == _INT_NULL[kind]:
+            return None
+        return raw.item()
+
+    def _write(self, field: str, uid: int, value):
+        kind = self.schema[field]
+        if kind == "str":
+            value = _STR_NULL if value is None else self._intern(value)
+        elif value is None:
+            value = _INT_NULL[kind]
+        self._columns[field][uid] = value
+
+    # ── Mapping interface (uid -> row view) ──
+
+    def __getitem__(self, uid):
+        if not (isinstance(uid, (int, np.integer)) and 0 <= uid < self._capacity and self._present[uid]):
+            raise KeyError(uid)
+        return _Row(self, int(uid))
+
+    def __setitem__(self, uid: int, record: dict):
+        self._grow(uid)
+        for field in self.schema:
+            self._write(field, uid, record.get(field))
+        self._present[uid] = True
+
+    def __delitem__(self, uid):
+        self[uid]  # raises KeyError if absent
+        self._present[uid] = False
+
+    def __iter__(self):
+        return iter(np.flatnonzero(self._present).tolist())
+
+    def values(self):
+        return [_Row(self, uid) for uid in self]
+
+    def items(self):
+        return [(uid, _Row(self, uid)) for uid in self]
+
+    def __len__(self):
+        return int(self._present.sum())
+
+    # ── Aggregates ──
+
+    # The mask is read before the columns, so mid-growth the columns may be the
+    # longer ones; trim them to the mask. Mask indexing counts the True entries and
+    # then fills that many without the GIL, so it must use a private copy of the
+    # mask: a registration flipping a bit in between would overrun the output.
+
+    def column(self, field: str) -> np.ndarray:
+        """Values of `field` for every registered UID, in UID order."""
+        present = self._present.copy()
+        return self._columns[field][:len(present)][present]
+
+    def total(self, field: str, active_only: bool = False) -> float:
+        present = self._present.copy()
+        columns = self._columns
+        mask = present & columns["is_active"][:len(present)] if active_only else present
+        return columns[field][:len(present)][mask].sum().item()
+
+    def count_active(self) -> int:
+        present = self._present
+        return int((present & self._columns["is_active"][:len(present)]).sum())
+
+
+BACKENDS = {"dict": DictRegistry, "columnar": ColumnarRegistry}
+
+
+def make_registry(backend: str, schema: dict, exclusive=None):
+    try:
+        return BACKENDS[backend](schema, exclusive=exclusive)
+    except KeyError:
+        raise ValueError(f"Unknown registry backend: {backend!r} (expected one of {sorted(BACKENDS)})")
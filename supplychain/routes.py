@@ -3,29 +3,48 @@ API Routes for AI Supply Chain Subnet Demo.
 Demonstrates full subnet functionality: Miners, Validators, Scoring, and Network.
 """
 
+import hashlib
+import json
+import logging
+import queue
 import random
-import time
+import threading
 import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.routing import APIRoute
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from .models import (
     TaskType, ProductType, MinerTier,
     ShipmentConditions, SupplyChainSynapse,
     RiskFactor, RouteRecommendation,
     MinerPrediction, ScoreBreakdown, MinerScoreResult,
-    MinerRegister, MinerInfo,
+    MinerRegister, MinerInfo, MinerConsistency, DimensionStats, MinerScoreStats,
     ValidatorRegister, ValidatorInfo,
     ChallengeResult, NetworkStatus, SubnetHyperparameters,
     LeaderboardEntry,
     SupplyChainQuery, SupplyChainResponse,
 )
-from .ai import run_miner_prediction, score_prediction, get_supplychain_status, run_demo_scenario, get_demo_scenarios_list
-from . import db
+from .ai import (
+    DEMO_SCENARIOS, run_miner_prediction, score_prediction, get_supplychain_status,
+    demo_scenario_static, demo_scenario_volatile, get_demo_scenarios_list,
+)
+from .scoring import score_challenge
+from .dispatch import dispatch_sync
+from .challenges import TEMPO_TASKS, next_challenge, tempo_challenge
+from .fastforward import fast_forward
+from .encoding import FastJSONResponse, dumps
+from .profiling import ProfilingRoute
+from . import config, db, metrics, profiling
+
+log = logging.getLogger(__name__)
 
-router = APIRouter()
+# Profiling-capable routes only when a profile token is configured
+router = APIRouter(route_class=ProfilingRoute if config.PROFILE_TOKEN else APIRoute)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -61,7 +80,7 @@ def track(query: SupplyChainQuery):
 )
 def list_miners():
     miners = db.get_miners()
-    return [MinerInfo(**m) for m in miners.values()]
+    return FastJSONResponse([dict(m) for m in miners.values()])
 
 
 @router.get(
@@ -78,6 +97,80 @@ def get_miner(uid: int):
     return MinerInfo(**miner)
 
 
+@router.get(
+    "/miners/{uid}/consistency",
+    response_model=MinerConsistency,
+    tags=["Miners"],
+    summary="Get Miner Consistency",
+    description="Raw consistency EMA of a miner and how many scored rounds it covers.",
+)
+def get_miner_consistency(uid: int):
+    miner = db.get_miner(uid)
+    if not miner:
+        raise HTTPException(status_code=404, detail=f"Miner UID {uid} not found")
+    ema, rounds = db.get_consistency(uid)
+    tracker = db.get_state()["consistency"]
+    return MinerConsistency(
+        uid=uid, hotkey=miner["hotkey"], ema=round(ema, 6), rounds=rounds,
+        window=tracker.window, alpha=round(tracker.alpha, 6),
+    )
+
+
+@router.get(
+    "/miners/{uid}/score-stats",
+    response_model=MinerScoreStats,
+    tags=["Miners"],
+    summary="Get Miner Score Statistics",
+    description=(
+        "Running mean, standard deviation and approximate p10/p50/p90 of every ScoreBreakdown dimension "
+        "over the miner's scored challenges, plus its current top-10 streak."
+    ),
+)
+def get_miner_score_stats(uid: int):
+    miner = db.get_miner(uid)
+    if not miner:
+        raise HTTPException(status_code=404, detail=f"Miner UID {uid} not found")
+    summary = db.score_stats().summary(uid)
+    return MinerScoreStats(
+        uid=uid,
+        hotkey=miner["hotkey"],
+        scored=summary["count"],
+        streak=db.get_streaks().get(uid, 0),
+        dimensions={
+            name: DimensionStats(
+                mean=round(d["mean"], 4), std=round(d["std"], 4),
+                p10=round(d["quantiles"][0], 4), p50=round(d["quantiles"][1], 4), p90=round(d["quantiles"][2], 4),
+            )
+            for name, d in summary["dimensions"].items()
+        },
+    )
+
+
+@router.get(
+    "/miners/by-hotkey/{hotkey}",
+    response_model=MinerInfo,
+    tags=["Miners"],
+    summary="Get Miner by Hotkey",
+    description="Look up the miner registered under a hotkey.",
+)
+def get_miner_by_hotkey(hotkey: str):
+    miner = db.get_miner_by_hotkey(hotkey)
+    if not miner:
+        raise HTTPException(status_code=404, detail=f"Hotkey {hotkey} not registered")
+    return MinerInfo(**miner)
+
+
+@router.get(
+    "/miners/by-coldkey/{coldkey}",
+    response_model=List[MinerInfo],
+    tags=["Miners"],
+    summary="List Miners by Coldkey",
+    description="List every miner owned by a coldkey (empty if none).",
+)
+def get_miners_by_coldkey(coldkey: str):
+    return [MinerInfo(**m) for m in db.get_miners_by_coldkey(coldkey)]
+
+
 @router.post(
     "/miners/register",
     response_model=MinerInfo,
@@ -89,12 +182,11 @@ def get_miner(uid: int):
     ),
 )
 def register_miner(miner: MinerRegister):
-    # Check hotkey uniqueness
-    for m in db.get_miners().values():
-        if m["hotkey"] == miner.hotkey:
-            raise HTTPException(status_code=400, detail="Hotkey already registered")
-
-    result = db.add_miner(miner.dict())
+    # Hotkey uniqueness is checked under the registry lock, so concurrent registrations can't both win
+    try:
+        result = db.add_miner(miner.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return MinerInfo(**result)
 
 
@@ -159,11 +251,10 @@ def get_validator(uid: int):
     description="Register a new validator on the subnet. Requires stake to participate.",
 )
 def register_validator(validator: ValidatorRegister):
-    for v in db.get_validators().values():
-        if v["hotkey"] == validator.hotkey:
-            raise HTTPException(status_code=400, detail="Hotkey already registered")
-
-    result = db.add_validator(validator.dict())
+    try:
+        result = db.add_validator(validator.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return ValidatorInfo(**result)
 
 
@@ -187,50 +278,88 @@ def generate_challenge(
     if not validator:
         raise HTTPException(status_code=404, detail=f"Validator UID {uid} not found")
 
-    # Realistic challenge generation
-    routes = [
-        ("Shanghai, China", "Los Angeles, USA"),
-        ("Rotterdam, Netherlands", "New York, USA"),
-        ("Shenzhen, China", "Hamburg, Germany"),
-        ("Tokyo, Japan", "Singapore"),
-        ("Mumbai, India", "Dubai, UAE"),
-        ("Busan, South Korea", "Long Beach, USA"),
-    ]
-    origin, destination = random.choice(routes)
-
-    products = list(ProductType)
-    carriers = ["COSCO", "Maersk", "MSC", "Evergreen", "ONE", "Hapag-Lloyd", "CMA CGM", "HMM"]
-
-    weather_conditions = [
-        "clear", "typhoon_warning_western_pacific", "north_atlantic_storm",
-        "monsoon_indian_ocean", "normal",
-    ]
-    congestion_levels = [
-        "normal", "shanghai_moderate", "shanghai_high", "la_moderate",
-        "singapore_low", "low",
-    ]
-
-    synapse = SupplyChainSynapse(
-        task_type=task_type,
-        origin=origin,
-        destination=destination,
-        product_type=random.choice(products),
-        carrier=random.choice(carriers),
-        ship_date=f"2026-{random.randint(1,12):02d}-{random.randint(1,28):02d}",
-        conditions=ShipmentConditions(
-            weather=random.choice(weather_conditions),
-            port_congestion=random.choice(congestion_levels),
-            geopolitical=random.choice(["normal", "normal", "normal", "elevated"]),
-        ),
-        random_seed=random.randint(10000000, 99999999),
-    )
+    synapse = next_challenge(task_type)[0]
 
     # Update validator stats
-    validator["challenges_sent"] += 1
+    db.record_validator_activity(uid)
 
     return synapse
 
 
+def _dispatch_to_miners(synapse: SupplyChainSynapse) -> dict:
+    """Send the synapse to every active miner at once, enforcing the per-miner timeout."""
+    active = [m for m in db.get_miners().values() if m["is_active"]]
+    with metrics.timed("dispatch"):
+        dispatched = dispatch_sync(synapse.dict(), active)
+    metrics.inc("challenges")
+    metrics.inc("predictions", len(dispatched["predictions"]))
+    metrics.inc("timeouts", len(dispatched["timed_out"]))
+    return dispatched
+
+
+def _score_predictions(predictions: List[dict], ground_truth: Optional[dict], rng: random.Random, total_emission: float) -> List[dict]:
+    """Batch-score one challenge's predictions and fold them into each miner's average. Returns ranked score dicts.
+
+    tau_earned in the result is the challenge's estimated share; actual TAO
+    is paid by Yuma Consensus when the tempo closes (db.advance_tempo).
+    """
+    uids = [p["miner_uid"] for p in predictions]
+    scores = score_challenge(
+        uids,
+        [p["miner_hotkey"] for p in predictions],
+        [p["predicted_eta_days"] for p in predictions],
+        [p["disruption_risk"] for p in predictions],
+        [p["response_time_ms"] for p in predictions],
+        db.consistency_scores(uids),
+        ground_truth, total_emission, rng,
+    )
+    with metrics.timed("state_update"):
+        if ground_truth:
+            db.record_consistency(scores)
+        db.record_score_stats(scores)
+        db.update_miner_scores((s["miner_uid"], s["score"]["final_score"]) for s in scores)
+    return scores
+
+
+def _run_validator_challenge(uid: int, task_type: TaskType, synapse: Optional[SupplyChainSynapse] = None) -> dict:
+    """One full challenge for validator `uid` (generate, dispatch, score, record). Returns the challenge record."""
+    # Next challenge of the shared stream; a provided synapse only takes its challenge type
+    synapse, challenge_type, rng, ground_truth = next_challenge(task_type, synapse)
+
+    # Dispatch to all active miners concurrently; late miners miss this round
+    dispatched = _dispatch_to_miners(synapse)
+    predictions = dispatched["predictions"]
+
+    # Score, rank and reward all predictions in one batch
+    total_emission = db.get_state()["total_emission_per_tempo"] * 0.41  # miner share
+    score_results = _score_predictions(predictions, ground_truth, rng, total_emission)
+
+    with metrics.timed("state_update"):
+        # Update validator; its scores are its weights for the next Yuma epoch
+        db.set_weights(uid, {s["miner_uid"]: s["score"]["final_score"] for s in score_results})
+        db.record_validator_activity(uid, 1, weight_block=db.get_state()["block_height"])
+
+        # Advance blocks
+        db.advance_block(random.randint(1, 5))
+
+        # Save challenge
+        challenge_id = str(uuid.uuid4())[:8]
+        challenge_record = {
+            "challenge_id": challenge_id,
+            "synapse": synapse,
+            "challenge_type": challenge_type,
+            "ground_truth": ground_truth,
+            "miner_predictions": predictions,
+            "timed_out_miners": dispatched["timed_out"],
+            "scores": score_results,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "tempo": db.get_state()["current_tempo"],
+        }
+        db.add_challenge(challenge_record)
+
+    return challenge_record
+
+
 @router.post(
     "/validators/{uid}/run-challenge",
     response_model=ChallengeResult,
@@ -239,11 +368,11 @@ def generate_challenge(
     description=(
         "Execute a complete challenge cycle:\n"
         "1. Validator generates a challenge (SupplyChainSynapse)\n"
-        "2. Challenge is dispatched to ALL active miners\n"
-        "3. Each miner runs its prediction model (response within 10s timeout)\n"
+        "2. Challenge is dispatched to ALL active miners concurrently\n"
+        "3. Each miner runs its prediction model (response within 10s timeout; late miners are skipped)\n"
         "4. Validator scores each miner's prediction against ground truth\n"
-        "5. Miners are ranked and TAO rewards are distributed\n\n"
-        "This simulates one full tempo cycle of the subnet."
+        "5. Miners are ranked and the scores become the validator's weights\n\n"
+        "TAO is paid out by Yuma Consensus over all validators' weights when the tempo closes."
     ),
 )
 def run_challenge(
@@ -255,128 +384,36 @@ def run_challenge(
     if not validator:
         raise HTTPException(status_code=404, detail=f"Validator UID {uid} not found")
 
-    # Generate challenge if not provided
-    if synapse is None:
-        routes = [
-            ("Shanghai, China", "Los Angeles, USA"),
-            ("Rotterdam, Netherlands", "New York, USA"),
-            ("Shenzhen, China", "Hamburg, Germany"),
-        ]
-        origin, dest = random.choice(routes)
-        synapse = SupplyChainSynapse(
-            task_type=task_type,
-            origin=origin,
-            destination=dest,
-            product_type=random.choice(list(ProductType)),
-            carrier=random.choice(["COSCO", "Maersk", "MSC", "Evergreen"]),
-            ship_date="2026-02-15",
-            conditions=ShipmentConditions(
-                weather=random.choice(["clear", "typhoon_warning_western_pacific", "normal"]),
-                port_congestion=random.choice(["normal", "shanghai_moderate"]),
-                geopolitical="normal",
-            ),
-            random_seed=random.randint(10000000, 99999999),
-        )
-
-    # Determine challenge type (70% historical, 30% near-term)
-    is_historical = random.random() < 0.7
-    challenge_type = "historical" if is_historical else "near_term"
-
-    # Generate ground truth for historical challenges
-    rng = random.Random(synapse.random_seed if synapse.random_seed else int(time.time()))
-    ground_truth = None
-    if is_historical:
-        base_eta = rng.uniform(5, 30)
-        had_disruption = rng.random() < 0.3
-        ground_truth = {
-            "actual_eta_days": round(base_eta, 1),
-            "had_disruption": had_disruption,
-            "disruption_type": rng.choice(["weather_delay", "port_congestion", "customs_delay", None]) if had_disruption else None,
-            "actual_route": f"{synapse.origin} → {synapse.destination}",
-        }
+    return FastJSONResponse(_run_validator_challenge(uid, task_type, synapse))
 
-    # Dispatch to all active miners and collect predictions
-    miners = db.get_miners()
-    predictions = []
-    for miner_uid, miner in miners.items():
-        if not miner["is_active"]:
-            continue
-        result = run_miner_prediction(synapse.dict(), miner["tier"])
-        result["miner_uid"] = miner_uid
-        result["miner_hotkey"] = miner["hotkey"]
-        predictions.append(MinerPrediction(**result))
 
-    # Score each prediction
-    scores = []
-    total_emission = db.get_state()["total_emission_per_tempo"] * 0.41  # miner share
-    for i, pred in enumerate(predictions):
-        if ground_truth:
-            score_data = score_prediction(pred.dict(), ground_truth)
-        else:
-            # Near-term: use estimated scoring
-            score_data = {
-                "eta_accuracy": round(rng.uniform(0.5, 0.95), 4),
-                "disruption_accuracy": round(rng.uniform(0.3, 0.9), 4),
-                "risk_calibration": round(rng.uniform(0.4, 0.85), 4),
-                "latency_score": round(rng.uniform(0.7, 0.99), 4),
-                "consistency": round(rng.uniform(0.6, 0.92), 4),
-                "disruption_bonus": False,
-                "final_score": 0,
-            }
-            score_data["final_score"] = round(
-                0.40 * score_data["eta_accuracy"]
-                + 0.25 * score_data["disruption_accuracy"]
-                + 0.15 * score_data["risk_calibration"]
-                + 0.10 * score_data["latency_score"]
-                + 0.10 * score_data["consistency"],
-                4
-            )
-
-        scores.append({
-            "miner_uid": pred.miner_uid,
-            "miner_hotkey": pred.miner_hotkey,
-            "score": ScoreBreakdown(**score_data),
-            "rank": 0,  # Set below
-            "tau_earned": 0,  # Set below
-        })
+@router.post(
+    "/validators/{uid}/run-challenges",
+    tags=["Validators"],
+    summary="Run Many Challenges (NDJSON Stream)",
+    description=(
+        "Generate, dispatch and score `count` challenges server-side in one request. "
+        "Each ChallengeResult is streamed as one NDJSON line as soon as it is scored, "
+        "so a backtest pays the HTTP round trip once instead of per challenge."
+    ),
+    response_class=StreamingResponse,
+)
+def run_challenges(
+    uid: int,
+    count: int = Query(..., ge=1, le=100_000, description="Number of challenges to run"),
+    task_type: TaskType = Query(default=TaskType.eta_prediction),
+):
+    if not db.get_validator(uid):
+        raise HTTPException(status_code=404, detail=f"Validator UID {uid} not found")
 
-    # Rank by final score
-    scores.sort(key=lambda s: s["score"].final_score, reverse=True)
-    total_scores = sum(s["score"].final_score for s in scores)
-    for rank, s in enumerate(scores, 1):
-        s["rank"] = rank
-        if total_scores > 0:
-            s["tau_earned"] = round(total_emission * (s["score"].final_score / total_scores), 6)
-        else:
-            s["tau_earned"] = 0
-
-        # Update miner stats
-        db.update_miner_score(s["miner_uid"], s["score"].final_score, s["tau_earned"])
-
-    score_results = [MinerScoreResult(**s) for s in scores]
-
-    # Update validator
-    validator["challenges_sent"] += 1
-    validator["last_weight_block"] = db.get_state()["block_height"]
-
-    # Advance blocks
-    db.advance_block(random.randint(1, 5))
-
-    # Save challenge
-    challenge_id = str(uuid.uuid4())[:8]
-    challenge_record = {
-        "challenge_id": challenge_id,
-        "synapse": synapse,
-        "challenge_type": challenge_type,
-        "ground_truth": ground_truth,
-        "miner_predictions": predictions,
-        "scores": score_results,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "tempo": db.get_state()["current_tempo"],
-    }
-    db.add_challenge(challenge_record)
+    def results():
+        for _ in range(count):
+            result = _run_validator_challenge(uid, task_type)
+            with metrics.timed("serialization"):
+                line = dumps(result) + b"\n"
+            yield line
 
-    return ChallengeResult(**challenge_record)
+    return StreamingResponse(results(), media_type="application/x-ndjson")
 
 
 @router.post(
@@ -409,11 +446,15 @@ def score_single_prediction(
         "had_disruption": had_disruption,
     }
 
-    score_data = score_prediction(prediction.dict(), ground_truth)
+    ema, _ = db.get_consistency(prediction.miner_uid)
+    score_data = score_prediction(prediction.dict(), ground_truth, ema)
     tau_earned = round(db.get_state()["total_emission_per_tempo"] * 0.41 * score_data["final_score"] / 8, 6)
 
-    # Update miner stats
-    db.update_miner_score(prediction.miner_uid, score_data["final_score"], tau_earned)
+    # Update miner stats (TAO itself is paid by Yuma when the tempo closes)
+    if db.get_miner(prediction.miner_uid):
+        db.record_consistency([{"miner_uid": prediction.miner_uid, "score": score_data}])
+        db.record_score_stats([{"miner_uid": prediction.miner_uid, "score": score_data}])
+    db.update_miner_score(prediction.miner_uid, score_data["final_score"])
 
     return MinerScoreResult(
         miner_uid=prediction.miner_uid,
@@ -444,21 +485,17 @@ def network_status():
     miners = db.get_miners()
     validators = db.get_validators()
 
-    active_miners = [m for m in miners.values() if m["is_active"]]
-    active_validators = [v for v in validators.values() if v["is_active"]]
-    total_stake = sum(m["stake"] for m in miners.values()) + sum(v["stake"] for v in validators.values())
-
     # Top 5 miners
-    top = sorted(active_miners, key=lambda m: m["avg_score"], reverse=True)[:5]
+    top = db.get_top_miners(5, active_only=True)
 
     return NetworkStatus(
         block_height=state["block_height"],
         current_tempo=state["current_tempo"],
         total_miners=len(miners),
-        active_miners=len(active_miners),
+        active_miners=db.count_active_miners(),
         total_validators=len(validators),
-        active_validators=len(active_validators),
-        total_stake=round(total_stake, 2),
+        active_validators=db.count_active_validators(),
+        total_stake=round(db.total_stake(), 2),
         total_emission_per_tempo=state["total_emission_per_tempo"],
         hyperparameters=SubnetHyperparameters(),
         top_miners=[MinerInfo(**m) for m in top],
@@ -472,27 +509,33 @@ def network_status():
     summary="Miner Leaderboard",
     description=(
         "Get the ranked leaderboard of all miners sorted by average score. "
-        "Shows performance metrics, TAO earned, and tier classification."
+        "Shows performance metrics, TAO earned, and tier classification. "
+        "Per-dimension averages cover the miner's scored challenges (null before the first); "
+        "streak counts consecutive closed tempos in the top 10."
     ),
 )
-def leaderboard():
-    miners = db.get_leaderboard()
-    rng = random.Random(42)
+def leaderboard(limit: Optional[int] = Query(default=None, ge=1, description="Only return the top N miners")):
+    miners = db.get_top_miners(limit) if limit else db.get_leaderboard()
+    uids = [m["uid"] for m in miners]
+    stats = db.score_stats()
+    scored = stats.counts(uids).tolist()
+    means = stats.means(uids, ("eta_accuracy", "disruption_accuracy")).round(3).tolist()
+    streaks = db.get_streaks()
     entries = []
-    for rank, m in enumerate(miners, 1):
-        entries.append(LeaderboardEntry(
-            rank=rank,
-            miner_uid=m["uid"],
-            miner_hotkey=m["hotkey"],
-            tier=m["tier"],
-            avg_score=m["avg_score"],
-            total_challenges=m["total_challenges"],
-            total_tau_earned=m["total_tau_earned"],
-            eta_accuracy_avg=round(m["avg_score"] * rng.uniform(0.9, 1.1), 3),
-            disruption_accuracy_avg=round(m["avg_score"] * rng.uniform(0.75, 1.0), 3),
-            streak=max(0, int((m["avg_score"] - 0.5) * 20) + rng.randint(0, 5)),
-        ))
-    return entries
+    for rank, (m, n, (eta, disruption)) in enumerate(zip(miners, scored, means), 1):
+        entries.append({
+            "rank": rank,
+            "miner_uid": m["uid"],
+            "miner_hotkey": m["hotkey"],
+            "tier": m["tier"],
+            "avg_score": m["avg_score"],
+            "total_challenges": m["total_challenges"],
+            "total_tau_earned": m["total_tau_earned"],
+            "eta_accuracy_avg": eta if n else None,
+            "disruption_accuracy_avg": disruption if n else None,
+            "streak": streaks.get(m["uid"], 0),
+        })
+    return FastJSONResponse(entries)
 
 
 @router.get(
@@ -500,11 +543,19 @@ def leaderboard():
     response_model=List[ChallengeResult],
     tags=["Network"],
     summary="Recent Challenges",
-    description="Get the most recent challenges and their results.",
+    description=(
+        "Get the most recent challenges and their results, newest first. "
+        "To page further back, pass the `X-Next-Cursor` response header as `cursor`; "
+        "the header is absent once the oldest recorded challenge has been returned."
+    ),
 )
-def recent_challenges(limit: int = Query(default=10, ge=1, le=50)):
-    challenges = db.get_challenges(limit)
-    return [ChallengeResult(**c) for c in challenges]
+def recent_challenges(
+    limit: int = Query(default=10, ge=1, le=50),
+    cursor: Optional[int] = Query(default=None, ge=0, description="Return challenges older than this cursor"),
+):
+    challenges, next_cursor = db.page_challenges(cursor, limit)
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+    return FastJSONResponse(challenges, headers=headers)
 
 
 @router.get(
@@ -530,10 +581,9 @@ def hyperparameters():
 def emission_distribution():
     state = db.get_state()
     total = state["total_emission_per_tempo"]
-    miners = db.get_miners()
-    validators = db.get_validators()
 
-    top_miners = sorted(miners.values(), key=lambda m: m["avg_score"], reverse=True)[:5]
+    top_miners = db.get_top_miners(5)
+    score_sum = max(1, db.total_miner_score())
 
     return {
         "tempo": state["current_tempo"],
@@ -549,34 +599,68 @@ def emission_distribution():
                 "hotkey": m["hotkey"][:16] + "...",
                 "tier": m["tier"],
                 "score": m["avg_score"],
-                "estimated_tao_this_tempo": round(total * 0.41 * m["avg_score"] / max(1, sum(mm["avg_score"] for mm in miners.values())), 6),
+                "estimated_tao_this_tempo": round(total * 0.41 * m["avg_score"] / score_sum, 6),
             }
             for m in top_miners
         ],
     }
 
 
-# ═══════════════════════════════════════════════════════════════
-# 5. DEMO / SIMULATION ENDPOINTS
-# ═══════════════════════════════════════════════════════════════
+@router.get(
+    "/metrics",
+    tags=["Network"],
+    summary="Prometheus Metrics",
+    description=(
+        "Hot-path instrumentation in Prometheus text format: a duration histogram per challenge stage "
+        "(generation, ground_truth, dispatch, prediction, scoring, ranking, state_update, serialization), "
+        "counters for challenges, predictions, timeouts and SQLite write failures, and gauges for registry size, "
+        "challenge history and (with SQLite) store health."
+    ),
+    response_class=PlainTextResponse,
+)
+def prometheus_metrics():
+    in_memory, recorded = db.challenge_history_size()
+    gauges = {
+        "miners": ("Registered miners", len(db.get_miners())),
+        "active_miners": ("Active miners", db.count_active_miners()),
+        "validators": ("Registered validators", len(db.get_validators())),
+        "challenge_history_length": ("Challenges held in the in-memory history", in_memory),
+        "challenges_recorded": ("Challenges recorded since start, including spilled history", recorded),
+    }
+    healthy = db.store_healthy()
+    if healthy is not None:
+        gauges["store_healthy"] = ("1 while SQLite write-behind flushes succeed, 0 after a failed one", int(healthy))
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 
 @router.post(
-    "/demo/full-tempo-cycle",
-    tags=["Demo Simulation"],
-    summary="Run Full Tempo Cycle",
+    "/network/fast-forward",
+    tags=["Network"],
+    summary="Fast-Forward Tempos",
     description=(
-        "Simulates a complete tempo cycle (~72 minutes compressed into one API call):\n\n"
-        "1. Validator generates 3 challenges (2 historical + 1 near-term)\n"
-        "2. All miners receive and process each challenge\n"
-        "3. Validator scores all predictions\n"
-        "4. Weights are updated via Yuma Consensus\n"
-        "5. TAO emissions are distributed\n"
-        "6. Block height and tempo advance\n\n"
-        "Returns complete results for all 3 challenges."
+        "Advance the network many tempos in one call. A few real tempo cycles calibrate each miner's "
+        "score distribution; the rest are resampled and evolved with array math (Yuma Consensus included). "
+        "No per-challenge records are kept — only totals and optional evenly spaced checkpoints are returned."
     ),
 )
-def full_tempo_cycle():
-    state = db.get_state()
+def fast_forward_tempos(
+    tempos: int = Query(..., ge=1, le=1_000_000, description="Tempos to advance"),
+    checkpoints: int = Query(default=0, ge=0, le=1000, description="Evenly spaced snapshots to return"),
+    calibration: int = Query(default=16, ge=1, le=256, description="Real tempo cycles used to calibrate scores"),
+    seed: Optional[int] = Query(default=None, description="Seed for reproducible runs"),
+):
+    try:
+        return fast_forward(tempos, checkpoints, calibration, seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ═══════════════════════════════════════════════════════════════
+# 5. DEMO / SIMULATION ENDPOINTS
+# ═══════════════════════════════════════════════════════════════
+
+def _lead_validator() -> dict:
+    """Highest-stake active validator, which leads a tempo cycle."""
     validators = list(db.get_validators().values())
     if not validators:
         raise HTTPException(status_code=400, detail="No validators registered")
@@ -585,102 +669,30 @@ def full_tempo_cycle():
     if not active_validators:
         raise HTTPException(status_code=400, detail="No active validators")
 
-    # Pick lead validator (highest stake)
-    lead_validator = max(active_validators, key=lambda v: v["stake"])
-
-    results = []
-    task_types = [TaskType.eta_prediction, TaskType.disruption_risk, TaskType.route_optimization]
-
-    for i, task_type in enumerate(task_types):
-        routes = [
-            ("Shanghai, China", "Los Angeles, USA"),
-            ("Rotterdam, Netherlands", "New York, USA"),
-            ("Shenzhen, China", "Hamburg, Germany"),
-            ("Tokyo, Japan", "Singapore"),
-            ("Mumbai, India", "Dubai, UAE"),
-            ("Busan, South Korea", "Long Beach, USA"),
-        ]
-        origin, dest = routes[i % len(routes)]
-
-        synapse = SupplyChainSynapse(
-            task_type=task_type,
-            origin=origin,
-            destination=dest,
-            product_type=random.choice(list(ProductType)),
-            carrier=random.choice(["COSCO", "Maersk", "MSC", "Evergreen", "ONE"]),
-            ship_date="2026-02-15",
-            conditions=ShipmentConditions(
-                weather=random.choice(["clear", "typhoon_warning_western_pacific", "normal"]),
-                port_congestion=random.choice(["normal", "shanghai_moderate", "low"]),
-                geopolitical="normal",
-            ),
-            random_seed=random.randint(10000000, 99999999),
-        )
-
-        # Historical for first 2, near-term for last
-        is_historical = i < 2
-        challenge_type = "historical" if is_historical else "near_term"
-
-        rng = random.Random(synapse.random_seed)
-        ground_truth = None
-        if is_historical:
-            base_eta = rng.uniform(5, 30)
-            ground_truth = {
-                "actual_eta_days": round(base_eta, 1),
-                "had_disruption": rng.random() < 0.3,
-            }
+    return max(active_validators, key=lambda v: v["stake"])
+
+
+def _tempo_cycle(lead_validator: dict):
+    """Run one tempo cycle step by step, yielding (event, data) as each part completes.
+
+    Yields ("challenge", challenge record) three times, then ("summary", {...})
+    once the tempo has closed, then ("leaderboard", entry) per miner, best first.
+    """
+    state = db.get_state()
+    tempo_scores = {}  # miner uid -> final scores this tempo
+
+    for i in range(len(TEMPO_TASKS)):
+        synapse, challenge_type, rng, ground_truth = tempo_challenge(state["current_tempo"], i)
 
         # Dispatch to miners
-        miners = db.get_miners()
-        predictions = []
-        for miner_uid, miner in miners.items():
-            if not miner["is_active"]:
-                continue
-            result = run_miner_prediction(synapse.dict(), miner["tier"])
-            result["miner_uid"] = miner_uid
-            result["miner_hotkey"] = miner["hotkey"]
-            predictions.append(MinerPrediction(**result))
+        dispatched = _dispatch_to_miners(synapse)
+        predictions = dispatched["predictions"]
 
         # Score
-        scores = []
         total_emission = state["total_emission_per_tempo"] * 0.41 / 3  # Split across 3 challenges
-        for pred in predictions:
-            if ground_truth:
-                score_data = score_prediction(pred.dict(), ground_truth)
-            else:
-                score_data = {
-                    "eta_accuracy": round(rng.uniform(0.5, 0.95), 4),
-                    "disruption_accuracy": round(rng.uniform(0.3, 0.9), 4),
-                    "risk_calibration": round(rng.uniform(0.4, 0.85), 4),
-                    "latency_score": round(rng.uniform(0.7, 0.99), 4),
-                    "consistency": round(rng.uniform(0.6, 0.92), 4),
-                    "disruption_bonus": False,
-                    "final_score": 0,
-                }
-                score_data["final_score"] = round(
-                    0.40 * score_data["eta_accuracy"]
-                    + 0.25 * score_data["disruption_accuracy"]
-                    + 0.15 * score_data["risk_calibration"]
-                    + 0.10 * score_data["latency_score"]
-                    + 0.10 * score_data["consistency"],
-                    4
-                )
-
-            scores.append({
-                "miner_uid": pred.miner_uid,
-                "miner_hotkey": pred.miner_hotkey,
-                "score": ScoreBreakdown(**score_data),
-                "rank": 0,
-                "tau_earned": 0,
-            })
-
-        scores.sort(key=lambda s: s["score"].final_score, reverse=True)
-        total_scores = sum(s["score"].final_score for s in scores)
-        for rank, s in enumerate(scores, 1):
-            s["rank"] = rank
-            if total_scores > 0:
-                s["tau_earned"] = round(total_emission * (s["score"].final_score / total_scores), 6)
-            db.update_miner_score(s["miner_uid"], s["score"].final_score, s["tau_earned"])
+        scores = _score_predictions(predictions, ground_truth, rng, total_emission)
+        for score in scores:
+            tempo_scores.setdefault(score["miner_uid"], []).append(score["score"]["final_score"])
 
         challenge_id = str(uuid.uuid4())[:8]
         challenge_record = {
@@ -689,62 +701,149 @@ def full_tempo_cycle():
             "challenge_type": challenge_type,
             "ground_truth": ground_truth,
             "miner_predictions": predictions,
-            "scores": [MinerScoreResult(**s) for s in scores],
+            "timed_out_miners": dispatched["timed_out"],
+            "scores": scores,
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "tempo": state["current_tempo"],
         }
-        db.add_challenge(challenge_record)
-        results.append(ChallengeResult(**challenge_record))
+        with metrics.timed("state_update"):
+            db.add_challenge(challenge_record)
+        yield "challenge", challenge_record
 
-    # Advance tempo
-    db.advance_tempo()
+    with metrics.timed("state_update"):
+        # Lead validator sets weights from its tempo average, then Yuma pays out and the tempo advances
+        db.set_weights(lead_validator["uid"], {uid: sum(v) / len(v) for uid, v in tempo_scores.items()})
+        epoch = db.advance_tempo()
 
-    # Update validator
-    lead_validator["challenges_sent"] += 3
-    lead_validator["last_weight_block"] = state["block_height"]
+        # Update validator
+        db.record_validator_activity(lead_validator["uid"], 3, weight_block=state["block_height"])
 
-    return {
+    yield "summary", {
         "tempo_completed": state["current_tempo"] - 1,
         "new_tempo": state["current_tempo"],
         "block_height": state["block_height"],
         "lead_validator_uid": lead_validator["uid"],
-        "challenges_run": len(results),
+        "challenges_run": len(TEMPO_TASKS),
         "challenge_types": ["historical", "historical", "near_term"],
-        "task_types": [str(t.value) for t in task_types],
+        "task_types": [str(t.value) for t in TEMPO_TASKS],
         "total_tao_distributed": round(state["total_emission_per_tempo"], 6),
-        "challenges": results,
-        "updated_leaderboard": [
-            {
-                "rank": rank,
-                "uid": m["uid"],
-                "hotkey": m["hotkey"][:16] + "...",
-                "tier": m["tier"],
-                "avg_score": m["avg_score"],
-                "total_tau": m["total_tau_earned"],
-            }
-            for rank, m in enumerate(sorted(db.get_miners().values(), key=lambda x: x["avg_score"], reverse=True), 1)
-        ],
+        "yuma_consensus": epoch,
     }
 
+    for rank, m in enumerate(db.get_leaderboard(), 1):
+        yield "leaderboard", {
+            "rank": rank,
+            "uid": m["uid"],
+            "hotkey": m["hotkey"][:16] + "...",
+            "tier": m["tier"],
+            "avg_score": m["avg_score"],
+            "total_tau": m["total_tau_earned"],
+        }
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+_END = object()
+
+
+def _detached(events, name: str):
+    """Run the `events` generator to completion on its own thread, yielding its items as they arrive.
+
+    A client disconnect closes this iterator, not `events`, so a generator that
+    mutates state never stops halfway through.
+    """
+    items = queue.Queue()
+
+    def run():
+        try:
+            for item in events:
+                items.put(item)
+        except Exception as e:  # noqa: BLE001 - re-raised on the consumer side if it is still there
+            log.exception("%s failed", name)
+            items.put(e)
+        items.put(_END)
+
+    threading.Thread(target=run, name=name).start()
+    while True:
+        item = items.get()
+        if item is _END:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @router.post(
-    "/demo/compare-miners",
+    "/demo/full-tempo-cycle",
     tags=["Demo Simulation"],
-    summary="Compare Miners on Same Challenge",
+    summary="Run Full Tempo Cycle",
     description=(
-        "Sends the same challenge to all miners and compares their predictions side-by-side. "
-        "Shows how different miner tiers (entry/mid/high) produce different quality predictions."
+        "Simulates a complete tempo cycle (~72 minutes compressed into one API call):\n\n"
+        "1. Validator generates 3 challenges (2 historical + 1 near-term)\n"
+        "2. All miners receive and process each challenge\n"
+        "3. Validator scores all predictions\n"
+        "4. Weights are updated via Yuma Consensus\n"
+        "5. TAO emissions are distributed\n"
+        "6. Block height and tempo advance\n\n"
+        "Returns complete results for all 3 challenges."
     ),
 )
-def compare_miners(synapse: SupplyChainSynapse):
-    miners = db.get_miners()
-    comparisons = []
+def full_tempo_cycle():
+    lead_validator = _lead_validator()
+    challenges, leaderboard = [], []
+    for event, data in _tempo_cycle(lead_validator):
+        if event == "challenge":
+            challenges.append(ChallengeResult(**data))
+        elif event == "summary":
+            summary = data
+        else:
+            leaderboard.append(data)
+    return {**summary, "challenges": challenges, "updated_leaderboard": leaderboard}
+
+
+@router.post(
+    "/demo/full-tempo-cycle/stream",
+    tags=["Demo Simulation"],
+    summary="Run Full Tempo Cycle (Server-Sent Events)",
+    description=(
+        "Same cycle as /demo/full-tempo-cycle, streamed as Server-Sent Events while it runs:\n\n"
+        "- `challenge` — one ChallengeResult per challenge, as soon as it is scored\n"
+        "- `summary` — tempo, block height and the Yuma Consensus epoch once the tempo closes\n"
+        "- `leaderboard` — one entry per miner, best first\n"
+        "- `done` — end of stream"
+    ),
+    response_class=StreamingResponse,
+)
+def full_tempo_cycle_stream():
+    lead_validator = _lead_validator()
+
+    def events():
+        # The cycle runs detached: a client that disconnects mid-stream can't leave a half-closed tempo
+        for event, data in _detached(_tempo_cycle(lead_validator), "tempo-cycle"):
+            yield _sse(event, jsonable_encoder(data))
+        yield _sse("done", {})
+
+    return _sse_response(events())
+
 
-    for uid, miner in miners.items():
+def _miner_comparisons(synapse: SupplyChainSynapse):
+    """Run the synapse on every active miner, yielding one comparison row per miner."""
+    synapse_dict = synapse.dict()
+    for uid, miner in db.get_miners().items():
         if not miner["is_active"]:
             continue
-        result = run_miner_prediction(synapse.dict(), miner["tier"])
-        comparisons.append({
+        result = run_miner_prediction(synapse_dict, miner["tier"])
+        yield {
             "miner_uid": uid,
             "miner_hotkey": miner["hotkey"][:16] + "...",
             "tier": miner["tier"],
@@ -754,26 +853,93 @@ def compare_miners(synapse: SupplyChainSynapse):
             "confidence": result["confidence"],
             "response_time_ms": result["response_time_ms"],
             "risk_factors_count": len(result.get("risk_factors", [])),
-            "data_sources": result["data_sources"],
+            "data_sources": len(result["data_sources"]),
             "route_recommendation": result.get("route_recommendation"),
-        })
+        }
 
+
+class _ComparisonStats:
+    """Running totals behind the compare-miners analysis, so rows need not be kept."""
+
+    def __init__(self):
+        self.count = 0
+        self.eta_sum = 0.0
+        self.risk_sum = 0.0
+        self.eta_min = self.eta_max = None
+        self.best = None      # (confidence, uid), first miner wins ties
+        self.fastest = None   # (response_time_ms, uid)
+
+    def add(self, row: dict) -> dict:
+        eta = row["predicted_eta_days"]
+        self.count += 1
+        self.eta_sum += eta
+        self.risk_sum += row["disruption_risk"]
+        self.eta_min = eta if self.eta_min is None else min(self.eta_min, eta)
+        self.eta_max = eta if self.eta_max is None else max(self.eta_max, eta)
+        if self.best is None or row["confidence"] > self.best[0]:
+            self.best = (row["confidence"], row["miner_uid"])
+        if self.fastest is None or row["response_time_ms"] < self.fastest[0]:
+            self.fastest = (row["response_time_ms"], row["miner_uid"])
+        return row
+
+    def analysis(self) -> dict:
+        if not self.count:
+            return {"avg_eta": 0, "avg_disruption_risk": 0, "eta_spread": 0,
+                    "highest_confidence_miner": None, "fastest_miner": None}
+        return {
+            "avg_eta": round(self.eta_sum / self.count, 1),
+            "avg_disruption_risk": round(self.risk_sum / self.count, 2),
+            "eta_spread": round(self.eta_max - self.eta_min, 1),
+            "highest_confidence_miner": self.best[1],
+            "fastest_miner": self.fastest[1],
+        }
+
+
+@router.post(
+    "/demo/compare-miners",
+    tags=["Demo Simulation"],
+    summary="Compare Miners on Same Challenge",
+    description=(
+        "Sends the same challenge to all miners and compares their predictions side-by-side. "
+        "Shows how different miner tiers (entry/mid/high) produce different quality predictions."
+    ),
+)
+def compare_miners(synapse: SupplyChainSynapse):
+    stats = _ComparisonStats()
+    comparisons = [stats.add(row) for row in _miner_comparisons(synapse)]
     comparisons.sort(key=lambda x: x["confidence"], reverse=True)
 
     return {
         "challenge": synapse.dict(),
-        "total_miners_queried": len(comparisons),
+        "total_miners_queried": stats.count,
         "comparisons": comparisons,
-        "analysis": {
-            "avg_eta": round(sum(c["predicted_eta_days"] for c in comparisons) / len(comparisons), 1) if comparisons else 0,
-            "avg_disruption_risk": round(sum(c["disruption_risk"] for c in comparisons) / len(comparisons), 2) if comparisons else 0,
-            "eta_spread": round(max(c["predicted_eta_days"] for c in comparisons) - min(c["predicted_eta_days"] for c in comparisons), 1) if comparisons else 0,
-            "highest_confidence_miner": comparisons[0]["miner_uid"] if comparisons else None,
-            "fastest_miner": min(comparisons, key=lambda c: c["response_time_ms"])["miner_uid"] if comparisons else None,
-        },
+        "analysis": stats.analysis(),
     }
 
 
+@router.post(
+    "/demo/compare-miners/stream",
+    tags=["Demo Simulation"],
+    summary="Compare Miners on Same Challenge (Server-Sent Events)",
+    description=(
+        "Same comparison as /demo/compare-miners, streamed as Server-Sent Events: "
+        "`challenge` first, then one `comparison` per miner as it answers (registry order), "
+        "then `analysis` with the totals, then `done`."
+    ),
+    response_class=StreamingResponse,
+)
+def compare_miners_stream(synapse: SupplyChainSynapse):
+    def events():
+        yield _sse("challenge", jsonable_encoder(synapse))
+        stats = _ComparisonStats()
+        for row in _miner_comparisons(synapse):
+            yield _sse("comparison", stats.add(row))
+        yield _sse("analysis", {"total_miners_queried": stats.count, **stats.analysis()})
+        yield _sse("done", {})
+
+    return _sse_response(events())
+
+
 # ═══════════════════════════════════════════════════════════════
 # 6. LANDING PAGE DEMO ENDPOINTS (Miner/Validator detail view)
 # ═══════════════════════════════════════════════════════════════
@@ -788,6 +954,29 @@ def list_demo_scenarios():
     return get_demo_scenarios_list()
 
 
+# ── Demo scenario cache ──
+# The scenarios are deterministic apart from block_number / tempo / timestamp,
+# so each is encoded once at startup; requests only append those three fields.
+# The ETag covers the deterministic part: a 304 means the client's copy is
+# current apart from those fields.
+
+def _json_bytes(content) -> bytes:
+    """Encode exactly as FastAPI's JSONResponse does."""
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _precompute_demo_scenarios() -> dict:
+    cache = {}
+    for key in DEMO_SCENARIOS:
+        body = _json_bytes(demo_scenario_static(key))
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        cache[key] = (etag, body[:-1] + b",")  # open object, volatile fields follow
+    return cache
+
+
+_DEMO_CACHE = _precompute_demo_scenarios()
+
+
 @router.get(
     "/api/demo/{scenario_key}",
     tags=["Demo Simulation"],
@@ -800,8 +989,59 @@ def list_demo_scenarios():
         "Returns full miner responses, validator verifications, consensus, and TAO rewards."
     ),
 )
-def run_demo(scenario_key: str):
-    result = run_demo_scenario(scenario_key)
-    if "error" in result:
-        raise HTTPException(status_code=404, detail=result["error"])
-    return result
+def run_demo(scenario_key: str, if_none_match: Optional[str] = Header(default=None)):
+    cached = _DEMO_CACHE.get(scenario_key)
+    if cached is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scenario: {scenario_key}")
+    etag, prefix = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return Response(prefix + _json_bytes(demo_scenario_volatile())[1:], media_type="application/json", headers=headers)
+
+
+# ═══════════════════════════════════════════════════════════════
+# 7. ADMIN
+# ═══════════════════════════════════════════════════════════════
+
+def _require_profile_token(token: Optional[str]):
+    if not config.PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set SUPPLYCHAIN_PROFILE_TOKEN)")
+    if not profiling.authorized(token):
+        raise HTTPException(status_code=403, detail="Missing or wrong profile token")
+
+
+@router.get(
+    "/admin/profiles",
+    tags=["Admin"],
+    summary="List Request Profiles",
+    description=(
+        "Profiles captured for requests that sent the admin token as the `X-Profile` header "
+        "or `?profile=` query flag, newest first. The profiled response carries its id in `X-Profile-Id`. "
+        "Requires the same token (these admin routes are never profiled themselves); "
+        "404 when profiling is not configured."
+    ),
+)
+@profiling.unprofiled
+def list_profiles(x_profile: Optional[str] = Header(default=None)):
+    _require_profile_token(x_profile)
+    return profiling.list_reports()
+
+
+@router.get(
+    "/admin/profiles/{profile_id}",
+    tags=["Admin"],
+    summary="Get Request Profile (Collapsed Stacks)",
+    description=(
+        "The handler of one profiled request as collapsed stacks (`frame;frame;frame microseconds`, "
+        "self time per stack), ready for flamegraph.pl or speedscope."
+    ),
+    response_class=PlainTextResponse,
+)
+@profiling.unprofiled
+def get_profile(profile_id: str, x_profile: Optional[str] = Header(default=None)):
+    _require_profile_token(x_profile)
+    report = profiling.get_report(profile_id)
+    if not report:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(report["stacks"])
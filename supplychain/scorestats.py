@@ -0,0 +1,174 @@
+"""
+Per-miner score statistics.
+Running mean and Welford variance of every ScoreBreakdown dimension, plus a
+fixed-bin histogram per dimension for approximate quantiles, held in arrays
+indexed by UID so a whole challenge folds in with one vectorized step and
+the leaderboard reads them without touching challenge history.
+"""
+
+import numpy as np
+
+from .scoring import SCORE_FIELDS
+
+# Every ScoreBreakdown field; disruption_bonus counts as 0/1, so its mean is the bonus rate
+DIMENSIONS = SCORE_FIELDS + ("disruption_bonus", "final_score")
+
+# Histogram bins over [0, 1]; quantiles interpolate within a bin, so they are off by at most 1 / BINS
+BINS = 32
+
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+def bins(values: np.ndarray) -> np.ndarray:
+    """Sketch bin of each score value."""
+    return np.clip((np.asarray(values) * BINS).astype(np.intp), 0, BINS - 1)
+
+
+class ScoreStats:
+    """Score count, per-dimension mean / M2 (Welford) and histogram sketch for every UID."""
+
+    def __init__(self, capacity: int = 256):
+        d = len(DIMENSIONS)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._mean = np.zeros((capacity, d))
+        self._m2 = np.zeros((capacity, d))
+        self._sketch = np.zeros((capacity, d, BINS), dtype=np.uint32)
+
+    def _grow(self, uid: int):
+        capacity = len(self._count)
+        if uid < capacity:
+            return
+        while capacity <= uid:
+            capacity *= 2
+        extra = capacity - len(self._count)
+        # Readers don't lock: publish the per-dimension arrays first and _count last, so any
+        # UID below len(_count) is in bounds of every array (readers check len(_count) first)
+        self._mean = np.concatenate([self._mean, np.zeros((extra,) + self._mean.shape[1:])])
+        self._m2 = np.concatenate([self._m2, np.zeros((extra,) + self._m2.shape[1:])])
+        self._sketch = np.concatenate([self._sketch, np.zeros((extra,) + self._sketch.shape[1:], dtype=np.uint32)])
+        self._count = np.concatenate([self._count, np.zeros(extra, dtype=np.int64)])
+
+    def update(self, uids, values):
+        """Fold one score per UID into its statistics; `values` is (len(uids), len(DIMENSIONS)). UIDs must be unique."""
+        uids = np.asarray(uids, dtype=np.int64)
+        if not len(uids):
+            return
+        self._grow(int(uids.max()))
+        values = np.asarray(values, dtype=np.float64)
+        count = self._count[uids] + 1
+        mean = self._mean[uids]
+        delta = values - mean
+        mean += delta / count[:, None]
+        self._m2[uids] += delta * (values - mean)
+        self._mean[uids] = mean
+        self._count[uids] = count
+        # (uid, dimension) pairs are unique, so a plain fancy-index add is safe
+        self._sketch[uids[:, None], np.arange(len(DIMENSIONS)), bins(values)] += 1
+
+    def merge(self, uids, count, total, total_sq, sketch):
+        """Fold a batch of many scores per UID at once (Chan et al.'s pairwise combination).
+
+        `count` is (n,) scores per UID, `total` / `total_sq` their per-dimension
+        sums and sums of squares (n x D), `sketch` their histograms (n x D x BINS).
+        """
+        uids = np.asarray(uids, dtype=np.int64)
+        count = np.asarray(count, dtype=np.int64)
+        keep = count > 0
+        uids, count = uids[keep], count[keep]
+        if not len(uids):
+            return
+        self._grow(int(uids.max()))
+        total, total_sq = np.asarray(total)[keep], np.asarray(total_sq)[keep]
+        n = count[:, None].astype(np.float64)
+        batch_mean = total / n
+        batch_m2 = np.maximum(total_sq - total * batch_mean, 0.0)
+
+        old = self._count[uids][:, None].astype(np.float64)
+        combined = old + n
+        delta = batch_mean - self._mean[uids]
+        self._mean[uids] += delta * n / combined
+        self._m2[uids] += batch_m2 + delta ** 2 * old * n / combined
+        self._count[uids] += count
+        self._sketch[uids] += np.asarray(sketch, dtype=np.uint32)[keep]
+
+    def counts(self, uids) -> np.ndarray:
+        uids = np.asarray(uids, dtype=np.int64)
+        count = self._count
+        known = uids < len(count)
+        out = np.zeros(len(uids), dtype=np.int64)
+        out[known] = count[uids[known]]
+        return out
+
+    def means(self, uids, dimensions=DIMENSIONS) -> np.ndarray:
+        """(len(uids), len(dimensions)) running means; unseen UIDs read as 0 (check counts())."""
+        uids = np.asarray(uids, dtype=np.int64)
+        cols = [DIMENSIONS.index(d) for d in dimensions]
+        mean = self._mean
+        known = uids < len(mean)
+        out = np.zeros((len(uids), len(cols)))
+        out[known] = mean[uids[known]][:, cols]
+        return out
+
+    def summary(self, uid: int, quantiles=QUANTILES) -> dict:
+        """{dimension: {"mean", "std", "quantiles": [...]}} and the score count for one UID."""
+        if uid >= len(self._count) or not self._count[uid]:
+            return {"count": 0, "dimensions": {}}
+        count = self._count[uid].item()
+        mean = self._mean[uid]
+        std = np.sqrt(self._m2[uid] / count)
+        # Cumulative bin counts; a quantile falls in the first bin reaching q * count
+        cum = np.cumsum(self._sketch[uid], axis=1, dtype=np.float64)
+        below = np.concatenate([np.zeros((len(DIMENSIONS), 1)), cum[:, :-1]], axis=1)
+        cells = cum - below
+        qs = np.empty((len(DIMENSIONS), len(quantiles)))
+        for j, q in enumerate(quantiles):
+            target = q * cum[:, -1]
+            b = np.minimum((cum < target[:, None]).sum(axis=1), BINS - 1)
+            rows = np.arange(len(DIMENSIONS))
+            frac = np.divide(target - below[rows, b], cells[rows, b],
+                             out=np.zeros(len(DIMENSIONS)), where=cells[rows, b] > 0)
+            qs[:, j] = (b + np.clip(frac, 0.0, 1.0)) / BINS
+        return {
+            "count": count,
+            "dimensions": {
+                name: {"mean": mean[i].item(), "std": std[i].item(), "quantiles": qs[i].tolist()}
+                for i, name in enumerate(DIMENSIONS)
+            },
+        }
+
+    def state(self, uid: int):
+        """One UID's raw accumulators as plain lists (for persistence), or None if it has no scores."""
+        if uid >= len(self._count) or not self._count[uid]:
+            return None
+        return {
+            "count": self._count[uid].item(),
+            "mean": self._mean[uid].tolist(),
+            "m2": self._m2[uid].tolist(),
+            "sketch": self._sketch[uid].tolist(),
+        }
+
+    def set(self, uid: int, state: dict):
+        """Restore one UID's accumulators from state()."""
+        self._grow(uid)
+        self._count[uid] = state["count"]
+        self._mean[uid] = state["mean"]
+        self._m2[uid] = state["m2"]
+        self._sketch[uid] = state["sketch"]
+
+    def reset(self, uid: int):
+        if uid < len(self._count):
+            self._count[uid] = 0
+            self._mean[uid] = 0.0
+            self._m2[uid] = 0.0
+            self._sketch[uid] = 0
+
+
+def score_columns(scores: list):
+    """(uids, values) from score_challenge results, values aligned with DIMENSIONS."""
+    n = len(scores)
+    uids = np.fromiter((s["miner_uid"] for s in scores), dtype=np.int64, count=n)
+    values = np.empty((n, len(DIMENSIONS)))
+    for i, field in enumerate(DIMENSIONS):
+        values[:, i] = np.fromiter((float(s["score"][field]) for s in scores), dtype=np.float64, count=n)
+    return uids, values
+
@@ -0,0 +1,249 @@
+"""
+Historical shipment dataset for ground truth.
+A shipment-history CSV is ingested once into a columnar binary file, sorted
+by route then ship date, with a route index and a ship-date index. Validators
+memory-map the file, so sampling a shipment or looking one up by route and
+date is O(1) / O(log n) per challenge and the rows never enter the heap.
+
+    python -m supplychain.shipments --csv history.csv --out shipments.scs
+    SUPPLYCHAIN_SHIPMENTS=shipments.scs uvicorn main:app
+"""
+
+import argparse
+import csv
+import mmap
+import operator
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from .encoding import dumps, loads
+
+MAGIC = b"SCSHIP01"
+ALIGN = 64
+
+# CSV header the ingestion tool expects (extra columns are ignored)
+CSV_COLUMNS = ("origin", "destination", "carrier", "product", "ship_date", "transit_days", "disruption_type")
+
+# Rows parsed per batch while ingesting; bounds the Python objects alive at once
+CHUNK_ROWS = 100_000
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _uint(n: int):
+    """Smallest unsigned dtype that holds 0..n."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+# ── Ingestion ──
+
+def _ids(values, table: dict) -> np.ndarray:
+    """Dictionary ids of `values`, growing `table`, in the smallest dtype that fits so far."""
+    ids = [table.setdefault(v, len(table)) for v in values]
+    return np.array(ids, dtype=_uint(len(table)))
+
+
+def _parse_chunk(rows: list, ids: dict, first_row: int) -> dict:
+    """Columns of one batch of CSV rows, with strings replaced by dictionary ids."""
+    origin, destination, carrier, product, ship_date, transit_days, disruption = zip(*rows)
+    try:
+        return {
+            "route": _ids(zip(origin, destination), ids["routes"]),
+            "carrier": _ids(carrier, ids["carriers"]),
+            "product": _ids(product, ids["products"]),
+            "ship_day": np.array(ship_date, dtype="datetime64[D]").astype(np.int32),
+            "transit_days": np.array(transit_days, dtype=np.float32),
+            "disruption": _ids(disruption, ids["disruptions"]),
+        }
+    except ValueError as e:
+        raise ValueError(f"CSV rows {first_row}-{first_row + len(rows) - 1}: {e}") from None
+
+
+def _read_csv(path: str, ids: dict) -> dict:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, skipinitialspace=True)
+        header = [h.strip().lower() for h in next(reader)]
+        missing = [c for c in CSV_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"{path}: missing CSV columns {missing}")
+        pick = operator.itemgetter(*(header.index(c) for c in CSV_COLUMNS))
+
+        chunks, batch, first_row = [], [], 1
+        for row in reader:
+            if not row:
+                continue
+            try:
+                batch.append(pick(row))
+            except IndexError:
+                raise ValueError(f"{path}:{reader.line_num}: expected {len(header)} fields, got {len(row)}") from None
+            if len(batch) == CHUNK_ROWS:
+                chunks.append(_parse_chunk(batch, ids, first_row))
+                first_row += len(batch)
+                batch = []
+        if batch:
+            chunks.append(_parse_chunk(batch, ids, first_row))
+    if not chunks:
+        raise ValueError(f"{path}: no shipments")
+    # Ids only grow, so concatenating promotes every chunk to the final dtype
+    return {name: np.concatenate([c.pop(name) for c in chunks]) for name in list(chunks[0])}
+
+
+def ingest(csv_path: str, out: str) -> dict:
+    """Convert a shipment-history CSV into the columnar file `out`. Returns the file's header."""
+    # Empty disruption type means none; keep it as id 0
+    ids = {"routes": {}, "carriers": {}, "products": {}, "disruptions": {"": 0}}
+    cols = _read_csv(csv_path, ids)
+
+    # Reorder one column at a time so only one extra column is alive at once
+    order = np.lexsort((cols["ship_day"], cols["route"]))
+    columns = {name: cols.pop(name)[order] for name in list(cols)}
+    del order
+    rows = len(columns["route"])
+
+    # Route index: rows of route r are [route_offsets[r], route_offsets[r + 1])
+    columns["route_offsets"] = np.concatenate(([0], np.cumsum(np.bincount(columns["route"], minlength=len(ids["routes"]))))).astype(np.uint64)
+    # Ship-date index: rows shipped on day d are date_order[date_offsets[d - first_day]:date_offsets[d - first_day + 1]]
+    days = columns["ship_day"]
+    first_day = int(days.min())
+    columns["date_order"] = np.argsort(days, kind="stable").astype(_uint(rows))
+    columns["date_offsets"] = np.concatenate(([0], np.cumsum(np.bincount(days - first_day)))).astype(np.uint64)
+
+    header = {
+        "rows": rows,
+        "first_day": first_day,
+        "routes": [list(key) for key in ids["routes"]],
+        "carriers": list(ids["carriers"]),
+        "products": list(ids["products"]),
+        "disruptions": list(ids["disruptions"]),
+        "columns": {},
+    }
+    # Column offsets depend on the header's own length, so lay out against a generous bound
+    header_bound = len(dumps(header)) + 128 * len(columns) + ALIGN
+    offset = -(-(len(MAGIC) + 8 + header_bound) // ALIGN) * ALIGN
+    for name, array in columns.items():
+        header["columns"][name] = [array.dtype.str, offset, len(array)]
+        offset = -(-(offset + array.nbytes) // ALIGN) * ALIGN
+
+    encoded = dumps(header)
+    with open(out, "wb") as f:
+        f.write(MAGIC + len(encoded).to_bytes(8, "little") + encoded)
+        for name, array in columns.items():
+            f.seek(header["columns"][name][1])
+            array.tofile(f)
+    return header
+
+
+# ── Memory-mapped dataset ──
+
+class ShipmentDataset:
+    """Read-only view of an ingested shipment file; columns are numpy views over the mapping."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a shipment dataset")
+        size = int.from_bytes(self._map[len(MAGIC):len(MAGIC) + 8], "little")
+        header = loads(self._map[len(MAGIC) + 8:len(MAGIC) + 8 + size])
+        self.rows = header["rows"]
+        self.first_day = header["first_day"]
+        self.routes = [tuple(r) for r in header["routes"]]
+        self.carriers = header["carriers"]
+        self.products = header["products"]
+        self.disruptions = header["disruptions"]
+        self._route_ids = {route: i for i, route in enumerate(self.routes)}
+        for name, (dtype, offset, count) in header["columns"].items():
+            setattr(self, name, np.frombuffer(self._map, dtype=np.dtype(dtype), count=count, offset=offset))
+
+    def __len__(self):
+        return self.rows
+
+    def sample(self, u: float) -> int:
+        """Row for a uniform `u` in [0, 1): every shipment equally likely, so busy routes come up more."""
+        return min(int(u * self.rows), self.rows - 1)
+
+    def route_rows(self, origin: str, destination: str) -> range:
+        r = self._route_ids.get((origin, destination))
+        if r is None:
+            return range(0)
+        return range(int(self.route_offsets[r]), int(self.route_offsets[r + 1]))
+
+    def date_rows(self, ship_date: str) -> np.ndarray:
+        """Row numbers of every shipment that left on `ship_date` (YYYY-MM-DD)."""
+        d = (date.fromisoformat(ship_date) - _EPOCH).days - self.first_day
+        if not 0 <= d < len(self.date_offsets) - 1:
+            return self.date_order[:0]
+        return self.date_order[int(self.date_offsets[d]):int(self.date_offsets[d + 1])]
+
+    def match(self, origin: str, destination: str, ship_date: str) -> range:
+        """Rows of `origin` -> `destination` shipped on `ship_date` (the route's rows are in date order)."""
+        rows = self.route_rows(origin, destination)
+        if not rows:
+            return rows
+        # Search with the column's own dtype; a Python int would convert the whole slice first
+        day = self.ship_day.dtype.type((date.fromisoformat(ship_date) - _EPOCH).days)
+        days = self.ship_day[rows.start:rows.stop]
+        return range(rows.start + int(np.searchsorted(days, day, "left")),
+                     rows.start + int(np.searchsorted(days, day, "right")))
+
+    def row(self, i: int) -> dict:
+        origin, destination = self.routes[self.route[i]]
+        return {
+            "origin": origin,
+            "destination": destination,
+            "carrier": self.carriers[self.carrier[i]],
+            "product": self.products[self.product[i]],
+            "ship_date": (_EPOCH + timedelta(days=int(self.ship_day[i]))).isoformat(),
+            "transit_days": float(self.transit_days[i]),
+            "disruption_type": self.disruptions[self.disruption[i]] or None,
+        }
+
+
+# ── Synthetic history ──
+
+def synthetic_csv(path: str, rows: int, seed: int = 0):
+    """Write `rows` shipments on the ROUTE_DATABASE lanes, for trying the pipeline without real history."""
+    from .ai import ROUTE_DATABASE
+
+    rand = random.Random(seed)
+    lanes = list(ROUTE_DATABASE.items())
+    carriers = ("MSC", "Maersk", "CMA CGM", "COSCO", "Hapag-Lloyd", "Evergreen", "ONE", "HMM")
+    products = ("electronics", "general", "bulk", "perishable", "hazmat")
+    delays = (("weather_delay", 3.0), ("port_congestion", 2.0), ("customs_delay", 1.5))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for _ in range(rows):
+            (origin, destination), lane = rand.choice(lanes)
+            transit = rand.gauss(lane["base_days"], lane["variance"] / 2)
+            disruption = ""
+            if rand.random() < lane["risk_baseline"]:
+                disruption, delay = rand.choice(delays)
+                transit += rand.uniform(0.5, 2) * delay
+            ship_date = date(2023, 1, 1) + timedelta(days=rand.randrange(3 * 365))
+            writer.writerow((origin, destination, rand.choice(carriers), rand.choice(products),
+                             ship_date.isoformat(), round(max(1.0, transit), 2), disruption))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a shipment-history CSV for SUPPLYCHAIN_SHIPMENTS")
+    parser.add_argument("--csv", required=True, help="shipment history (" + ", ".join(CSV_COLUMNS) + ")")
+    parser.add_argument("--out", help="columnar dataset to write")
+    parser.add_argument("--synthetic", type=int, default=0, help="first write this many synthetic rows to --csv")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.synthetic:
+        synthetic_csv(args.csv, args.synthetic, args.seed)
+        print(f"wrote {args.synthetic} synthetic shipments to {args.csv}")
+    if args.out:
+        header = ingest(args.csv, args.out)
+        print(f"wrote {header['rows']} shipments on {len(header['routes'])} routes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
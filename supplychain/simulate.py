@@ -0,0 +1,161 @@
+"""
+Monte Carlo tempo simulator.
+Runs many independent, seeded replicas of the full tempo cycle across a
+process pool and merges each miner's earnings and score into summary
+statistics. Every replica starts from a freshly seeded demo network, so a
+given seed reproduces the same result regardless of worker count.
+
+    python -m supplychain.simulate --replicas 1000 --tempos 10 --seed 42
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from . import config
+
+QUANTILES = (5, 50, 95)
+
+
+# ── Worker side ──
+
+def _init_worker():
+    # Replicas are scratch state: never mirror to SQLite, spill history or sleep out miner latency.
+    # db is imported only after this runs, so its import-time setup sees the overrides.
+    config.DB_PATH = ""
+    config.CHALLENGE_SPILL_DIR = ""
+    config.MINER_LATENCY_SCALE = 0.0
+
+
+def run_replica(seed: int, tempos: int) -> dict:
+    """Run `tempos` full tempo cycles on a fresh network seeded with `seed`.
+
+    Returns {"seed", "miners": [{"uid", "tier", "tau_earned", "avg_score"}, ...]}
+    with tau_earned counted from the start of the replica.
+    """
+    from . import challenges, db
+    from .routes import full_tempo_cycle
+
+    random.seed(seed)
+    challenges.reset(seed)
+    db.reset_state()
+    start_tau = {uid: m["total_tau_earned"] for uid, m in db.get_miners().items()}
+
+    for _ in range(tempos):
+        full_tempo_cycle()
+
+    return {
+        "seed": seed,
+        "miners": [
+            {
+                "uid": uid,
+                "tier": m["tier"],
+                "tau_earned": m["total_tau_earned"] - start_tau[uid],
+                "avg_score": m["avg_score"],
+            }
+            for uid, m in db.get_miners().items()
+        ],
+    }
+
+
+def _run_replica_args(args):
+    return run_replica(*args)
+
+
+# ── Aggregation ──
+
+def _distribution(values) -> dict:
+    values = np.asarray(values, dtype=np.float64)
+    summary = {"mean": round(values.mean().item(), 6), "std": round(values.std().item(), 6)}
+    for q, v in zip(QUANTILES, np.percentile(values, QUANTILES).tolist()):
+        summary[f"p{q}"] = round(v, 6)
+    return summary
+
+
+def _gini(values) -> float:
+    """Gini coefficient of one replica's earnings (0 = equal split)."""
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    total = values.sum()
+    if total <= 0:
+        return 0.0
+    n = len(values)
+    return ((2 * np.arange(1, n + 1) - n - 1) @ values / (n * total)).item()
+
+
+def summarize(replicas: list) -> dict:
+    """Merge replica results into per-miner and per-tier distributions."""
+    by_miner, by_tier = {}, {}
+    for replica in replicas:
+        for m in replica["miners"]:
+            entry = by_miner.setdefault(m["uid"], {"tier": m["tier"], "tau": [], "score": []})
+            entry["tau"].append(m["tau_earned"])
+            entry["score"].append(m["avg_score"])
+            by_tier.setdefault(m["tier"], []).append(m["tau_earned"])
+
+    return {
+        "miners": {
+            uid: {
+                "tier": entry["tier"],
+                "tau_earned": _distribution(entry["tau"]),
+                "avg_score": _distribution(entry["score"]),
+            }
+            for uid, entry in sorted(by_miner.items())
+        },
+        "tiers": {tier: _distribution(values) for tier, values in sorted(by_tier.items())},
+        "earnings_gini": _distribution([_gini([m["tau_earned"] for m in r["miners"]]) for r in replicas]),
+    }
+
+
+# ── Runner ──
+
+def replica_seeds(seed: int, replicas: int) -> list:
+    """Independent per-replica seeds derived from one master seed."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(63) for _ in range(replicas)]
+
+
+def simulate(replicas: int, tempos: int = 1, seed: int = 0, workers: int = None) -> dict:
+    """Run `replicas` seeded replicas of `tempos` tempo cycles each and summarize them.
+
+    Replicas always run in child processes (spawned, so each imports its own
+    supplychain.db), never against this process's live state.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [(s, tempos) for s in replica_seeds(seed, replicas)]
+    chunksize = max(1, replicas // (workers * 4))
+
+    start = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker) as pool:
+        results = pool.map(_run_replica_args, jobs, chunksize=chunksize)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    summary["run"] = {
+        "replicas": replicas,
+        "tempos": tempos,
+        "seed": seed,
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "tempos_per_s": round(replicas * tempos / elapsed, 1) if elapsed > 0 else None,
+    }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of subnet tempos")
+    parser.add_argument("--replicas", type=int, default=100)
+    parser.add_argument("--tempos", type=int, default=10, help="tempo cycles per replica")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    args = parser.parse_args(argv)
+    print(json.dumps(simulate(args.replicas, args.tempos, args.seed, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
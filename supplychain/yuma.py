@@ -0,0 +1,112 @@
+"""
+Yuma Consensus
+Turns the validators' weight rows into miner incentive and validator
+dividends once per tempo: stake-weighted consensus, clipping of weights
+above it, bond EMA and the resulting emission split. Pure numpy over a
+validator x miner matrix; db.run_epoch does the bookkeeping around it.
+"""
+
+import numpy as np
+
+KAPPA = 0.5           # stake majority a miner's weight must reach to count in full
+BOND_ALPHA = 0.1      # weight of this tempo's bonds in the bond EMA
+MINER_CUT = 0.41
+VALIDATOR_CUT = 0.41
+
+
+def _normalize(values, axis=None):
+    """Scale to sum 1 along `axis`; all-zero slices stay zero."""
+    total = values.sum(axis=axis, keepdims=axis is not None)
+    return np.divide(values, total, out=np.zeros_like(values), where=total > 0)
+
+
+def weighted_median(stake, weights, kappa: float = KAPPA):
+    """Per-miner consensus weight: the highest w such that validators holding
+    at least `kappa` of the stake gave the miner w or more.
+
+    `weights` is validator x miner, optionally with leading batch axes.
+    """
+    order = np.argsort(-weights, axis=-2, kind="stable")
+    ranked = np.take_along_axis(weights, order, axis=-2)
+    support = np.cumsum(stake[order], axis=-2)
+    first = np.argmax(support >= kappa - 1e-12, axis=-2)
+    return np.take_along_axis(ranked, first[..., None, :], axis=-2)[..., 0, :]
+
+
+def yuma_epoch(weights, stake, bonds=None, kappa: float = KAPPA, bond_alpha: float = BOND_ALPHA) -> dict:
+    """Run one Yuma epoch.
+
+    `weights` is the validator x miner matrix of raw weights (any scale,
+    rows are normalized here), `stake` the validators' stake and `bonds`
+    the previous epoch's bond matrix (same shape, or None). Returns numpy
+    arrays: consensus, incentive (per miner, sums to 1), trust and
+    dividends (per validator, dividends sum to 1) and the new bonds.
+    """
+    weights = _normalize(np.asarray(weights, dtype=np.float64), axis=1)
+    n_validators, n_miners = weights.shape
+    stake = _normalize(np.asarray(stake, dtype=np.float64))
+    if bonds is None:
+        bonds = np.zeros_like(weights)
+
+    if n_validators == 0 or n_miners == 0:
+        consensus = np.zeros(n_miners)
+    else:
+        consensus = weighted_median(stake, weights, kappa)
+    clipped = np.minimum(weights, consensus)
+
+    incentive = _normalize(stake @ clipped)
+    trust = np.divide(clipped.sum(axis=1), weights.sum(axis=1), out=np.zeros(n_validators), where=weights.sum(axis=1) > 0)
+
+    # Bonds: each validator's stake-weighted share of every miner, smoothed across tempos
+    delta = _normalize(stake[:, None] * clipped, axis=0)
+    bonds = bond_alpha * delta + (1 - bond_alpha) * np.asarray(bonds, dtype=np.float64)
+    bonds = _normalize(bonds, axis=0)
+
+    dividends = _normalize(bonds @ incentive)
+    return {
+        "consensus": consensus,
+        "incentive": incentive,
+        "trust": trust,
+        "dividends": dividends,
+        "bonds": bonds,
+    }
+
+
+def yuma_epochs(weights, stake, bonds=None, kappa: float = KAPPA, bond_alpha: float = BOND_ALPHA) -> dict:
+    """Run consecutive epochs at once; `weights` is (epochs, validators, miners).
+
+    Stake is held fixed. Returns per-epoch consensus and incentive
+    (epochs x miners) plus the bonds and dividends after the last epoch.
+    The bond EMA is folded in closed form, which matches stepping
+    yuma_epoch except for miners that got no clipped weight in some epoch.
+    """
+    weights = _normalize(np.asarray(weights, dtype=np.float64), axis=-1)
+    n_epochs, n_validators, n_miners = weights.shape
+    stake = _normalize(np.asarray(stake, dtype=np.float64))
+    if bonds is None:
+        bonds = np.zeros((n_validators, n_miners))
+
+    if n_validators == 0 or n_miners == 0:
+        consensus = np.zeros((n_epochs, n_miners))
+    else:
+        consensus = weighted_median(stake, weights, kappa)
+    clipped = np.minimum(weights, consensus[:, None, :])
+    incentive = _normalize(np.einsum("v,tvn->tn", stake, clipped), axis=-1)
+
+    delta = _normalize(stake[:, None] * clipped, axis=-2)
+    bonds = np.array(bonds, dtype=np.float64)
+    if n_epochs:
+        # A miner nobody holds bonds in yet takes its first delta outright, as yuma_epoch's renormalization does
+        unbonded = bonds.sum(axis=0) == 0
+        bonds[:, unbonded] = delta[0][:, unbonded]
+    decay = (1 - bond_alpha) ** np.arange(n_epochs - 1, -1, -1)
+    bonds = (1 - bond_alpha) ** n_epochs * bonds + bond_alpha * np.einsum("t,tvn->vn", decay, delta)
+    bonds = _normalize(bonds, axis=0)
+
+    last = incentive[-1] if n_epochs else np.zeros(n_miners)
+    return {
+        "consensus": consensus,
+        "incentive": incentive,
+        "dividends": _normalize(bonds @ last),
+        "bonds": bonds,
+    }
@@ -0,0 +1,43 @@
+import pytest
+
+from supplychain import config, db
+
+
+@pytest.fixture
+def subnet():
+    """A freshly seeded network for one test, thrown away afterwards."""
+    db.reset_state()
+    yield db.get_state()
+    db.reset_state()
+
+
+@pytest.fixture(params=("dict", "columnar"))
+def backend_subnet(request, monkeypatch):
+    """`subnet` on each registry backend."""
+    monkeypatch.setattr(config, "REGISTRY_BACKEND", request.param)
+    db.reset_state()
+    yield db.get_state()
+    db.reset_state()
+
+
+@pytest.fixture
+def stored_subnet(tmp_path, monkeypatch):
+    """A seeded network mirrored to SQLite in tmp_path; call the yielded reopen() to restart from disk."""
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "subnet.db"))
+    db.reset_state()
+    monkeypatch.setattr(db, "_store", db._open_store())
+
+    def reopen():
+        """Flush and close the store, drop all in-memory state, and rehydrate it from the file."""
+        db._store.close()
+        db._store = None
+        with monkeypatch.context() as m:
+            m.setattr(config, "SEED", "none")
+            db.reset_state()
+        db._store = db._open_store()
+        return db.get_state()
+
+    yield reopen
+    db._store.close()
+    db._store = None
+    db.reset_state()
@@ -0,0 +1,131 @@
+"""
+Concurrency stress test for the shared subnet state.
+
+Hammers run_challenge from many threads, the way FastAPI's threadpool runs
+sync handlers, while other threads read the leaderboard and register new
+miners, some of them racing for the same hotkey. Then checks that no update
+was lost, each contested hotkey was registered exactly once, and every index
+still agrees with the registry. Runs on both registry backends; enough
+miners register to make the columnar registry grow mid-run.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from supplychain import db
+from supplychain.models import MinerRegister, TaskType, ValidatorRegister
+from supplychain.routes import leaderboard, register_miner, register_validator, run_challenge
+
+THREADS = 8
+CHALLENGES = 80
+MINERS = 248          # registry size before the run; registrations push it past the columnar capacity (256)
+REGISTRATIONS = 16    # miners registered while challenges run
+CONTESTED = 3         # hotkeys each registered by RACERS threads at once
+RACERS = 6
+
+
+@pytest.fixture
+def fast_switching():
+    """Switch threads far more often than the default 5 ms to surface races quickly."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        yield
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_concurrent_challenges_and_registrations(backend_subnet, fast_switching):
+    for i in range(len(db.get_miners()), MINERS):
+        db.add_miner({"hotkey": f"stress-miner-{i}", "coldkey": "stress-owner", "ip": "10.0.0.1",
+                      "tier": ("entry", "mid", "high")[i % 3]})
+    validator_uids = list(db.get_validators())
+    before = {uid: (m["total_challenges"], db.get_consistency(uid)[1]) for uid, m in db.get_miners().items()}
+    sent_before = {uid: v["challenges_sent"] for uid, v in db.get_validators().items()}
+    history_before = db.challenge_history_size()[1]
+    block_before = db.get_state()["block_height"]
+
+    stop = threading.Event()
+    read_errors, winners = [], []
+
+    def reader():
+        while not stop.is_set():
+            try:
+                assert leaderboard(None).body
+            except Exception as e:  # noqa: BLE001 - any failure is the finding
+                read_errors.append(repr(e))
+            time.sleep(0.001)
+
+    def register(i: int):
+        db.add_miner({"hotkey": f"stress-late-{i}", "coldkey": "stress-owner", "ip": "10.0.0.2", "tier": "mid"})
+
+    def register_contested(kind: str, i: int, start: threading.Barrier):
+        """Register a hotkey the other racers are registering too, all released at once."""
+        start.wait()
+        try:
+            if kind == "miner":
+                register_miner(MinerRegister(hotkey=f"stress-contested-{i}", coldkey="stress-owner", ip="10.0.0.3"))
+            else:
+                register_validator(ValidatorRegister(hotkey=f"stress-contested-{i}", coldkey="stress-owner",
+                                                     ip="10.0.0.3", stake=0.0))
+            winners.append((kind, i))
+        except HTTPException:
+            pass
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    barriers = {(kind, i): threading.Barrier(RACERS) for i in range(CONTESTED) for kind in ("miner", "validator")}
+    racers = [threading.Thread(target=register_contested, args=(kind, i, start))
+              for (kind, i), start in barriers.items() for _ in range(RACERS)]
+    for t in readers + racers:
+        t.start()
+    try:
+        with ThreadPoolExecutor(THREADS) as pool:
+            futures = [pool.submit(run_challenge, validator_uids[i % len(validator_uids)], TaskType.eta_prediction)
+                       for i in range(CHALLENGES)]
+            futures += [pool.submit(register, i) for i in range(REGISTRATIONS)]
+            results = [f.result() for f in futures[:CHALLENGES]]
+            for f in futures[CHALLENGES:]:
+                f.result()
+    finally:
+        stop.set()
+        for t in readers + racers:
+            t.join()
+
+    records = [json.loads(response.body) for response in results]
+    scored, ground_truth_rounds = Counter(), Counter()
+    for record in records:
+        for s in record["scores"]:
+            scored[s["miner_uid"]] += 1
+            if record["ground_truth"]:
+                ground_truth_rounds[s["miner_uid"]] += 1
+    sent = Counter(validator_uids[i % len(validator_uids)] for i in range(CHALLENGES))
+    miners = db.get_miners()
+
+    lost = {uid for uid, m in miners.items() if m["total_challenges"] != before.get(uid, (0, 0))[0] + scored[uid]}
+    assert not lost, "miner total_challenges"
+    drift = {uid for uid in miners if db.get_consistency(uid)[1] != before.get(uid, (0, 0))[1] + ground_truth_rounds[uid]}
+    assert not drift, "consistency rounds"
+    wrong_sent = {uid for uid, v in db.get_validators().items()
+                  if v["challenges_sent"] != sent_before.get(uid, 0) + sent[uid]}
+    assert not wrong_sent, "validator challenges_sent"
+    assert db.challenge_history_size()[1] - history_before == CHALLENGES
+    ids = [r["challenge_id"] for r in records]
+    assert len(set(ids)) == len(ids)
+    assert CHALLENGES <= db.get_state()["block_height"] - block_before <= 5 * CHALLENGES
+
+    expected = sorted(miners, key=lambda uid: (-miners[uid]["avg_score"], uid))
+    assert [m["uid"] for m in db.get_leaderboard()] == expected
+    assert len(miners) == MINERS + REGISTRATIONS + CONTESTED
+    assert Counter(winners) == {(kind, i): 1 for i in range(CONTESTED) for kind in ("miner", "validator")}
+    for uid, m in miners.items():
+        assert db.get_miner_by_hotkey(m["hotkey"])["uid"] == uid
+    for uid, v in db.get_validators().items():
+        assert db.get_validator_by_hotkey(v["hotkey"])["uid"] == uid
+    assert not read_errors
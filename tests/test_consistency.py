@@ -0,0 +1,74 @@
+"""
+Per-miner consistency EMA: the update rule, its closed form, growth, and the
+SQLite round trip.
+"""
+
+import numpy as np
+import pytest
+
+from supplychain import db
+from supplychain.consistency import PRIOR, ConsistencyEMA
+from supplychain.scoring import SCORE_FIELDS
+
+PERFORMANCE = (0.9, 0.2, 0.55, 1.0, 0.0, 0.7, 0.7, 0.31)
+
+
+def _expected(window, performances, start=PRIOR):
+    alpha = 2 / (window + 1)
+    ema = start
+    for p in performances:
+        ema = alpha * p + (1 - alpha) * ema
+    return ema
+
+
+@pytest.mark.parametrize("window", (1, 5, 100))
+def test_ema_sequence(window):
+    ema = ConsistencyEMA(window)
+    assert ema.alpha == 2 / (window + 1)
+    assert ema.get(3) == (PRIOR, 0)
+    for i, p in enumerate(PERFORMANCE, 1):
+        ema.update([3], [p])
+        value, rounds = ema.get(3)
+        assert value == pytest.approx(_expected(window, PERFORMANCE[:i]), abs=1e-12)
+        assert rounds == i
+    assert ema.get(4) == (PRIOR, 0)
+
+
+def test_advance_matches_repeated_updates():
+    stepped, closed = ConsistencyEMA(20), ConsistencyEMA(20)
+    for ema in (stepped, closed):
+        ema.update([0, 1], [0.4, 0.8])
+    for _ in range(37):
+        stepped.update([0, 1], [0.9, 0.1])
+    closed.advance([0, 1], [0.9, 0.1], [37, 37])
+    for uid in (0, 1):
+        assert closed.get(uid)[0] == pytest.approx(stepped.get(uid)[0], abs=1e-12)
+        assert closed.get(uid)[1] == stepped.get(uid)[1] == 38
+
+
+def test_growth_keeps_state():
+    ema = ConsistencyEMA(10, capacity=2)
+    ema.update([1], [0.3])
+    ema.update([1000], [0.6])
+    assert ema.get(1) == (pytest.approx(_expected(10, [0.3])), 1)
+    assert ema.get(1000) == (pytest.approx(_expected(10, [0.6])), 1)
+    assert ema.values([1, 500, 1000, 5000]).tolist() == pytest.approx(
+        [_expected(10, [0.3]), PRIOR, _expected(10, [0.6]), PRIOR])
+
+
+def _scores(performance: dict) -> list:
+    """score_challenge-shaped results with every performance dimension set to the given value."""
+    return [{"miner_uid": uid, "score": dict.fromkeys(SCORE_FIELDS[:4], p)} for uid, p in performance.items()]
+
+
+def test_persists_through_sqlite(stored_subnet):
+    uids = list(db.get_miners())[:3]
+    rounds = [{uid: p for uid, p in zip(uids, (0.9, 0.4, 0.65))}, {uid: p for uid, p in zip(uids, (0.8, 0.1, 0.65))}]
+    for performance in rounds:
+        db.record_consistency(_scores(performance))
+    db.advance_consistency(uids[:1], np.array([0.5]), np.array([10]))
+    before = {uid: db.get_consistency(uid) for uid in db.get_miners()}
+    assert before[uids[0]][1] == 12 and before[uids[1]][1] == 2
+
+    stored_subnet()
+    assert {uid: db.get_consistency(uid) for uid in db.get_miners()} == before
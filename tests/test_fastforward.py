@@ -0,0 +1,26 @@
+"""
+Fast-forward against registry changes made while it calibrates.
+"""
+
+from supplychain import db, fastforward
+
+
+def test_registry_change_during_calibration(subnet, monkeypatch):
+    calibrate = fastforward._calibrate
+    late = {}
+
+    def calibrate_then_churn(miners, tempos, seed):
+        sample = calibrate(miners, tempos, seed)
+        late.update(db.add_miner({"hotkey": "ff-late", "coldkey": "ff-owner", "ip": "10.0.0.9", "tier": "high"}))
+        db.remove_miner(miners[0]["uid"])
+        return sample
+
+    monkeypatch.setattr(fastforward, "_calibrate", calibrate_then_churn)
+    before = {uid: m["total_challenges"] for uid, m in db.get_miners().items()}
+    result = fastforward.fast_forward(5, calibration=2, seed=1)
+
+    reported = [m["uid"] for m in result["miners"]]
+    assert late["uid"] not in reported
+    assert sorted(reported) == sorted(uid for uid in before if uid in db.get_miners())
+    assert db.get_miner(late["uid"])["total_challenges"] == 0
+    assert all(db.get_miner(uid)["total_challenges"] > before[uid] for uid in reported)
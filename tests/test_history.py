@@ -0,0 +1,78 @@
+"""
+Challenge history: the in-memory ring, its NDJSON spill segments, and
+reading them back after a restart, including a segment whose last line a
+crash cut short.
+"""
+
+import os
+
+from supplychain.history import ChallengeHistory
+
+
+def _record(seq: int) -> dict:
+    return {"challenge_id": f"c{seq:04d}", "seq": seq}
+
+
+def _everything(history: ChallengeHistory) -> list:
+    """Every readable record, oldest first, by paging back from the newest."""
+    records, cursor = history.page(limit=3)
+    while cursor is not None:
+        more, cursor = history.page(cursor, limit=3)
+        records += more
+    return records[::-1]
+
+
+def _segments(path) -> list:
+    return sorted(os.listdir(path))
+
+
+def test_ring_overflows_into_segments(tmp_path):
+    history = ChallengeHistory(capacity=5, spill_dir=str(tmp_path), segment_size=4)
+    for seq in range(23):
+        assert history.append(_record(seq)) == seq
+    assert len(history) == 5 and history.total == 23
+    assert [r["seq"] for r in history.recent(3)] == [22, 21, 20]
+    assert len(_segments(tmp_path)) == 5  # seqs 0..17 spilled, four per segment
+    assert _everything(history) == [_record(seq) for seq in range(23)]
+    history.close()
+
+
+def test_flush_then_restart_reads_everything(tmp_path):
+    history = ChallengeHistory(capacity=5, spill_dir=str(tmp_path), segment_size=4)
+    for seq in range(12):
+        history.append(_record(seq))
+    history.flush()
+    history.flush()  # idempotent: nothing is spilled twice
+    history.close()
+
+    reopened = ChallengeHistory(capacity=5, spill_dir=str(tmp_path), segment_size=4)
+    assert reopened.total == 12 and len(reopened) == 0
+    assert _everything(reopened) == [_record(seq) for seq in range(12)]
+    assert reopened.append(_record(12)) == 12
+    assert _everything(reopened) == [_record(seq) for seq in range(13)]
+    reopened.close()
+
+
+def test_torn_trailing_line_is_skipped(tmp_path):
+    history = ChallengeHistory(capacity=3, spill_dir=str(tmp_path), segment_size=10)
+    for seq in range(9):
+        history.append(_record(seq))  # seqs 0..5 spilled into one segment
+    last = tmp_path / _segments(tmp_path)[-1]
+    with open(last, "a", encoding="utf-8") as f:
+        f.write('{"challenge_id": "c0006", "se')  # a crash mid-write
+
+    # The live process never reads past the last complete line
+    assert _everything(history) == [_record(seq) for seq in range(9)]
+    history.close()
+
+    # A restart drops the torn record and carries on from the last complete one
+    reopened = ChallengeHistory(capacity=3, spill_dir=str(tmp_path), segment_size=10)
+    assert reopened.total == 6
+    assert last.read_text(encoding="utf-8").endswith("\n")
+    for seq in range(6, 12):
+        reopened.append(_record(seq))
+    reopened.flush()
+    assert _everything(reopened) == [_record(seq) for seq in range(12)]
+    reopened.close()
+    assert _everything(ChallengeHistory(capacity=3, spill_dir=str(tmp_path), segment_size=10)) == [
+        _record(seq) for seq in range(12)]
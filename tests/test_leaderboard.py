@@ -0,0 +1,54 @@
+"""
+Copy-on-write leaderboard index against a full re-sort, on the bisect patch
+path (few changed miners) and the bulk merge path, with deregistrations.
+"""
+
+import random
+
+import pytest
+
+from supplychain import db
+
+
+def _assert_matches_sort():
+    miners = db.get_miners()
+    expected = sorted(miners, key=lambda uid: (-miners[uid]["avg_score"], uid))
+    assert [m["uid"] for m in db.get_leaderboard()] == expected
+    assert len(db.get_state()["leaderboard_index"]) == len(miners)  # no stale keys left behind
+
+
+@pytest.fixture
+def crowded(backend_subnet):
+    """~120 miners whose scores tie often (two decimals)."""
+    for i in range(112):
+        db.add_miner({"hotkey": f"lb-{i}", "coldkey": f"lb-owner-{i % 5}", "ip": "10.0.1.1"})
+    rand = random.Random(3)
+    db.set_miner_totals((uid, round(rand.random(), 2), 10, 0.0) for uid in db.get_miners())
+    _assert_matches_sort()
+    return rand
+
+
+@pytest.mark.parametrize("n", (1, db._PATCH_LIMIT, 40))
+def test_score_updates(crowded, n):
+    rand = crowded
+    for _ in range(3):
+        uids = rand.sample(list(db.get_miners()), n)
+        db.update_miner_scores((uid, rand.choice((0.0, 0.5, 1.0))) for uid in uids)
+        _assert_matches_sort()
+        db.set_miner_totals((uid, round(rand.random(), 2), 10, 0.0) for uid in uids)
+        _assert_matches_sort()
+
+
+@pytest.mark.parametrize("n", (1, 40))
+def test_deregistered_uids_are_dropped(crowded, n):
+    rand = crowded
+    uids = rand.sample(list(db.get_miners()), n)
+    removed = uids[::2] or uids
+    for uid in removed:
+        db.remove_miner(uid)
+    # Re-ranking a batch that names deregistered UIDs must drop them, not resurrect them
+    db._reindex(uids)
+    _assert_matches_sort()
+    assert not set(removed) & {m["uid"] for m in db.get_leaderboard()}
+    db.update_miner_scores((uid, 0.9) for uid in uids)
+    _assert_matches_sort()
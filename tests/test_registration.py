@@ -0,0 +1,63 @@
+"""
+Registration and the hotkey / coldkey indexes: duplicate hotkeys are
+refused (400 at the route), lookups follow registration, and deregistering
+clears both indexes.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from supplychain import db
+from supplychain.models import MinerRegister, ValidatorRegister
+from supplychain.routes import register_miner, register_validator
+
+KINDS = {
+    # kind: (add, remove, by_hotkey, by_coldkey, route, request model)
+    "miner": (db.add_miner, db.remove_miner, db.get_miner_by_hotkey, db.get_miners_by_coldkey,
+              register_miner, MinerRegister),
+    "validator": (db.add_validator, db.remove_validator, db.get_validator_by_hotkey, db.get_validators_by_coldkey,
+                  register_validator, ValidatorRegister),
+}
+
+
+def _data(hotkey: str, coldkey: str = "reg-owner") -> dict:
+    return {"hotkey": hotkey, "coldkey": coldkey, "ip": "10.0.2.1"}
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_duplicate_hotkey_is_refused(backend_subnet, kind):
+    add, _, by_hotkey, by_coldkey, route, model = KINDS[kind]
+    first = add(_data("reg-dup"))
+    with pytest.raises(ValueError, match="already registered"):
+        add(_data("reg-dup", coldkey="someone-else"))
+    with pytest.raises(HTTPException) as refused:
+        route(model(**_data("reg-dup")))
+    assert refused.value.status_code == 400
+    assert by_hotkey("reg-dup")["uid"] == first["uid"]
+    assert [r["uid"] for r in by_coldkey("someone-else")] == []
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_removal_clears_both_indexes(backend_subnet, kind):
+    add, remove, by_hotkey, by_coldkey, _, _ = KINDS[kind]
+    uids = [add(_data(f"reg-{i}"))["uid"] for i in range(3)]
+    other = add(_data("reg-other", coldkey="reg-other-owner"))["uid"]
+    assert [r["uid"] for r in by_coldkey("reg-owner")] == uids
+
+    assert remove(uids[1])["uid"] == uids[1]
+    assert by_hotkey("reg-1") is None
+    assert [r["uid"] for r in by_coldkey("reg-owner")] == [uids[0], uids[2]]
+    assert remove(uids[1]) is None
+
+    for uid in (uids[0], uids[2], other):
+        remove(uid)
+    assert by_coldkey("reg-owner") == [] and by_coldkey("reg-other-owner") == []
+    state = db.get_state()
+    assert not {"reg-0", "reg-1", "reg-2", "reg-other"} & set(state[f"{kind}_hotkeys"])
+    assert not {"reg-owner", "reg-other-owner"} & set(state[f"{kind}_coldkeys"])
+
+    # The hotkey is free again once deregistered
+    assert by_hotkey("reg-1") is None
+    again = add(_data("reg-1"))
+    assert by_hotkey("reg-1")["uid"] == again["uid"] != uids[1]
+    assert [r["uid"] for r in by_coldkey("reg-owner")] == [again["uid"]]
@@ -0,0 +1,102 @@
+"""
+Per-miner score statistics: Welford updates and the Chan et al. batch merge
+against numpy on the same data, array growth, and the SQLite round trip
+(together with top-10 streaks).
+"""
+
+import numpy as np
+import pytest
+
+from supplychain import db
+from supplychain.scorestats import BINS, DIMENSIONS, ScoreStats, bins
+
+D = len(DIMENSIONS)
+
+
+def _stream(seed: int, rounds: int, miners: int) -> np.ndarray:
+    """(rounds x miners x D) scores in [0, 1], some dimensions clumped near the ends."""
+    rng = np.random.default_rng(seed)
+    values = rng.random((rounds, miners, D))
+    values[..., 1] = rng.random((rounds, miners)) < 0.3  # 0/1 like disruption_accuracy
+    values[..., 2] **= 4
+    return values
+
+
+def _batch(values: np.ndarray):
+    """merge() arguments for a (rounds x miners x D) block of scores."""
+    rounds, miners, _ = values.shape
+    sketch = np.zeros((miners, D, BINS), dtype=np.uint32)
+    for r in range(rounds):
+        np.add.at(sketch, (np.arange(miners)[:, None], np.arange(D), bins(values[r])), 1)
+    return np.full(miners, rounds), values.sum(axis=0), (values ** 2).sum(axis=0), sketch
+
+
+def _assert_matches_numpy(stats: ScoreStats, uids, values: np.ndarray, quantiles: bool = True):
+    for j, uid in enumerate(uids):
+        summary = stats.summary(uid)
+        assert summary["count"] == len(values)
+        column = values[:, j, :]
+        mean = [summary["dimensions"][name]["mean"] for name in DIMENSIONS]
+        std = [summary["dimensions"][name]["std"] for name in DIMENSIONS]
+        assert mean == pytest.approx(np.mean(column, axis=0).tolist(), abs=1e-9)
+        assert np.square(std).tolist() == pytest.approx(np.var(column, axis=0).tolist(), abs=1e-9)
+        if not quantiles:
+            continue
+        # Quantiles interpolate within a histogram bin, so on a long stream they are good to one bin width
+        median = [summary["dimensions"][name]["quantiles"][1] for name in DIMENSIONS]
+        assert np.abs(np.array(median) - np.median(column, axis=0)).max() <= 1 / BINS + 1e-9
+
+
+def test_welford_matches_numpy():
+    values = _stream(1, 200, 4)
+    uids = [0, 3, 7, 300]
+    stats = ScoreStats()
+    for row in values:
+        stats.update(uids, row)
+    _assert_matches_numpy(stats, uids, values)
+    assert stats.counts([0, 1, 300, 10_000]).tolist() == [200, 0, 200, 0]
+
+
+def test_chan_merge_of_two_partial_streams():
+    values = _stream(2, 300, 3)
+    uids = [2, 5, 9]
+    stats = ScoreStats()
+    for row in values[:120]:
+        stats.update(uids, row)
+    stats.merge(uids, *_batch(values[120:]))
+    _assert_matches_numpy(stats, uids, values)
+
+    # Two merged batches alone agree too, and zero-count rows are ignored
+    merged = ScoreStats()
+    merged.merge(uids, *_batch(values[:50]))
+    count, total, total_sq, sketch = _batch(values[50:])
+    count[1] = 0
+    merged.merge(uids, count, total, total_sq, sketch)
+    _assert_matches_numpy(merged, uids[::2], values[:, ::2])
+    assert merged.counts(uids).tolist() == [300, 50, 300]
+
+
+def test_growth_keeps_state():
+    stats = ScoreStats(capacity=2)
+    values = _stream(3, 20, 1)
+    for row in values:
+        stats.update([1], row)
+    stats.update([5000], values[0])
+    _assert_matches_numpy(stats, [1], values, quantiles=False)
+    assert stats.counts([1, 5000]).tolist() == [20, 1]
+    assert stats.means([5000])[0].tolist() == pytest.approx(values[0, 0].tolist())
+
+
+def test_persists_through_sqlite(stored_subnet):
+    uids = list(db.get_miners())[:4]
+    values = _stream(4, 30, len(uids))
+    db.merge_score_stats(uids, *_batch(values))
+    db.set_streaks({uids[0]: 7, uids[2]: 1})
+    db.advance_tempo()  # closes a tempo, extending or resetting every streak
+    streaks = dict(db.get_streaks())
+    assert streaks
+    stats = {uid: db.score_stats().state(uid) for uid in db.get_miners()}
+
+    stored_subnet()
+    assert dict(db.get_streaks()) == streaks
+    assert {uid: db.score_stats().state(uid) for uid in db.get_miners()} == stats
@@ -0,0 +1,122 @@
+"""
+Parity of the vectorized scorer (scoring.score_challenge) with the scalar
+ai.score_prediction it replaced, including the TAO split routes used to do
+per prediction.
+"""
+
+import random
+
+import pytest
+
+from supplychain.ai import run_miner_prediction, score_prediction
+from supplychain.scoring import score_challenge
+
+TIERS = ("high", "mid", "entry")
+
+SYNAPSE = {
+    "task_type": "eta_prediction",
+    "origin": "Shanghai, China",
+    "destination": "Los Angeles, USA",
+    "product_type": "electronics",
+    "carrier": "MSC",
+    "ship_date": "2026-02-15",
+}
+
+
+def _scalar(predictions, consistency, ground_truth, total_emission):
+    """The per-object loop: score each prediction, sort best first, split emission by share."""
+    scores = [
+        {"miner_uid": p["miner_uid"], "score": score_prediction(p, ground_truth, c)}
+        for p, c in zip(predictions, consistency)
+    ]
+    scores.sort(key=lambda s: s["score"]["final_score"], reverse=True)
+    total = sum(s["score"]["final_score"] for s in scores)
+    for rank, s in enumerate(scores, 1):
+        s["rank"] = rank
+        s["tau_earned"] = round(total_emission * (s["score"]["final_score"] / total), 6) if total > 0 else 0
+    return scores
+
+
+def _batch(predictions, consistency, ground_truth, total_emission):
+    return score_challenge(
+        [p["miner_uid"] for p in predictions],
+        [f"hk{p['miner_uid']}" for p in predictions],
+        [p["predicted_eta_days"] for p in predictions],
+        [p["disruption_risk"] for p in predictions],
+        [p["response_time_ms"] for p in predictions],
+        consistency, ground_truth, total_emission,
+    )
+
+
+def _assert_parity(predictions, consistency, ground_truth, total_emission=0.41):
+    expected = _scalar(predictions, consistency, ground_truth, total_emission)
+    got = _batch(predictions, consistency, ground_truth, total_emission)
+    assert [s["miner_uid"] for s in got] == [s["miner_uid"] for s in expected]
+    for g, e in zip(got, expected):
+        assert g["score"] == e["score"], g["miner_uid"]
+        assert g["rank"] == e["rank"]
+        assert g["tau_earned"] == e["tau_earned"]
+    return got
+
+
+def _prediction(uid, eta, risk, latency):
+    return {"miner_uid": uid, "predicted_eta_days": eta, "disruption_risk": risk, "response_time_ms": latency}
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("had_disruption", (False, True))
+def test_tiers_match_scalar(seed, had_disruption):
+    rand = random.Random(seed)
+    predictions = []
+    for uid in range(24):
+        p = run_miner_prediction(dict(SYNAPSE, random_seed=seed * 1000 + uid), TIERS[uid % 3])
+        p["miner_uid"] = uid
+        predictions.append(p)
+    consistency = [rand.uniform(0.3, 0.95) for _ in predictions]
+    ground_truth = {"actual_eta_days": round(rand.uniform(10, 20), 1), "had_disruption": had_disruption}
+    _assert_parity(predictions, consistency, ground_truth)
+
+
+def test_half_rounding_edges():
+    # Values whose 5th decimal is a 5: the builtin round and np.round disagree on some of these
+    predictions = [_prediction(uid, 15.0 + uid * 0.00035, 0.5 + (uid % 7) * 0.00005, 1000 + uid * 0.5)
+                   for uid in range(200)]
+    consistency = [0.6 + uid * 0.00005 for uid in range(200)]
+    _assert_parity(predictions, consistency, {"actual_eta_days": 15.0, "had_disruption": False})
+    _assert_parity(predictions, consistency, {"actual_eta_days": 15.0, "had_disruption": True})
+
+
+def test_risk_threshold_is_strict():
+    predictions = [_prediction(0, 15.0, 0.5, 500), _prediction(1, 15.0, 0.51, 500)]
+    got = {s["miner_uid"]: s["score"] for s in _assert_parity(predictions, [0.75, 0.75], {"had_disruption": True})}
+    assert got[0]["disruption_accuracy"] == 0.0 and not got[0]["disruption_bonus"]
+    assert got[1]["disruption_accuracy"] == 1.0 and got[1]["disruption_bonus"]
+
+
+def test_disruption_bonus_and_cap():
+    ground_truth = {"actual_eta_days": 12.0, "had_disruption": True}
+    predictions = [
+        _prediction(0, 12.0, 0.8, 100),    # perfect: bonus pushes it past 1.0, capped
+        _prediction(1, 16.0, 0.7, 3000),   # caught the disruption: 1.5x
+        _prediction(2, 12.0, 0.2, 100),    # missed it: no bonus
+    ]
+    got = {s["miner_uid"]: s["score"] for s in _assert_parity(predictions, [0.75] * 3, ground_truth)}
+    assert got[0]["disruption_bonus"] and got[0]["final_score"] == 1.0
+    assert got[1]["disruption_bonus"]
+    unboosted = 0.40 * got[1]["eta_accuracy"] + 0.25 + 0.15 * got[1]["risk_calibration"] \
+        + 0.10 * got[1]["latency_score"] + 0.10 * got[1]["consistency"]
+    assert got[1]["final_score"] == round(min(1.0, unboosted * 1.5), 4)
+    assert not got[2]["disruption_bonus"] and got[2]["disruption_accuracy"] == 0.0
+
+
+@pytest.mark.parametrize("total_emission", (0.41, 1.024 * 0.41 / 3, 7.0))
+def test_tau_split(total_emission):
+    rand = random.Random(7)
+    predictions = [_prediction(uid, rand.uniform(5, 25), rand.random(), rand.uniform(100, 5000)) for uid in range(64)]
+    # Duplicate rows tie on final_score; ties keep input order in both scorers
+    predictions += [dict(p, miner_uid=p["miner_uid"] + 64) for p in predictions[:8]]
+    got = _assert_parity(predictions, [0.75] * len(predictions), {"actual_eta_days": 15.0, "had_disruption": False},
+                         total_emission)
+    assert [s["rank"] for s in got] == list(range(1, len(got) + 1))
+    assert sum(s["tau_earned"] for s in got) == pytest.approx(total_emission, abs=1e-6 * len(got))
+